@@ -1,7 +1,7 @@
 #-------------------------------------------------------------
 # 
 #-------------------------------------------------------------
-__all__ = ['build_file_list','list_to_xlsx','xlsx_to_list','LF','File_Node','Message_Writer','get_text_from_file','make_dt_output_filepath','make_std_output_filepath','get_file_hash','put_text_to_file']
+__all__ = ['build_file_list','list_to_xlsx','xlsx_to_list','LF','File_Node','Message_Writer','get_text_from_file','make_dt_output_filepath','make_std_output_filepath','get_file_hash','put_text_to_file','xlsx_iter_rows','Stage_Timer','sheets_to_xlsx','open_stream','split_zip_path','strip_stream_ext','build_stream_file_list','External_Sorter','zip_member_list']
 
 
 #-------------------------------------------------------------
@@ -10,8 +10,8 @@ __all__ = ['build_file_list','list_to_xlsx','xlsx_to_list','LF','File_Node','Mes
 
 __prog__ = str(__file__).rstrip('.py')
 __author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
-__version__ = '3.0'
-__date__ = '2025/01/26'
+__version__ = '3.8'
+__date__ = '2026/10/19'
 
 #-------------------------------------------------------------
 # 
@@ -29,6 +29,14 @@ Required modules:
  openpyxl - to generate excel report file.
  
 Change Summary:
+	3.8 'External_Sorter' imports pickle, tempfile and shutil when it is first used.
+	3.7 added 'zip_member_list'.  'File_Node' records mtime_ns, and 'File_Node.clear_nodes' empties its class registries so long-running callers stay bounded.
+	3.6 openpyxl, mimetypes, hashlib, tracemalloc and the compression modules are imported by the functions that use them, so importing the library stays cheap for runs that never touch them.
+	3.5 added 'External_Sorter', a stable external-memory sort: sorted runs spilled to temporary files past a memory budget, then k-way merged.
+	3.4 added 'open_stream', 'build_stream_file_list', 'split_zip_path' and 'strip_stream_ext' to find and stream-read .gz, .bz2, .xz files and .zip members without unpacking them.
+	3.3 added 'sheets_to_xlsx' to write several named sheets to one workbook.
+	3.2 added 'Stage_Timer' to time and memory-profile named stages of a run (wall time, cpu time, items per second, peak traced memory).
+	3.1 added 'xlsx_iter_rows', a generator reader that yields rows lazily with native cell types, optional column projection by header name and early stop.  'xlsx_to_list' is unchanged.
 	3.0 simplified 'Message_Writer'.  defer_msg replaced by buffer_msg.  Instance creator requires output logfile path name.  Messages written to file or buffered  explicitly.  In other words, you can buffer messages then write them.  Msgs no longer auto-buffered and written when buffer limit reached.
 	2.0 deprecated 'Buffer_Writer' class and related functions 'make_dt_output_fd' and 'make_std_output_fd'.  Use 'Message_Writer' instead.
  
@@ -42,11 +50,14 @@ import pathlib
 import datetime
 import io
 import sys
-import openpyxl
 from operator import attrgetter
-import mimetypes
+from operator import itemgetter
 import time
-import hashlib
+import contextlib
+import os
+import fnmatch
+import importlib
+import heapq
 
 
 LF = '\n'
@@ -56,6 +67,7 @@ LF = '\n'
 #-------------------------------------------------------------
 
 def get_file_hash(file_path, chunksize=4096):
+	import hashlib
 	hash_md5 = hashlib.md5()
 	with open(file_path, "rb") as f:
 		for chunk in iter(lambda: f.read(chunksize), b""): 
@@ -117,9 +129,11 @@ class File_Node:
 		self.dt_str_accessed = _dt_fmt.format(_accessed)
 		
 		self.filesize = _stat.st_size
+		self.mtime_ns = _stat.st_mtime_ns
 		
 		self.sortkey = self.path
 		
+		import mimetypes
 		try:
 			_file_type = mimetypes.types_map[self.ext]
 		except (KeyError, Exception):
@@ -200,6 +214,20 @@ class File_Node:
 			
 		return retnode
 		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@classmethod
+	def clear_nodes(cls):
+		"""
+		Forget every node and the directory and file type sets.
+		"""
+		cls.filenode_list = []
+		cls.sorted_filenode_list = []
+		cls.dir_set = set()
+		cls.filetype_set = set()
+		
 #-------------------------------------------------------------
 # 
 #-------------------------------------------------------------
@@ -210,6 +238,216 @@ File_Node = File_Node
 # 
 #-------------------------------------------------------------
 
+class Stage_Timer:
+	"""
+	Time and memory-profile named stages of a run.
+	Each stage records wall time, cpu time, item count,
+	items per second and peak traced memory.  When not enabled
+	'stage' does nothing beyond yielding a scratch dict.
+	Stages are not meant to be nested.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, enabled=True, trace_memory=True):
+		self.enabled = enabled
+		self.trace_memory = trace_memory
+		self.stage_list = []
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@contextlib.contextmanager
+	def stage(self, name:str, items:int=0, **fields):
+		"""
+		context manager timing one stage.  Yields the stage dict so
+		the caller can set 'items' once the count is known.  Extra
+		keyword [fields] (e.g. file=path) are stored with the stage.
+		"""
+		st = {'name': name, 'items': items}
+		st.update(fields)
+		
+		if not self.enabled:
+			yield st
+			return
+		
+		_trace = self.trace_memory
+		_started_trace = False
+		if _trace:
+			import tracemalloc
+			if not tracemalloc.is_tracing():
+				tracemalloc.start()
+				_started_trace = True
+			tracemalloc.reset_peak()
+			_mem_start, _ = tracemalloc.get_traced_memory()
+		
+		_wall = time.perf_counter()
+		_cpu = time.process_time()
+		try:
+			yield st
+		finally:
+			st['wall_s'] = time.perf_counter() - _wall
+			st['cpu_s'] = time.process_time() - _cpu
+			_items = st.get('items') or 0
+			if st['wall_s'] > 0:
+				st['items_per_s'] = _items / st['wall_s']
+			else:
+				st['items_per_s'] = 0.0
+			if _trace:
+				_, _mem_peak = tracemalloc.get_traced_memory()
+				st['peak_mem_kb'] = max(_mem_peak - _mem_start, 0) / 1024
+				if _started_trace:
+					tracemalloc.stop()
+			self.stage_list.append(st)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def as_dict_list(self) -> list:
+		return [dict(st) for st in self.stage_list]
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+		
+	def as_str(self) -> str:
+		_msg = f'{LF} {"stage":<24} {"wall s":>10} {"cpu s":>10} {"items":>10} {"items/s":>12} {"peak KB":>12}'
+		for st in self.stage_list:
+			_mem = st.get('peak_mem_kb')
+			_mem_str = f'{_mem:12.1f}' if _mem is not None else f'{"-":>12}'
+			_msg += f'{LF} {st["name"]:<24} {st["wall_s"]:10.4f} {st["cpu_s"]:10.4f} ' + \
+				f'{st["items"]:10d} {st["items_per_s"]:12.1f} {_mem_str}'
+		return _msg
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __repr__(self) -> str:
+		return self.as_str()
+			
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class External_Sorter:
+	"""
+	Sort more items than fit in memory.  Items are pickled as
+	they are added; once the buffered bytes pass [budget] the
+	buffer is sorted by [key] and written to a temporary run file.
+	Iterating merges the runs and the remaining buffer with a
+	k-way heap merge.  The sort is stable, and may be iterated
+	more than once.  close removes the run files.
+	"""
+	
+	item_overhead = 64			# approx. bytes per buffered item besides its pickle
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, key=None, budget:int=64 << 20, tmpdir:str=None):
+		import pickle
+		self.dumps = pickle.dumps
+		self.key = key
+		self.budget = budget
+		self.tmpdir = tmpdir
+		self.run_dir = None
+		self.run_list = []
+		self.buffer = []
+		self.buffer_size = 0
+		self.item_cnt = 0
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add(self, item):
+		_blob = self.dumps(item, protocol=-1)
+		_key = item if self.key is None else self.key(item)
+		self.buffer.append((_key, _blob))
+		self.buffer_size += len(_blob) + External_Sorter.item_overhead
+		self.item_cnt += 1
+		if self.buffer_size >= self.budget:
+			self.spill()
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def spill(self):
+		"""
+		write the sorted buffer to a new run file.
+		"""
+		if not self.buffer:
+			return
+		import pickle
+		import tempfile
+		self.buffer.sort(key=itemgetter(0))
+		if self.run_dir is None:
+			self.run_dir = tempfile.mkdtemp(prefix='extsort_', dir=self.tmpdir)
+		_path = os.path.join(self.run_dir, f'run_{len(self.run_list):05d}')
+		with open(_path, 'wb') as fd:
+			for _pair in self.buffer:
+				pickle.dump(_pair, fd, protocol=pickle.HIGHEST_PROTOCOL)
+		self.run_list.append(_path)
+		self.buffer = []
+		self.buffer_size = 0
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def read_run(run_path):
+		import pickle
+		with open(run_path, 'rb') as fd:
+			while True:
+				try:
+					yield pickle.load(fd)
+				except EOFError:
+					return
+					
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __iter__(self):
+		import pickle
+		self.buffer.sort(key=itemgetter(0))
+		_iter_list = [External_Sorter.read_run(p) for p in self.run_list]
+		_iter_list.append(iter(list(self.buffer)))
+		for _, _blob in heapq.merge(*_iter_list, key=itemgetter(0)):
+			yield pickle.loads(_blob)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __len__(self) -> int:
+		return self.item_cnt
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def close(self):
+		self.buffer = []
+		self.buffer_size = 0
+		self.run_list = []
+		if self.run_dir is not None:
+			import shutil
+			shutil.rmtree(self.run_dir, ignore_errors=True)
+			self.run_dir = None
+			
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
 class Message_Writer:
 	"""
 	Output Messages to List (buffer) then to file.
@@ -495,14 +733,30 @@ def list_to_xlsx(xls_list,xls_path,xls_sheet=None):
 	Write list to excel .xlsx file
 	"""
 	
+	sheets_to_xlsx([(xls_sheet, xls_list)], xls_path)
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+	
+def sheets_to_xlsx(sheet_list,xls_path):
+	"""
+	Write [(sheet name, list)] pairs to excel .xlsx file,
+	one sheet each, in order.  A sheet name of None gets
+	the openpyxl default name.
+	"""
+	
+	import openpyxl
 	wb = openpyxl.Workbook(write_only=True)
-	if xls_sheet:
-		ws = wb.create_sheet(xls_sheet)
-	else:
-		ws = wb.create_sheet()
 	
-	for row in xls_list:
-		ws.append(row)
+	for xls_sheet, xls_list in sheet_list:
+		if xls_sheet:
+			ws = wb.create_sheet(xls_sheet)
+		else:
+			ws = wb.create_sheet()
+		
+		for row in xls_list:
+			ws.append(row)
 
 	wb.save(xls_path)
 
@@ -516,6 +770,7 @@ def xlsx_to_list(xlsx_path):
 	Return a nested list from an excel .xlsx file.
 	Structure: [[rows[cells]]]
 	"""
+	import openpyxl
 	wb = openpyxl.load_workbook(filename=xlsx_path, read_only=True)
 	ws = wb.active
 	xlsx_list = []
@@ -529,6 +784,63 @@ def xlsx_to_list(xlsx_path):
 	
 	wb.close()
 	return xlsx_list
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+	
+def xlsx_iter_rows(xlsx_path, columns:list=None, max_rows:int=None,\
+	xls_sheet:str=None, header=True, skip_empty=True):
+	"""
+	Yield rows from an excel .xlsx file one at a time as tuples.
+	Cell values keep their native types (None stays None).
+	The first row is the header.  If [columns] is a list of header
+	names, each row is projected to those columns in that order.
+	[header] yields the (projected) header row first.
+	Stops after [max_rows] data rows, or whenever the caller stops
+	iterating; the workbook is closed either way.
+	"""
+	import openpyxl
+	wb = openpyxl.load_workbook(filename=xlsx_path, read_only=True)
+	try:
+		if xls_sheet:
+			ws = wb[xls_sheet]
+		else:
+			ws = wb.active
+		
+		row_iter = ws.iter_rows(values_only=True)
+		
+		hdr = next(row_iter, None)
+		if hdr is None:
+			return
+		
+		col_idx = None
+		if columns is not None:
+			_hdr_pos = {}
+			for i, name in enumerate(hdr):
+				_hdr_pos.setdefault(name, i)
+			missing = [c for c in columns if c not in _hdr_pos]
+			if missing:
+				raise KeyError(f'columns not in header of {xlsx_path}: {missing}')
+			col_idx = [_hdr_pos[c] for c in columns]
+			hdr = tuple(columns)
+		
+		if header:
+			yield tuple(hdr)
+		
+		row_cnt = 0
+		for row in row_iter:
+			if max_rows is not None and row_cnt >= max_rows:
+				break
+			if skip_empty and all(v is None for v in row):
+				continue
+			if col_idx is not None:
+				_len = len(row)
+				row = tuple(row[i] if i < _len else None for i in col_idx)
+			yield row
+			row_cnt += 1
+	finally:
+		wb.close()
 		
 #-------------------------------------------------------------
 # 
@@ -563,6 +875,121 @@ def build_file_list(startdir:str=None, ptrnstr='*.*') -> list:
 # 
 #-------------------------------------------------------------
 
+# compression extension: module with a file-like open(fd, mode),
+# imported on first use.
+STREAM_OPENERS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma'}
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def split_zip_path(path) -> tuple:
+	"""
+	Return (zip file path, member name) for a path of the form
+	'archive.zip/member', or (path, None) for any other path.
+	"""
+	_path = str(path)
+	_idx = _path.lower().find('.zip/')
+	while _idx >= 0:
+		_zip_path = _path[:_idx + 4]
+		if os.path.isfile(_zip_path):
+			return _zip_path, _path[_idx + 5:]
+		_idx = _path.lower().find('.zip/', _idx + 1)
+	return _path, None
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def strip_stream_ext(path) -> str:
+	"""
+	Return [path] without a .gz, .bz2 or .xz extension.
+	"""
+	_path = str(path)
+	_root, _ext = os.path.splitext(_path)
+	if _ext.lower() in STREAM_OPENERS:
+		return _root
+	return _path
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+@contextlib.contextmanager
+def open_stream(path):
+	"""
+	Open [path] for binary reading as a stream.  .gz, .bz2 and
+	.xz files are decompressed as they are read, and a path of
+	the form 'archive.zip/member' reads that zip member without
+	unpacking the archive.
+	"""
+	_zip_path, _member = split_zip_path(path)
+	with contextlib.ExitStack() as stack:
+		if _member is not None:
+			import zipfile
+			_zf = stack.enter_context(zipfile.ZipFile(_zip_path))
+			fd = stack.enter_context(_zf.open(_member))
+			_name = _member
+		else:
+			fd = stack.enter_context(open(_zip_path, 'rb'))
+			_name = _zip_path
+		_module = STREAM_OPENERS.get(os.path.splitext(_name)[1].lower())
+		if _module is not None:
+			_opener = importlib.import_module(_module).open
+			fd = stack.enter_context(_opener(fd, 'rb'))
+		yield fd
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def zip_member_list(zip_path, ptrnstr='*.*') -> list:
+	"""
+	Return 'archive.zip/member' paths for the members of
+	[zip_path] whose names match [ptrnstr] plain or compressed
+	(.gz, .bz2, .xz).  A file that is not a readable zip (yet)
+	has no members.
+	"""
+	import zipfile
+	_ptrn_list = [ptrnstr] + [ptrnstr + _ext for _ext in STREAM_OPENERS]
+	try:
+		with zipfile.ZipFile(zip_path) as zf:
+			_name_list = zf.namelist()
+	except (zipfile.BadZipFile, OSError):
+		return []
+	_member_list = []
+	for _name in _name_list:
+		if _name.endswith('/'):
+			continue
+		_base = _name.rsplit('/', 1)[-1]
+		if any(fnmatch.fnmatch(_base, _ptrn) for _ptrn in _ptrn_list):
+			_member_list.append(f'{zip_path}/{_name}')
+	return _member_list
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def build_stream_file_list(startdir:str=None, ptrnstr='*.*') -> list:
+	"""
+	Return a list of files recursively, starting with [startdir]
+	directory, matching [ptrnstr] plain or compressed (.gz, .bz2,
+	.xz), followed by matching members of .zip files as
+	'archive.zip/member' paths for open_stream.
+	"""
+	_file_list = build_file_list(startdir, ptrnstr)
+	for _ext in STREAM_OPENERS:
+		_file_list += build_file_list(startdir, ptrnstr + _ext)
+		
+	for _zip_path in build_file_list(startdir, '*.zip'):
+		_file_list += zip_member_list(_zip_path, ptrnstr)
+				
+	return _file_list
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
 
 def make_dt_output_filepath(prefix='logfile', ext='.log',\
 	timefmt='%Y%m%d_%H%m%S%f'):
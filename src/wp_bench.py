@@ -0,0 +1,635 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_bench generates synthetic Wordpress WXR export
+files and times each stage of the wp_xml_export_extract pipeline:
+parse, WP_Export construction, set_srt_node_list,
+attach_images_to_parents, report rendering and list_to_xlsx.
+
+Results are written as json so runs can be compared.  With
+--compare, stages slower than the baseline by more than
+--threshold are reported and the exit status is 1.
+
+--startup times cold starts of wp_xml_export_extract in fresh
+interpreters (import, and --help through the argparse entry
+point) against --startup-budget milliseconds, and checks that
+the heavy modules are still deferred.  Over budget, or a heavy
+module loaded at import, gives exit status 1.
+
+Usage:
+ python wp_bench.py --posts 2000 --attachments 1000 --out bench.json
+ python wp_bench.py --out new.json --compare bench.json
+ python wp_bench.py --startup --startup-budget 100
+
+Required modules:
+ xmltodict, openpyxl - via wp_xml_export_extract.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import Stage_Timer
+from sparkwarden_file_lib import list_to_xlsx
+
+import wp_xml_export_extract as wpx
+from wp_xml_export_extract import WP_Export_Session
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+WXR_HEADER = '''<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0"
+	xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+	xmlns:content="http://purl.org/rss/1.0/modules/content/"
+	xmlns:wfw="http://wellformedweb.org/CommentAPI/"
+	xmlns:dc="http://purl.org/dc/elements/1.1/"
+	xmlns:wp="http://wordpress.org/export/1.2/"
+>
+<channel>
+	<title>Synthetic Benchmark Site</title>
+	<link>{site}</link>
+	<description>wp_bench generated export</description>
+	<language>en</language>
+	<wp:wxr_version>1.2</wp:wxr_version>
+	<wp:base_site_url>{site}</wp:base_site_url>
+	<wp:base_blog_url>{site}</wp:base_blog_url>
+'''
+
+WXR_FOOTER = '''</channel>
+</rss>
+'''
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do '
+	'eiusmod tempor incididunt ut labore et dolore magna aliqua enim ad '
+	'minim veniam quis nostrud exercitation ullamco laboris nisi aliquip '
+	'ex ea commodo consequat duis aute irure in reprehenderit voluptate '
+	'velit esse cillum eu fugiat nulla pariatur excepteur sint occaecat').split()
+
+PUB_DATE_FMT = '%a, %d %b %Y %H:%M:%S +0000'
+WP_DATE_FMT = '%Y-%m-%d %H:%M:%S'
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WXR_Generator:
+	"""
+	Synthetic WXR export generator.  Output is fully determined
+	by the parameters and seed, so benchmark runs are reproducible.
+	"""
+
+	site = 'https://bench.example.com'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, posts=1000, attachments=500, comments=5, terms=50,\
+		body_size=2000, pages=0, seed=1):
+		self.posts = posts
+		self.attachments = attachments
+		self.comments = comments
+		self.terms = terms
+		self.body_size = body_size
+		self.pages = pages
+		self.seed = seed
+		self.rnd = random.Random(seed)
+		self.start_dt = datetime.datetime(2015, 1, 1, 8, 0, 0)
+
+		self.cat_slugs = [f'category-{n}' for n in range(max(terms // 5, 1))]
+		self.tag_slugs = [f'tag-{n}' for n in range(max(terms - len(self.cat_slugs), 1))]
+
+		# post ids: posts first, then pages, then attachments.
+		self.post_ids = list(range(1, posts + 1))
+		self.page_ids = list(range(posts + 1, posts + pages + 1))
+		_first = posts + pages + 1
+		self.attachment_ids = list(range(_first, _first + attachments))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def as_dict(self) -> dict:
+		return {
+			'posts': self.posts,
+			'attachments': self.attachments,
+			'comments': self.comments,
+			'terms': self.terms,
+			'body_size': self.body_size,
+			'pages': self.pages,
+			'seed': self.seed,
+			}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def item_dt(self, post_id) -> datetime.datetime:
+		"""
+		return a deterministic publish datetime for a post id.
+		"""
+		_minutes = (post_id * 7919) % (60 * 24 * 365 * 8)
+		return self.start_dt + datetime.timedelta(minutes=_minutes)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def post_link(self, post_id) -> str:
+		_dt = self.item_dt(post_id)
+		return f'{self.site}/{_dt:%Y/%m/%d}/post-{post_id}/'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def attachment_url(self, att_id) -> str:
+		_dt = self.item_dt(att_id)
+		return f'{self.site}/wp-content/uploads/{_dt:%Y/%m}/image-{att_id}.jpg'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def words(self, n) -> str:
+		_rnd = self.rnd
+		return ' '.join(_rnd.choice(WORDS) for _ in range(n))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def body(self) -> str:
+		"""
+		return gutenberg-style post body of roughly body_size chars,
+		with paragraphs, headings, images, links and shortcodes.
+		"""
+		_rnd = self.rnd
+		parts = []
+		_size = 0
+		while _size < self.body_size:
+			_kind = _rnd.random()
+			if _kind < 0.65:
+				blk = '<!-- wp:paragraph -->\n<p>' + self.words(_rnd.randint(20, 60))
+				if _rnd.random() < 0.3 and self.post_ids:
+					_ref = _rnd.choice(self.post_ids)
+					blk += f' <a href="{self.post_link(_ref)}">related</a>'
+				blk += '</p>\n<!-- /wp:paragraph -->'
+			elif _kind < 0.75:
+				blk = '<!-- wp:heading {"level":2} -->\n<h2>' + \
+					self.words(_rnd.randint(3, 8)) + '</h2>\n<!-- /wp:heading -->'
+			elif _kind < 0.9 and self.attachment_ids:
+				_att = _rnd.choice(self.attachment_ids)
+				blk = f'<!-- wp:image {{"id":{_att},"sizeSlug":"large"}} -->\n' + \
+					f'<figure class="wp-block-image size-large"><img src="{self.attachment_url(_att)}" alt="" class="wp-image-{_att}"/></figure>\n' + \
+					'<!-- /wp:image -->'
+			elif _kind < 0.95:
+				blk = '<!-- wp:quote -->\n<blockquote class="wp-block-quote"><!-- wp:paragraph -->\n<p>' + \
+					self.words(_rnd.randint(10, 30)) + \
+					'</p>\n<!-- /wp:paragraph --></blockquote>\n<!-- /wp:quote -->'
+			else:
+				blk = '<!-- wp:shortcode -->\n[gallery columns="3" ids="1,2,3"]\n<!-- /wp:shortcode -->'
+			parts.append(blk)
+			_size += len(blk)
+		return '\n\n'.join(parts)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def comment_xml(self, post_id, comment_id) -> str:
+		_rnd = self.rnd
+		_dt = self.item_dt(post_id) + datetime.timedelta(hours=comment_id % 5000)
+		_approved = _rnd.choices(['1', '0', 'spam'], weights=[85, 10, 5])[0]
+		_author = f'reader{_rnd.randint(1, 500)}'
+		return (
+			'\t\t<wp:comment>\n'
+			f'\t\t\t<wp:comment_id>{comment_id}</wp:comment_id>\n'
+			f'\t\t\t<wp:comment_author><![CDATA[{_author}]]></wp:comment_author>\n'
+			f'\t\t\t<wp:comment_author_email><![CDATA[{_author}@example.com]]></wp:comment_author_email>\n'
+			f'\t\t\t<wp:comment_date><![CDATA[{_dt:{WP_DATE_FMT}}]]></wp:comment_date>\n'
+			f'\t\t\t<wp:comment_date_gmt><![CDATA[{_dt:{WP_DATE_FMT}}]]></wp:comment_date_gmt>\n'
+			f'\t\t\t<wp:comment_content><![CDATA[{self.words(_rnd.randint(5, 40))}]]></wp:comment_content>\n'
+			f'\t\t\t<wp:comment_approved><![CDATA[{_approved}]]></wp:comment_approved>\n'
+			'\t\t\t<wp:comment_type><![CDATA[comment]]></wp:comment_type>\n'
+			'\t\t\t<wp:comment_parent>0</wp:comment_parent>\n'
+			'\t\t</wp:comment>\n'
+			)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def item_xml(self, post_id, post_type, status, title, content, post_name,\
+		link, post_parent=0, attachment_url='', categories=(), tags=(),\
+		thumbnail_id=0, comments=0, comment_id_start=1) -> str:
+		_dt = self.item_dt(post_id)
+		xml = (
+			'\t<item>\n'
+			f'\t\t<title><![CDATA[{title}]]></title>\n'
+			f'\t\t<link>{link}</link>\n'
+			f'\t\t<pubDate>{_dt.strftime(PUB_DATE_FMT)}</pubDate>\n'
+			'\t\t<dc:creator><![CDATA[admin]]></dc:creator>\n'
+			f'\t\t<guid isPermaLink="false">{self.site}/?p={post_id}</guid>\n'
+			'\t\t<description></description>\n'
+			f'\t\t<content:encoded><![CDATA[{content}]]></content:encoded>\n'
+			'\t\t<excerpt:encoded><![CDATA[]]></excerpt:encoded>\n'
+			f'\t\t<wp:post_id>{post_id}</wp:post_id>\n'
+			f'\t\t<wp:post_date><![CDATA[{_dt:{WP_DATE_FMT}}]]></wp:post_date>\n'
+			f'\t\t<wp:post_date_gmt><![CDATA[{_dt:{WP_DATE_FMT}}]]></wp:post_date_gmt>\n'
+			'\t\t<wp:comment_status><![CDATA[open]]></wp:comment_status>\n'
+			f'\t\t<wp:post_name><![CDATA[{post_name}]]></wp:post_name>\n'
+			f'\t\t<wp:status><![CDATA[{status}]]></wp:status>\n'
+			f'\t\t<wp:post_parent>{post_parent}</wp:post_parent>\n'
+			'\t\t<wp:menu_order>0</wp:menu_order>\n'
+			f'\t\t<wp:post_type><![CDATA[{post_type}]]></wp:post_type>\n'
+			)
+		if attachment_url:
+			xml += f'\t\t<wp:attachment_url><![CDATA[{attachment_url}]]></wp:attachment_url>\n'
+		for c in categories:
+			xml += f'\t\t<category domain="category" nicename="{c}"><![CDATA[{c.title()}]]></category>\n'
+		for t in tags:
+			xml += f'\t\t<category domain="post_tag" nicename="{t}"><![CDATA[{t.title()}]]></category>\n'
+		if thumbnail_id:
+			xml += ('\t\t<wp:postmeta>\n'
+				'\t\t\t<wp:meta_key><![CDATA[_thumbnail_id]]></wp:meta_key>\n'
+				f'\t\t\t<wp:meta_value><![CDATA[{thumbnail_id}]]></wp:meta_value>\n'
+				'\t\t</wp:postmeta>\n')
+		for n in range(comments):
+			xml += self.comment_xml(post_id, comment_id_start + n)
+		xml += '\t</item>\n'
+		return xml
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def write(self, path) -> str:
+		"""
+		write the synthetic export to [path], return path.
+		"""
+		_rnd = self.rnd
+		comment_id = 1
+
+		with open(path, 'w', encoding='utf-8') as fd:
+			fd.write(WXR_HEADER.format(site=self.site))
+
+			for post_id in self.post_ids:
+				_status = _rnd.choices(['publish', 'draft', 'private'], weights=[90, 8, 2])[0]
+				_cats = _rnd.sample(self.cat_slugs, min(len(self.cat_slugs), _rnd.randint(1, 3)))
+				_tags = _rnd.sample(self.tag_slugs, min(len(self.tag_slugs), _rnd.randint(0, 6)))
+				_thumb = _rnd.choice(self.attachment_ids) if self.attachment_ids and _rnd.random() < 0.5 else 0
+				_n_comments = _rnd.randint(0, 2 * self.comments) if self.comments else 0
+				fd.write(self.item_xml(post_id, 'post', _status,
+					title=self.words(_rnd.randint(3, 9)).title(),
+					content=self.body(),
+					post_name=f'post-{post_id}',
+					link=self.post_link(post_id),
+					categories=_cats, tags=_tags,
+					thumbnail_id=_thumb,
+					comments=_n_comments,
+					comment_id_start=comment_id))
+				comment_id += _n_comments
+
+			for n, page_id in enumerate(self.page_ids):
+				# each page hangs under an earlier page, giving a deep tree.
+				_parent = self.page_ids[_rnd.randrange(n)] if n > 0 and _rnd.random() < 0.8 else 0
+				fd.write(self.item_xml(page_id, 'page', 'publish',
+					title=self.words(_rnd.randint(2, 5)).title(),
+					content=self.body(),
+					post_name=f'page-{page_id}',
+					link=f'{self.site}/page-{page_id}/',
+					post_parent=_parent))
+
+			for att_id in self.attachment_ids:
+				_parent = _rnd.choice(self.post_ids) if self.post_ids and _rnd.random() < 0.8 else 0
+				_url = self.attachment_url(att_id)
+				fd.write(self.item_xml(att_id, 'attachment', 'inherit',
+					title=f'image-{att_id}',
+					content='',
+					post_name=f'image-{att_id}',
+					link=f'{self.site}/?attachment_id={att_id}',
+					post_parent=_parent,
+					attachment_url=_url))
+
+			fd.write(WXR_FOOTER)
+
+		return path
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def run_pipeline(xml_path, xlsx_path, timer:Stage_Timer):
+	"""
+	run each pipeline stage once under [timer].
+	"""
+	session = WP_Export_Session(xml_path)
+
+	with timer.stage('parse') as st:
+		item_list = wpx.read_xml_items(xml_path)
+		st['items'] = len(item_list)
+
+	with timer.stage('construct') as st:
+		for item_no, item in enumerate(item_list, start=1):
+			session.add_item(item_no, item)
+		st['items'] = len(session)
+
+	del item_list
+
+	with timer.stage('set_srt_node_list') as st:
+		session.sort()
+		st['items'] = len(session.srt_node_list)
+
+	with timer.stage('attach_images_to_parents') as st:
+		session.attach_images_to_parents()
+		st['items'] = len(session.srt_node_list)
+
+	publish_list = list(session.iter_records(status='publish', newest_first=True))
+	attach_list = list(session.iter_records(status='inherit', newest_first=True))
+
+	with timer.stage('report_render') as st:
+		msg_list = session.report_msgs(publish_list, attach_list)
+		st['items'] = len(publish_list) + len(attach_list)
+
+	with timer.stage('list_to_xlsx') as st:
+		list_to_xlsx(session.xlsx_rows(publish_list), xlsx_path)
+		st['items'] = len(publish_list)
+
+	del msg_list
+	session.close()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def run_benchmark(gen:WXR_Generator, repeat=3, trace_memory=True, workdir=None) -> dict:
+	"""
+	generate an export, run the pipeline [repeat] times,
+	return results dict with per-stage minimum and median.
+	"""
+	_tmp = None
+	if workdir is None:
+		_tmp = tempfile.TemporaryDirectory(prefix='wp_bench_')
+		workdir = _tmp.name
+
+	_dir = pathlib.Path(workdir)
+	xml_path = str(_dir / f'bench_{gen.seed}.xml')
+	xlsx_path = str(_dir / f'bench_{gen.seed}.xlsx')
+
+	gen.write(xml_path)
+
+	run_list = []
+	for _ in range(repeat):
+		timer = Stage_Timer(enabled=True, trace_memory=trace_memory)
+		run_pipeline(xml_path, xlsx_path, timer)
+		run_list.append(timer.as_dict_list())
+
+	stage_list = []
+	for n, st in enumerate(run_list[0]):
+		_walls = [r[n]['wall_s'] for r in run_list]
+		_cpus = [r[n]['cpu_s'] for r in run_list]
+		_mems = [r[n].get('peak_mem_kb', 0.0) for r in run_list]
+		_min_wall = min(_walls)
+		stage_list.append({
+			'name': st['name'],
+			'items': st['items'],
+			'wall_s_min': _min_wall,
+			'wall_s_median': statistics.median(_walls),
+			'cpu_s_min': min(_cpus),
+			'items_per_s': st['items'] / _min_wall if _min_wall > 0 else 0.0,
+			'peak_mem_kb': max(_mems),
+			})
+
+	results = {
+		'meta': {
+			'program': 'wp_bench',
+			'version': __version__,
+			'extract_version': wpx.__version__,
+			'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'repeat': repeat,
+			'trace_memory': trace_memory,
+			'xml_bytes': pathlib.Path(xml_path).stat().st_size,
+			},
+		'params': gen.as_dict(),
+		'stages': stage_list,
+		}
+
+	if _tmp is not None:
+		_tmp.cleanup()
+
+	return results
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+STARTUP_CMDS = (
+	('interpreter', ['-c', 'pass']),
+	('import', ['-c', 'import wp_xml_export_extract']),
+	('help', ['-m', 'wp_xml_export_extract', '--help']),
+	)
+
+DEFERRED_MODULES = ('xmltodict', 'openpyxl', 'mimetypes', 'hashlib', 'concurrent.futures',\
+	'json', 'csv', 'pickle', 'mmap', 'wp_text_index', 'wp_dedupe', 'wp_blocks', 'wp_links',\
+	'wp_metrics', 'wp_tree', 'wp_rollup', 'wp_serve', 'wp_watch')
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def measure_startup(repeat=7, budget_ms=100.0) -> dict:
+	"""
+	time each of STARTUP_CMDS in a fresh interpreter [repeat]
+	times, return results dict with per-command minimum and
+	median milliseconds, the DEFERRED_MODULES found loaded after
+	import, and whether every command is within [budget_ms].
+	"""
+	_cwd = str(pathlib.Path(__file__).resolve().parent)
+	cmd_list = []
+	for name, _argv in STARTUP_CMDS:
+		_times = []
+		for _ in range(repeat):
+			_start = time.perf_counter()
+			subprocess.run([sys.executable] + _argv, cwd=_cwd, check=True,\
+				stdout=subprocess.DEVNULL)
+			_times.append((time.perf_counter() - _start) * 1000)
+		cmd_list.append({'name': name, 'ms_min': min(_times), 'ms_median': statistics.median(_times)})
+
+	_probe = 'import sys, wp_xml_export_extract; ' + \
+		f'print(" ".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))'
+	_out = subprocess.run([sys.executable, '-c', _probe], cwd=_cwd, check=True,\
+		capture_output=True, text=True).stdout
+	_loaded = _out.split()
+
+	return {
+		'meta': {
+			'program': 'wp_bench',
+			'version': __version__,
+			'extract_version': wpx.__version__,
+			'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+			'python': platform.python_version(),
+			'platform': platform.platform(),
+			'repeat': repeat,
+			},
+		'budget_ms': budget_ms,
+		'commands': cmd_list,
+		'loaded_at_import': _loaded,
+		'ok': not _loaded and all(c['ms_min'] <= budget_ms for c in cmd_list),
+		}
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def startup_as_str(results:dict) -> str:
+	_msg = f'{LF} {"start":<14} {"min ms":>10} {"median ms":>10}'
+	for c in results['commands']:
+		_flag = '  OVER BUDGET' if c['ms_min'] > results['budget_ms'] else ''
+		_msg += f'{LF} {c["name"]:<14} {c["ms_min"]:10.1f} {c["ms_median"]:10.1f}{_flag}'
+	_msg += f'{LF}{LF} budget: {results["budget_ms"]:.0f} ms'
+	_loaded = ', '.join(results['loaded_at_import']) or 'none'
+	_msg += f'{LF} deferred modules loaded at import: {_loaded}'
+	return _msg
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def compare_results(new:dict, base:dict, threshold=0.10) -> list:
+	"""
+	return list of (stage, base wall, new wall, ratio, is_regression).
+	"""
+	_base = {st['name']: st for st in base.get('stages', [])}
+	cmp_list = []
+	for st in new.get('stages', []):
+		b = _base.get(st['name'])
+		if b is None:
+			continue
+		_bw = b['wall_s_min']
+		_nw = st['wall_s_min']
+		_ratio = _nw / _bw if _bw > 0 else 0.0
+		cmp_list.append((st['name'], _bw, _nw, _ratio, _ratio > 1 + threshold))
+	return cmp_list
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def results_as_str(results:dict) -> str:
+	_msg = f'{LF}params: {results["params"]}'
+	_msg += f'{LF}xml bytes: {results["meta"]["xml_bytes"]}  repeat: {results["meta"]["repeat"]}'
+	_msg += f'{LF}{LF} {"stage":<26} {"items":>8} {"min s":>10} {"median s":>10} {"items/s":>12} {"peak KB":>12}'
+	for st in results['stages']:
+		_msg += f'{LF} {st["name"]:<26} {st["items"]:8d} {st["wall_s_min"]:10.4f} ' + \
+			f'{st["wall_s_median"]:10.4f} {st["items_per_s"]:12.1f} {st["peak_mem_kb"]:12.1f}'
+	return _msg
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_bench', description='benchmark the wp_xml_export_extract pipeline.')
+	ap.add_argument('--posts', type=int, default=1000)
+	ap.add_argument('--attachments', type=int, default=500)
+	ap.add_argument('--comments', type=int, default=5, help='average comments per post')
+	ap.add_argument('--terms', type=int, default=50, help='distinct categories + tags')
+	ap.add_argument('--body-size', type=int, default=2000, help='approx. chars per post body')
+	ap.add_argument('--pages', type=int, default=0)
+	ap.add_argument('--seed', type=int, default=1)
+	ap.add_argument('--repeat', type=int, default=3)
+	ap.add_argument('--no-memory', action='store_true', help='skip tracemalloc (lower overhead)')
+	ap.add_argument('--workdir', default=None, help='keep generated files here')
+	ap.add_argument('--generate-only', default=None, metavar='XML_PATH', help='only write a synthetic export')
+	ap.add_argument('--out', default=None, help='results json path')
+	ap.add_argument('--compare', default=None, help='baseline results json path')
+	ap.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown ratio')
+	ap.add_argument('--startup', action='store_true', help='only time cold starts of wp_xml_export_extract')
+	ap.add_argument('--startup-budget', type=float, default=100.0, metavar='MS',\
+		help='cold start budget for --startup (default 100)')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+
+	if args.startup:
+		results = measure_startup(repeat=max(args.repeat, 5), budget_ms=args.startup_budget)
+		print(startup_as_str(results))
+		if args.out:
+			with open(args.out, 'w', encoding='utf-8') as fd:
+				json.dump(results, fd, indent=2)
+			print(f'{LF}results written: {args.out}')
+		return 0 if results['ok'] else 1
+
+	gen = WXR_Generator(posts=args.posts, attachments=args.attachments,\
+		comments=args.comments, terms=args.terms, body_size=args.body_size,\
+		pages=args.pages, seed=args.seed)
+
+	if args.generate_only:
+		gen.write(args.generate_only)
+		print(f'synthetic export written: {args.generate_only}')
+		return 0
+
+	results = run_benchmark(gen, repeat=args.repeat,\
+		trace_memory=not args.no_memory, workdir=args.workdir)
+
+	print(results_as_str(results))
+
+	if args.out:
+		with open(args.out, 'w', encoding='utf-8') as fd:
+			json.dump(results, fd, indent=2)
+		print(f'{LF}results written: {args.out}')
+
+	retcode = 0
+	if args.compare:
+		with open(args.compare, 'r', encoding='utf-8') as fd:
+			base = json.load(fd)
+		if base.get('params') != results['params']:
+			print(f'{LF}warning: baseline params differ: {base.get("params")}')
+		print(f'{LF} {"stage":<26} {"base s":>10} {"new s":>10} {"ratio":>8}')
+		for name, bw, nw, ratio, is_reg in compare_results(results, base, args.threshold):
+			_flag = '  REGRESSION' if is_reg else ''
+			print(f' {name:<26} {bw:10.4f} {nw:10.4f} {ratio:8.2f}{_flag}')
+			if is_reg:
+				retcode = 1
+
+	return retcode
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
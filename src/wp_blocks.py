@@ -0,0 +1,342 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_blocks records Gutenberg block structure and
+shortcode usage of post content for migration planning.
+
+WP_Block_Stats scans a raw content:encoded body once with
+str.find, handling block comments
+ <!-- wp:name {attrs} -->, <!-- wp:name {attrs} /-->, <!-- /wp:name -->
+and shortcodes [name ...].  The only regexes are anchored at a
+known '[' and cannot backtrack, so cost stays linear in the
+size of the post.
+
+A bracketed word counts as a shortcode only if it is a known
+core or Jetpack shortcode, has name=value attributes, or is
+closed by a later [/name], so prose like "[sic]" is not counted.
+Brackets inside html tags (attribute values) are skipped.
+
+WP_Block_Totals sums the per-post stats for a site.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import json
+import re
+from collections import Counter
+
+from sparkwarden_file_lib import LF
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Block_Stats:
+	"""
+	Block types, nesting depth, block attribute names and
+	shortcodes of one post body.
+	"""
+
+	shortcode_re = re.compile(r'([A-Za-z][\w-]*)(\s+[\w-]+\s*=|[\s\]/])')
+	close_re = re.compile(r'/([A-Za-z][\w-]*)\]')
+
+	# core, Jetpack and WordPress.com shortcodes.
+	known_shortcodes = frozenset(('archives', 'audio', 'bandcamp', 'caption', 'code',\
+		'contact-field', 'contact-form', 'crowdsignal', 'dailymotion', 'embed', 'facebook',\
+		'flickr', 'gallery', 'gist', 'googleapps', 'googlemaps', 'instagram', 'latex',\
+		'playlist', 'polldaddy', 'portfolio', 'recipe', 'scribd', 'slideshare', 'slideshow',\
+		'soundcloud', 'sourcecode', 'spotify', 'ted', 'tiled-gallery', 'tweet',\
+		'twitter-timeline', 'video', 'vimeo', 'vine', 'wp_caption', 'wpvideo', 'youtube'))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, content):
+		self.block_cnt = Counter()			# block name: count
+		self.attr_cnt = Counter()			# (block name, attr name): count
+		self.shortcode_cnt = Counter()		# shortcode name: count
+		self.max_depth = 0
+		self.error_cnt = 0					# unbalanced or malformed blocks
+
+		if isinstance(content, str) and content:
+			self.scan(content)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def block_name(name:str) -> str:
+		"""
+		return block name with the implied 'core/' namespace dropped.
+		"""
+		if name.startswith('core/'):
+			return name[5:]
+		return name
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def scan(self, text:str):
+		_find = text.find
+		_sc_match = WP_Block_Stats.shortcode_re.match
+		_close_match = WP_Block_Stats.close_re.match
+		_known = WP_Block_Stats.known_shortcodes
+		stack = []
+		_pending = Counter()				# unknown bare [name]: counted if closed
+		_closed = set()
+
+		# last html tag start before the current '[' and its end,
+		# len(text) once no '>' is left.  Each '>' is found once.
+		_lt_pos, _gt_pos = -1, -1
+		_next_lt = _find('<')
+
+		c_pos = _find('<!--')
+		s_pos = _find('[')
+
+		while c_pos >= 0 or s_pos >= 0:
+
+			if c_pos >= 0 and (s_pos < 0 or c_pos < s_pos):
+				_end = _find('-->', c_pos + 4)
+				if _end < 0:
+					break
+				_body = text[c_pos + 4:_end].strip()
+				if _body.startswith('wp:'):
+					self.open_block(_body[3:], stack)
+				elif _body.startswith('/wp:'):
+					self.close_block(_body[4:].strip(), stack)
+
+				_next = _end + 3
+				c_pos = _find('<!--', _next)
+				if 0 <= s_pos < _next:
+					s_pos = _find('[', _next)
+
+			else:
+				while 0 <= _next_lt < s_pos:
+					_lt_pos = _next_lt
+					if _gt_pos < _lt_pos:
+						_gt_pos = _find('>', _lt_pos)
+						if _gt_pos < 0:
+							_gt_pos = len(text)
+					_next_lt = _find('<', _lt_pos + 1)
+				_in_tag = _lt_pos >= 0 and _gt_pos > s_pos
+				if not _in_tag:
+					self.scan_bracket(text, s_pos, _sc_match, _close_match, _known, _pending, _closed)
+				s_pos = _find('[', s_pos + 1)
+
+		for name, n in _pending.items():
+			if name in _closed:
+				self.shortcode_cnt[name] += n
+		self.error_cnt += len(stack)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def scan_bracket(self, text:str, s_pos:int, sc_match, close_match, known, pending, closed):
+		"""
+		count the shortcode opened at [s_pos], or note a closing
+		[/name] or an unknown bare [name].
+		"""
+		m = close_match(text, s_pos + 1)
+		if m is not None:
+			closed.add(m.group(1))
+			return
+		m = sc_match(text, s_pos + 1)
+		if m is None:
+			return
+		_name = m.group(1)
+		if _name.lower() in known or m.group(2).endswith('='):
+			self.shortcode_cnt[_name] += 1
+		else:
+			pending[_name] += 1
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def open_block(self, body:str, stack:list):
+		_self_closing = body.endswith('/')
+		if _self_closing:
+			body = body[:-1].rstrip()
+
+		_parts = body.split(None, 1)
+		if not _parts:
+			self.error_cnt += 1
+			return
+		_name = WP_Block_Stats.block_name(_parts[0])
+		self.block_cnt[_name] += 1
+
+		if len(_parts) > 1:
+			try:
+				_attrs = json.loads(_parts[1])
+				if isinstance(_attrs, dict):
+					for k in _attrs:
+						self.attr_cnt[(_name, k)] += 1
+			except ValueError:
+				self.error_cnt += 1
+
+		_depth = len(stack) + 1
+		if _depth > self.max_depth:
+			self.max_depth = _depth
+		if not _self_closing:
+			stack.append(_name)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def close_block(self, name:str, stack:list):
+		_name = WP_Block_Stats.block_name(name)
+		if stack and stack[-1] == _name:
+			stack.pop()
+			return
+		self.error_cnt += 1
+		if _name in stack:
+			while stack and stack.pop() != _name:
+				pass
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@property
+	def total_blocks(self) -> int:
+		return sum(self.block_cnt.values())
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@property
+	def total_shortcodes(self) -> int:
+		return sum(self.shortcode_cnt.values())
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def as_str(self) -> str:
+		_types = ', '.join(f'{k} {v}' for k, v in self.block_cnt.most_common())
+		_codes = ', '.join(f'{k} {v}' for k, v in self.shortcode_cnt.most_common())
+		return f'{self.total_blocks} block(s), depth {self.max_depth}: {_types}' + \
+			f'{LF} shortcodes: {_codes}'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def as_xlsx_row(self) -> list:
+		_types = ', '.join(k for k, _ in self.block_cnt.most_common())
+		_codes = ', '.join(k for k, _ in self.shortcode_cnt.most_common())
+		return [self.total_blocks, self.max_depth, _types, self.total_shortcodes, _codes]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def as_xlsx_hdr() -> list:
+		return ['#blocks','block depth','block types','#shortcodes','shortcodes']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __repr__(self) -> str:
+		return self.as_str()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Block_Totals:
+	"""
+	Per-site block and shortcode totals summed over posts.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, post_list:list=()):
+		self.post_cnt = 0
+		self.block_post_cnt = 0				# posts with any block
+		self.block_cnt = Counter()
+		self.block_posts = Counter()		# block name: posts using it
+		self.attr_cnt = Counter()
+		self.shortcode_cnt = Counter()
+		self.shortcode_posts = Counter()
+		self.depth_cnt = Counter()			# max depth: posts
+		self.error_cnt = 0
+
+		for p in post_list:
+			self.add(p.block_stats)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add(self, bs:WP_Block_Stats):
+		self.post_cnt += 1
+		if bs.block_cnt:
+			self.block_post_cnt += 1
+		self.block_cnt.update(bs.block_cnt)
+		self.block_posts.update(bs.block_cnt.keys())
+		self.attr_cnt.update(bs.attr_cnt)
+		self.shortcode_cnt.update(bs.shortcode_cnt)
+		self.shortcode_posts.update(bs.shortcode_cnt.keys())
+		self.depth_cnt[bs.max_depth] += 1
+		self.error_cnt += bs.error_cnt
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self) -> list:
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Block Summary: {self.block_post_cnt} of {self.post_cnt} ' + \
+			f'posts use blocks, {sum(self.block_cnt.values())} blocks, ' + \
+			f'{len(self.block_cnt)} block types, {self.error_cnt} unbalanced/malformed. {LF}')
+
+		msg_list.append(f'{LF} Block types (blocks / posts): ')
+		for name, n in self.block_cnt.most_common():
+			msg_list.append(f'{LF}  {n:8d} {self.block_posts[name]:8d}  {name}')
+
+		msg_list.append(f'{LF}{LF} Nesting depth (posts): ')
+		for depth in sorted(self.depth_cnt):
+			msg_list.append(f'{LF}  {depth:3d}  {self.depth_cnt[depth]:8d}')
+
+		msg_list.append(f'{LF}{LF} Shortcodes (uses / posts): ')
+		for name, n in self.shortcode_cnt.most_common():
+			msg_list.append(f'{LF}  {n:8d} {self.shortcode_posts[name]:8d}  [{name}]')
+
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self) -> list:
+		xlsx_list = [['kind','name','attribute','count','posts']]
+		for name, n in self.block_cnt.most_common():
+			xlsx_list.append(['block', name, '', n, self.block_posts[name]])
+		for (name, attr), n in self.attr_cnt.most_common():
+			xlsx_list.append(['block attribute', name, attr, n, ''])
+		for name, n in self.shortcode_cnt.most_common():
+			xlsx_list.append(['shortcode', name, '', n, self.shortcode_posts[name]])
+		for depth in sorted(self.depth_cnt):
+			xlsx_list.append(['max depth', str(depth), '', self.depth_cnt[depth], self.depth_cnt[depth]])
+		return xlsx_list
@@ -0,0 +1,312 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_dedupe finds near-duplicate posts within and
+across Wordpress export files.
+
+Each post's cleaned content is cut into word shingles, hashed
+once per shingle with a rolling hash, and reduced to a fixed-size
+MinHash signature by one-permutation hashing (each hash lands in
+one of bands*rows bins, keeping the bin minimum).  Signatures are
+banded for LSH; posts sharing a band bucket are compared by
+signature and joined into clusters.  Work grows roughly linearly
+with the number of posts, and only signatures and a few fields
+per post are kept between exports.
+
+Usage:
+ python wp_dedupe.py [dir or xml files] --threshold 0.8 --xlsx dupes.xlsx
+
+Required modules:
+ wp_xml_export_extract - export parsing.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import pathlib
+import re
+import sys
+import zlib
+from array import array
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import list_to_xlsx
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+MASK64 = (1 << 64) - 1
+EMPTY_BIN = MASK64
+ROLL_PRIME = 1099511628211
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def mix64(h:int) -> int:
+	"""
+	splitmix64 finalizer, spreads rolling hash bits.
+	"""
+	h = ((h ^ (h >> 30)) * 0xbf58476d1ce4e5b9) & MASK64
+	h = ((h ^ (h >> 27)) * 0x94d049bb133111eb) & MASK64
+	return h ^ (h >> 31)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Dedupe:
+	"""
+	Near-duplicate post detector using one-permutation MinHash
+	signatures and LSH banding.
+	"""
+
+	word_re = re.compile(r'\w+')
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, bands=16, rows=4, shingle=5, threshold=0.8, min_words=20):
+		self.bands = bands
+		self.rows = rows
+		self.num_bins = bands * rows
+		self.shingle = shingle
+		self.threshold = threshold
+		self.min_words = min_words
+		self.doc_list = []			# (xml path, post_id, title, link, words)
+		self.sig_list = []			# array('Q') per doc
+		self.skipped_cnt = 0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def signature(self, text:str):
+		"""
+		return (signature array, word count) for [text].
+		"""
+		_words = WP_Dedupe.word_re.findall(str(text).lower())
+		_n = len(_words)
+		_k = min(self.shingle, _n) or 1
+		_bins = self.num_bins
+		sig = [EMPTY_BIN] * _bins
+
+		_word_hashes = [zlib.crc32(w.encode('utf-8')) for w in _words] or [0]
+		_top = pow(ROLL_PRIME, _k - 1, 1 << 64)
+
+		h = 0
+		for i, wh in enumerate(_word_hashes):
+			if i >= _k:
+				h = (h - _word_hashes[i - _k] * _top) & MASK64
+			h = (h * ROLL_PRIME + wh) & MASK64
+			if i >= _k - 1:
+				m = mix64(h)
+				_b = m % _bins
+				_v = m // _bins
+				if _v < sig[_b]:
+					sig[_b] = _v
+
+		# densify: an empty bin borrows the next filled bin's value,
+		# shifted by the distance so borrowed values stay distinct.
+		if EMPTY_BIN in sig:
+			_filled = [i for i, v in enumerate(sig) if v != EMPTY_BIN]
+			if _filled:
+				_dense = list(sig)
+				for i in range(_bins):
+					if sig[i] == EMPTY_BIN:
+						_dist = 1
+						while sig[(i + _dist) % _bins] == EMPTY_BIN:
+							_dist += 1
+						_dense[i] = mix64(sig[(i + _dist) % _bins] + _dist)
+				sig = _dense
+
+		return array('Q', sig), _n
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_posts(self, xml_path, node_list:list) -> int:
+		"""
+		add signatures for the posts in [node_list],
+		return number of posts added.
+		"""
+		add_cnt = 0
+		for nd in node_list:
+			if nd.post_type != 'post':
+				continue
+			sig, _n = self.signature(nd.content)
+			if _n < self.min_words:
+				self.skipped_cnt += 1
+				continue
+			self.doc_list.append((str(xml_path), nd.post_id, str(nd.title), str(nd.link), _n))
+			self.sig_list.append(sig)
+			add_cnt += 1
+		return add_cnt
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def similarity(sig_a, sig_b) -> float:
+		"""
+		return estimated jaccard similarity of two signatures.
+		"""
+		_eq = sum(1 for a, b in zip(sig_a, sig_b) if a == b)
+		return _eq / len(sig_a)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def clusters(self) -> list:
+		"""
+		return list of clusters, each a list of (doc index,
+		similarity to the cluster's first doc), largest first.
+		"""
+		_sigs = self.sig_list
+		_rows = self.rows
+		_thr = self.threshold
+		_sim = WP_Dedupe.similarity
+
+		parent = list(range(len(_sigs)))
+
+		def find(i):
+			while parent[i] != i:
+				parent[i] = parent[parent[i]]
+				i = parent[i]
+			return i
+
+		for b in range(self.bands):
+			_lo = b * _rows
+			_hi = _lo + _rows
+			buckets = {}
+			for i, sig in enumerate(_sigs):
+				_key = sig[_lo:_hi].tobytes()
+				_first = buckets.setdefault(_key, i)
+				if _first == i:
+					continue
+				ra = find(_first)
+				rb = find(i)
+				if ra != rb and _sim(_sigs[_first], sig) >= _thr:
+					parent[rb] = ra
+
+		groups = {}
+		for i in range(len(_sigs)):
+			groups.setdefault(find(i), []).append(i)
+
+		cluster_list = []
+		for members in groups.values():
+			if len(members) < 2:
+				continue
+			_head = members[0]
+			cluster_list.append([(i, _sim(_sigs[_head], _sigs[i])) for i in members])
+
+		cluster_list.sort(key=len, reverse=True)
+		return cluster_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self, cluster_list=None) -> list:
+		if cluster_list is None:
+			cluster_list = self.clusters()
+		_dup_cnt = sum(len(c) for c in cluster_list)
+
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Near-duplicate posts: {len(cluster_list)} cluster(s), ' + \
+			f'{_dup_cnt} of {len(self.doc_list)} posts (threshold {self.threshold}, ' + \
+			f'{self.skipped_cnt} short posts skipped). {LF}')
+
+		for n, c in enumerate(cluster_list, start=1):
+			msg_list.append(f'{LF} cluster {n}: {len(c)} posts')
+			for i, sim in c:
+				_path, _post_id, _title, _link, _words = self.doc_list[i]
+				msg_list.append(f'{LF}  {sim:5.2f}  {_post_id}  {_title}  {_link}  [{_path}]')
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self, cluster_list=None) -> list:
+		if cluster_list is None:
+			cluster_list = self.clusters()
+		xlsx_list = [['cluster','similarity','post id','title','link','words','xml path']]
+		for n, c in enumerate(cluster_list, start=1):
+			for i, sim in c:
+				_path, _post_id, _title, _link, _words = self.doc_list[i]
+				xlsx_list.append([n, round(sim, 3), _post_id, _title, _link, _words, _path])
+		return xlsx_list
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_dedupe', description='find near-duplicate posts in Wordpress exports.')
+	ap.add_argument('paths', nargs='*', help='export xml files or directories (default: cwd)')
+	ap.add_argument('--threshold', type=float, default=0.8, help='estimated jaccard similarity')
+	ap.add_argument('--bands', type=int, default=16)
+	ap.add_argument('--rows', type=int, default=4)
+	ap.add_argument('--shingle', type=int, default=5, help='words per shingle')
+	ap.add_argument('--min-words', type=int, default=20, help='skip shorter posts')
+	ap.add_argument('--xlsx', default=None, help='write clusters to this excel file')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	import wp_xml_export_extract as wpx
+
+	args = parse_args(argv)
+
+	xml_file_list = []
+	for p in args.paths or [str(pathlib.Path().cwd())]:
+		if pathlib.Path(p).is_dir():
+			xml_file_list += build_stream_file_list(p, '*.xml')
+		else:
+			xml_file_list.append(p)
+
+	dedupe = WP_Dedupe(bands=args.bands, rows=args.rows, shingle=args.shingle,\
+		threshold=args.threshold, min_words=args.min_words)
+
+	for path in xml_file_list:
+		session = wpx.WP_Export_Session(path)
+		session.load()
+		dedupe.add_posts(path, session.node_list)
+		session.close()
+
+	cluster_list = dedupe.clusters()
+	print(''.join(dedupe.report_msgs(cluster_list)))
+
+	if args.xlsx:
+		list_to_xlsx(dedupe.xlsx_rows(cluster_list), args.xlsx)
+
+	return 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
@@ -0,0 +1,341 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_links builds the internal link graph of an
+export and finds broken internal links.
+
+find_link_urls pulls every href/src value out of a raw post body
+in one regex pass.  WP_Link_Graph resolves those urls through
+hash indexes of post links, post names, ?p= style ids and
+attachment urls (including resized image variants), then keeps
+post-to-post links as compact CSR arrays.  Links to pages and
+other post types resolve through the hierarchy rows of every
+item (WP_Post_Tree); category, tag, author, date archive, feed
+and admin urls count as 'other', not broken.  Root-relative
+links are taken to be on the host of the channel <link>.
+Everything is linear in the number of posts and links.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import re
+import urllib.parse
+from array import array
+
+from sparkwarden_file_lib import LF
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+LINK_URL_RE = re.compile(r'''\b(?:href|src)\s*=\s*["']([^"'<>\s]+)["']''', re.IGNORECASE)
+IMAGE_SIZE_RE = re.compile(r'-\d+x\d+(?=\.\w+$)')
+ID_QUERY_KEYS = ('p', 'page_id', 'attachment_id')
+ARCHIVE_QUERY_KEYS = ('s', 'cat', 'tag', 'feed', 'm', 'author', 'paged', 'year', 'monthnum',\
+	'taxonomy', 'term', 'post_type')
+ARCHIVE_SEGMENTS = frozenset(('category', 'tag', 'author', 'feed', 'page', 'search', 'comments',\
+	'type', 'wp-admin', 'wp-json', 'wp-content', 'wp-includes'))
+DATE_ARCHIVE_RE = re.compile(r'/\d{4}(?:/\d{2}){0,2}$')
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def find_link_urls(content) -> tuple:
+	"""
+	return tuple of href/src values in a raw post body.
+	"""
+	if not isinstance(content, str):
+		return ()
+	return tuple(LINK_URL_RE.findall(content))
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def url_key(url:str) -> str:
+	"""
+	return url reduced to lowercase host + path without
+	scheme, query, fragment or trailing slash.
+	"""
+	_parts = urllib.parse.urlsplit(url.strip())
+	_path = _parts.path.rstrip('/')
+	return f'{_parts.netloc.lower()}{_path}'
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def is_archive_url(path:str, query:str='') -> bool:
+	"""
+	return True if a site url path (no trailing slash) and query
+	are a taxonomy, author, date archive, feed, search or admin url.
+	"""
+	if query and any(k in ARCHIVE_QUERY_KEYS for k in urllib.parse.parse_qs(query)):
+		return True
+	if path.endswith('.php') or DATE_ARCHIVE_RE.search(path):
+		return True
+	return any(seg in ARCHIVE_SEGMENTS for seg in path.split('/'))
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Link_Graph:
+	"""
+	Internal link graph over the posts of one export.
+	"""
+
+	top_n = 20
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, node_list:list, tree=None, site_link:str=''):
+		"""
+		[tree] is the WP_Post_Tree of the export, for links to
+		pages and other post types; [site_link] the channel <link>.
+		"""
+		self.post_list = [nd for nd in node_list if nd.post_type == 'post']
+		_attach_list = [nd for nd in node_list if nd.post_type == 'attachment']
+
+		self.site_hosts = set()
+		self.post_by_key = {}			# url key: post index
+		self.post_by_name = {}			# post_name: post index
+		self.post_by_id = {}			# post_id: post index
+		self.attach_by_key = {}			# url key: attachment post_id
+		self.item_by_key = {}			# url key: tree row, other post types
+		self.item_by_name = {}			# post_name: tree row
+		self.item_by_id = {}			# post_id: tree row
+		_attach_ids = set()
+
+		self.site_host = urllib.parse.urlsplit(str(site_link or '')).netloc.lower()
+		if self.site_host:
+			self.site_hosts.add(self.site_host)
+
+		for i, p in enumerate(self.post_list):
+			_link = str(p.link)
+			_host = urllib.parse.urlsplit(_link).netloc.lower()
+			if _host:
+				self.site_hosts.add(_host)
+			self.post_by_key[url_key(_link)] = i
+			self.post_by_name.setdefault(str(p.post_name), i)
+			self.post_by_id[p.post_id] = i
+
+		for a in _attach_list:
+			_attach_ids.add(a.post_id)
+			_url = str(a.attachment_url)
+			self.attach_by_key[url_key(_url)] = a.post_id
+			self.attach_by_key[url_key(str(a.link))] = a.post_id
+			_host = urllib.parse.urlsplit(_url).netloc.lower()
+			if _host:
+				self.site_hosts.add(_host)
+
+		self.attach_ids = _attach_ids
+
+		if tree is not None:
+			for i, _type in enumerate(tree.types):
+				if _type in ('post', 'attachment'):
+					continue
+				_link = tree.links[i]
+				if _link:
+					self.item_by_key.setdefault(url_key(_link), i)
+					_host = urllib.parse.urlsplit(_link).netloc.lower()
+					if _host:
+						self.site_hosts.add(_host)
+				if tree.names[i]:
+					self.item_by_name.setdefault(tree.names[i], i)
+				if tree.ids[i]:
+					self.item_by_id.setdefault(tree.ids[i], i)
+
+		if not self.site_host and self.site_hosts:
+			self.site_host = min(self.site_hosts)
+
+		self.link_cnt = 0
+		self.external_cnt = 0
+		self.attach_link_cnt = 0
+		self.item_link_cnt = 0			# to pages and other post types
+		self.other_cnt = 0				# archives, feeds, anchors, mailto ...
+		self.broken_list = []			# (post index, url, kind)
+
+		# CSR adjacency: targets of post i are
+		# targets[offsets[i]:offsets[i+1]].
+		self.offsets = array('I', [0])
+		self.targets = array('I')
+		self.inbound = array('I', bytes(4 * len(self.post_list)))
+
+		for i, p in enumerate(self.post_list):
+			_seen = set()
+			for url in getattr(p, 'link_urls', ()):
+				self.link_cnt += 1
+				_kind, _target = self.resolve(url)
+				if _kind == 'post':
+					if _target != i and _target not in _seen:
+						_seen.add(_target)
+						self.targets.append(_target)
+						self.inbound[_target] += 1
+				elif _kind == 'attachment':
+					self.attach_link_cnt += 1
+				elif _kind == 'item':
+					self.item_link_cnt += 1
+				elif _kind == 'external':
+					self.external_cnt += 1
+				elif _kind == 'other':
+					self.other_cnt += 1
+				else:
+					self.broken_list.append((i, url, _kind))
+			self.offsets.append(len(self.targets))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def resolve(self, url:str):
+		"""
+		return (kind, target) for a link url.  kind is 'post'
+		(target is post index), 'attachment' (target is post_id),
+		'item' (a page or other post type, target is tree row),
+		'external', 'other', 'broken post' or 'broken media'.
+		"""
+		if url.startswith(('#', 'mailto:', 'tel:', 'javascript:', 'data:')):
+			return 'other', None
+
+		_parts = urllib.parse.urlsplit(url)
+		_host = _parts.netloc.lower()
+		if _host and _host not in self.site_hosts:
+			return 'external', None
+		if not _host:
+			if not _parts.path.startswith('/'):
+				return 'other', None
+			_host = self.site_host
+
+		_path = _parts.path.rstrip('/')
+		_key = f'{_host}{_path}'
+
+		_idx = self.post_by_key.get(_key)
+		if _idx is not None:
+			return 'post', _idx
+		_att = self.attach_by_key.get(_key)
+		if _att is not None:
+			return 'attachment', _att
+		_row = self.item_by_key.get(_key)
+		if _row is not None:
+			return 'item', _row
+
+		if _parts.query:
+			_query = urllib.parse.parse_qs(_parts.query)
+			for k in ID_QUERY_KEYS:
+				if k in _query:
+					try:
+						_id = int(_query[k][0])
+					except ValueError:
+						return 'broken post', None
+					if _id in self.post_by_id:
+						return 'post', self.post_by_id[_id]
+					if _id in self.attach_ids:
+						return 'attachment', _id
+					if _id in self.item_by_id:
+						return 'item', self.item_by_id[_id]
+					return 'broken post', None
+
+		if '/wp-content/uploads/' in _parts.path:
+			_att = self.attach_by_key.get(IMAGE_SIZE_RE.sub('', _key))
+			if _att is not None:
+				return 'attachment', _att
+			return 'broken media', None
+
+		_slug = _path.rsplit('/', 1)[-1]
+		if _slug in self.post_by_name:
+			return 'post', self.post_by_name[_slug]
+		if _slug in self.item_by_name:
+			return 'item', self.item_by_name[_slug]
+
+		if not _path or is_archive_url(_path, _parts.query):
+			return 'other', None
+		return 'broken post', None
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def out_links(self, i:int) -> array:
+		return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def orphan_list(self) -> list:
+		"""
+		return published posts no other post links to.
+		"""
+		return [p for i, p in enumerate(self.post_list)\
+			if self.inbound[i] == 0 and p.status == 'publish']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def most_linked(self, n:int=None) -> list:
+		"""
+		return (inbound count, post) for the most linked posts.
+		"""
+		if n is None:
+			n = WP_Link_Graph.top_n
+		_idx = sorted((i for i in range(len(self.post_list)) if self.inbound[i]),\
+			key=lambda i: self.inbound[i], reverse=True)[:n]
+		return [(self.inbound[i], self.post_list[i]) for i in _idx]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self) -> list:
+		_orphans = self.orphan_list()
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Link Summary: {len(self.post_list)} posts, ' + \
+			f'{self.link_cnt} links: {len(self.targets)} post-to-post, ' + \
+			f'{self.attach_link_cnt} to attachments, {self.item_link_cnt} to pages/other types, ' + \
+			f'{self.external_cnt} external, {self.other_cnt} archive/feed/other, ' + \
+			f'{len(self.broken_list)} broken. {len(_orphans)} orphan published posts. {LF}')
+
+		msg_list.append(f'{LF} Most linked posts: ')
+		for n, p in self.most_linked():
+			msg_list.append(f'{LF}  {n:6d}  {p.post_id}  {p.title}')
+
+		msg_list.append(f'{LF}{LF} Broken internal links: ')
+		for i, url, kind in self.broken_list:
+			p = self.post_list[i]
+			msg_list.append(f'{LF}  {p.post_id}  {kind}: {url}')
+
+		msg_list.append(f'{LF}{LF} Orphan posts: ')
+		for p in _orphans:
+			msg_list.append(f'{LF}  {p.post_id}  {p.title}')
+
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self) -> list:
+		xlsx_list = [['kind','post id','title','url or count']]
+		for n, p in self.most_linked(len(self.post_list)):
+			xlsx_list.append(['inbound links', p.post_id, p.title, n])
+		for i, url, kind in self.broken_list:
+			p = self.post_list[i]
+			xlsx_list.append([kind, p.post_id, p.title, url])
+		for p in self.orphan_list():
+			xlsx_list.append(['orphan', p.post_id, p.title, ''])
+		return xlsx_list
@@ -0,0 +1,449 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_media_verify checks a local media backup against
+the attachments of Wordpress export files.
+
+The backup directory (the equivalent of wp-content/uploads) is
+indexed once by relative upload path and size, and optionally by
+content hash.  The walk and the hashing run in a thread pool.
+A hash cache keyed by path, size and mtime lets a later run
+rehash only changed files.  Every attachment_url and post
+thumbnail in the exports is then looked up in the index.  Urls
+are mapped to upload paths by their wp-content/uploads or /files/
+part, or for WordPress.com (*.files.wordpress.com) and other
+bare /YYYY/MM/ urls by the whole path.
+
+Reported:
+ missing - referenced by an export but not in the backup.
+ size mismatch - in the backup, but not the size recorded in the
+  attachment's metadata (filesize, written by WordPress 6.0+).
+ unmapped - attachment urls that cannot be mapped to an upload
+  path, so cannot be checked.
+ orphaned - in the backup but not referenced (resized -WxH
+  copies of referenced images are not counted).
+ duplicate - the same content (hash, or name and size without
+  --hash) stored at more than one path.
+
+Usage:
+ python wp_media_verify.py --media /backup/uploads [--hash] [--workers 16]
+	[--cache media.cache.json] [--xlsx media.xlsx] [exports or dirs]
+
+Required modules:
+ wp_xml_export_extract - export parsing.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import concurrent.futures
+import json
+import os
+import pathlib
+import re
+import sys
+import urllib.parse
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import get_file_hash
+from sparkwarden_file_lib import list_to_xlsx
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+UPLOAD_MARKERS = ('/wp-content/uploads/', '/files/')
+UPLOAD_HOST_SUFFIX = '.files.wordpress.com'
+DATE_PATH_RE = re.compile(r'/\d{4}/\d{2}/')
+IMAGE_SIZE_RE = re.compile(r'-\d+x\d+(?=\.\w+$)')
+# top level filesize of a serialized _wp_attachment_metadata.
+FILESIZE_RE = re.compile(r's:8:"filesize";i:(\d+);')
+HASH_CHUNK = 1 << 20
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def upload_rel_path(url:str) -> str:
+	"""
+	return the path of a media url relative to the uploads
+	directory, e.g. '2024/01/photo.jpg', or '' if not a media url.
+	"""
+	_parts = urllib.parse.urlsplit(str(url))
+	_path = urllib.parse.unquote(_parts.path)
+	for marker in UPLOAD_MARKERS:
+		_pos = _path.find(marker)
+		if _pos >= 0:
+			return _path[_pos + len(marker):]
+	if _parts.netloc.lower().endswith(UPLOAD_HOST_SUFFIX) or DATE_PATH_RE.match(_path):
+		return _path.lstrip('/')
+	return ''
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def attachment_filesize(meta_value) -> int:
+	"""
+	return the file size in a serialized _wp_attachment_metadata
+	value, or 0 if it has none.
+	"""
+	if not isinstance(meta_value, str):
+		return 0
+	# the sizes array holds a filesize for each resized copy.
+	_pos = meta_value.find('s:5:"sizes"')
+	m = FILESIZE_RE.search(meta_value, 0, _pos if _pos >= 0 else len(meta_value))
+	return int(m.group(1)) if m else 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Media_Index:
+	"""
+	Index of a media backup directory: relative path -> (size,
+	mtime, hash).  Built with a parallel directory walk and
+	parallel hashing.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, media_dir:str, workers:int=8):
+		self.media_dir = str(media_dir)
+		self.workers = workers
+		self.file_dict = {}			# rel path: [size, mtime, hash or '']
+		self.hashed_cnt = 0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def scan_dir(path:str):
+		"""
+		return (files as (path, size, mtime), subdirectories) of one directory.
+		"""
+		file_list = []
+		dir_list = []
+		try:
+			with os.scandir(path) as it:
+				for entry in it:
+					if entry.is_dir(follow_symlinks=False):
+						dir_list.append(entry.path)
+					elif entry.is_file(follow_symlinks=False):
+						_stat = entry.stat(follow_symlinks=False)
+						file_list.append((entry.path, _stat.st_size, _stat.st_mtime))
+		except OSError as ex:
+			print(f'skipped {path}: {ex}', file=sys.stderr)
+		return file_list, dir_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def walk(self, pool):
+		"""
+		index every file under media_dir, one directory per task.
+		"""
+		_root = self.media_dir
+		_root_len = len(_root.rstrip(os.sep)) + 1
+		pending = {pool.submit(WP_Media_Index.scan_dir, _root)}
+		while pending:
+			done, pending = concurrent.futures.wait(pending,\
+				return_when=concurrent.futures.FIRST_COMPLETED)
+			for fut in done:
+				file_list, dir_list = fut.result()
+				for d in dir_list:
+					pending.add(pool.submit(WP_Media_Index.scan_dir, d))
+				for path, size, mtime in file_list:
+					_rel = path[_root_len:].replace(os.sep, '/')
+					self.file_dict[_rel] = [size, mtime, '']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def hash_files(self, pool, cache:dict=None):
+		"""
+		set content hash of each file, reusing [cache] entries
+		whose size and mtime still match.
+		"""
+		todo = []
+		for rel, rec in self.file_dict.items():
+			_cached = cache.get(rel) if cache else None
+			if _cached and _cached[0] == rec[0] and _cached[1] == rec[1] and _cached[2]:
+				rec[2] = _cached[2]
+			else:
+				todo.append(rel)
+
+		_root = self.media_dir
+		def _hash(rel):
+			return rel, get_file_hash(os.path.join(_root, rel), HASH_CHUNK)
+
+		for rel, digest in pool.map(_hash, todo, chunksize=16):
+			self.file_dict[rel][2] = digest
+		self.hashed_cnt = len(todo)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def build(self, with_hash=False, cache_path=None):
+		cache = None
+		if with_hash and cache_path and pathlib.Path(cache_path).is_file():
+			with open(cache_path, 'r', encoding='utf-8') as fd:
+				cache = json.load(fd)
+
+		with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as pool:
+			self.walk(pool)
+			if with_hash:
+				self.hash_files(pool, cache)
+
+		if with_hash and cache_path:
+			with open(cache_path, 'w', encoding='utf-8') as fd:
+				json.dump(self.file_dict, fd)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def duplicate_groups(self) -> list:
+		"""
+		return lists of paths holding the same content: by hash
+		if files were hashed, else by file name and size.
+		"""
+		groups = {}
+		for rel, (size, _, digest) in self.file_dict.items():
+			_key = digest if digest else (rel.rsplit('/', 1)[-1], size)
+			groups.setdefault(_key, []).append(rel)
+		return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Media_Check:
+	"""
+	Attachment and thumbnail references collected from exports,
+	checked against a WP_Media_Index.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self):
+		self.ref_dict = {}				# rel path: [(xml path, post_id, kind)]
+		self.size_dict = {}				# rel path: size from attachment metadata
+		self.unmapped_list = []			# (xml path, post_id, kind, url)
+		self.attach_url_by_id = {}		# (xml path, attachment id): url
+		self.thumb_list = []			# (xml path, post_id, thumbnail_id)
+		self.missing_thumb_list = []	# thumbnail ids with no attachment item
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_export(self, xml_path):
+		"""
+		collect attachment urls and thumbnail ids of one export
+		without building WP_Export instances.
+		"""
+		import wp_xml_export_extract as wpx
+
+		_path = str(xml_path)
+		_thumbs = []
+
+		def _add_item(item_no, item):
+			_post_type = item.get('wp:post_type')
+			_post_id = int(item.get('wp:post_id', 0) or 0)
+			_size = 0
+			for meta in item.get('wp:postmeta', []):
+				_key = meta.get('wp:meta_key')
+				if _key == '_thumbnail_id':
+					try:
+						_thumbs.append((_path, _post_id, int(meta.get('wp:meta_value'))))
+					except (TypeError, ValueError):
+						pass
+				elif _key == '_wp_attachment_metadata':
+					_size = attachment_filesize(meta.get('wp:meta_value'))
+			if _post_type == 'attachment':
+				_url = item.get('wp:attachment_url')
+				if _url:
+					self.attach_url_by_id[(_path, _post_id)] = _url
+					self.add_ref(_url, _path, _post_id, 'attachment', _size)
+
+		wpx.parse_xml_items(_path, _add_item)
+
+		for xml, post_id, thumb_id in _thumbs:
+			_url = self.attach_url_by_id.get((xml, thumb_id))
+			if _url is None:
+				self.missing_thumb_list.append((xml, post_id, thumb_id))
+			else:
+				self.add_ref(_url, xml, post_id, 'thumbnail')
+		self.thumb_list += _thumbs
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_ref(self, url, xml_path, post_id, kind, size:int=0):
+		"""
+		note a media reference; [size] is the expected file size, 0 if unknown.
+		"""
+		_rel = upload_rel_path(url)
+		if not _rel:
+			self.unmapped_list.append((xml_path, post_id, kind, str(url)))
+			return
+		self.ref_dict.setdefault(_rel, []).append((xml_path, post_id, kind))
+		if size:
+			self.size_dict.setdefault(_rel, size)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def check(self, media_index:WP_Media_Index) -> dict:
+		"""
+		return dict of 'missing', 'size_mismatch' (rel, expected,
+		actual size), 'orphaned', 'duplicate' lists.
+		"""
+		_files = media_index.file_dict
+		missing = [(rel, refs) for rel, refs in sorted(self.ref_dict.items()) if rel not in _files]
+		size_mismatch = [(rel, size, _files[rel][0]) for rel, size in sorted(self.size_dict.items())\
+			if rel in _files and _files[rel][0] != size]
+		orphaned = [rel for rel in sorted(_files)\
+			if rel not in self.ref_dict and IMAGE_SIZE_RE.sub('', rel) not in self.ref_dict]
+		return {
+			'missing': missing,
+			'size_mismatch': size_mismatch,
+			'orphaned': orphaned,
+			'duplicate': media_index.duplicate_groups(),
+			}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self, media_index, result:dict) -> list:
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Media check: {len(media_index.file_dict)} backup files ' + \
+			f'({media_index.hashed_cnt} hashed), {len(self.ref_dict)} referenced media, ' + \
+			f'{len(result["missing"])} missing, {len(result["size_mismatch"])} size mismatches, ' + \
+			f'{len(result["orphaned"])} orphaned, {len(result["duplicate"])} duplicate groups, ' + \
+			f'{len(self.unmapped_list)} unmapped urls, ' + \
+			f'{len(self.missing_thumb_list)} thumbnails without attachment item. {LF}')
+
+		msg_list.append(f'{LF} Missing: ')
+		for rel, refs in result['missing']:
+			_refs = ', '.join(f'{kind} {post_id}' for _, post_id, kind in refs)
+			msg_list.append(f'{LF}  {rel}  ({_refs})')
+
+		msg_list.append(f'{LF}{LF} Size mismatches (expected / backup bytes): ')
+		for rel, size, actual in result['size_mismatch']:
+			msg_list.append(f'{LF}  {size:10d} {actual:10d}  {rel}')
+
+		msg_list.append(f'{LF}{LF} Unmapped urls (not checked): ')
+		for xml, post_id, kind, url in self.unmapped_list:
+			msg_list.append(f'{LF}  {kind} {post_id}  {url}  [{xml}]')
+
+		msg_list.append(f'{LF}{LF} Thumbnails without attachment item: ')
+		for xml, post_id, thumb_id in self.missing_thumb_list:
+			msg_list.append(f'{LF}  post {post_id} thumbnail {thumb_id}  [{xml}]')
+
+		msg_list.append(f'{LF}{LF} Orphaned: ')
+		for rel in result['orphaned']:
+			msg_list.append(f'{LF}  {rel}')
+
+		msg_list.append(f'{LF}{LF} Duplicates: ')
+		for g in result['duplicate']:
+			msg_list.append(f'{LF}  {" = ".join(g)}')
+
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self, result:dict) -> list:
+		xlsx_list = [['status','media path','post id','reference','xml path']]
+		for rel, refs in result['missing']:
+			for xml, post_id, kind in refs:
+				xlsx_list.append(['missing', rel, post_id, kind, xml])
+		for rel, size, actual in result['size_mismatch']:
+			xlsx_list.append(['size mismatch', rel, '', f'expected {size}, backup {actual}', ''])
+		for xml, post_id, kind, url in self.unmapped_list:
+			xlsx_list.append(['unmapped url', url, post_id, kind, xml])
+		for xml, post_id, thumb_id in self.missing_thumb_list:
+			xlsx_list.append(['missing attachment item', str(thumb_id), post_id, 'thumbnail', xml])
+		for rel in result['orphaned']:
+			xlsx_list.append(['orphaned', rel, '', '', ''])
+		for n, g in enumerate(result['duplicate'], start=1):
+			for rel in g:
+				xlsx_list.append(['duplicate', rel, '', f'group {n}', ''])
+		return xlsx_list
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_media_verify', description='verify a media backup against Wordpress exports.')
+	ap.add_argument('paths', nargs='*', help='export xml files or directories (default: cwd)')
+	ap.add_argument('--media', required=True, help='media backup directory (uploads root)')
+	ap.add_argument('--hash', action='store_true', help='hash file contents to find duplicates')
+	ap.add_argument('--workers', type=int, default=min(32, (os.cpu_count() or 1) * 4))
+	ap.add_argument('--cache', default=None, help='hash cache json, reused when size/mtime match')
+	ap.add_argument('--xlsx', default=None, help='write results to this excel file')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+
+	xml_file_list = []
+	for p in args.paths or [str(pathlib.Path().cwd())]:
+		if pathlib.Path(p).is_dir():
+			xml_file_list += build_stream_file_list(p, '*.xml')
+		else:
+			xml_file_list.append(p)
+
+	media_index = WP_Media_Index(args.media, workers=args.workers)
+	media_index.build(with_hash=args.hash, cache_path=args.cache)
+
+	media_check = WP_Media_Check()
+	for path in xml_file_list:
+		media_check.add_export(path)
+
+	result = media_check.check(media_index)
+	print(''.join(media_check.report_msgs(media_index, result)))
+
+	if args.xlsx:
+		list_to_xlsx(media_check.xlsx_rows(result), args.xlsx)
+
+	return 1 if result['missing'] or result['size_mismatch'] or media_check.unmapped_list else 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
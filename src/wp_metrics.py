@@ -0,0 +1,278 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_metrics measures post length for editorial
+reporting: word, character and image counts, estimated reading
+time, and per-month length distributions.
+
+WP_Content_Stats holds the counts of one post, taken once when
+the post is read (only with --metrics).  WP_Content_Metrics
+gathers the counts and publish months of a site's posts, one
+post at a time, into compact int array columns; totals,
+percentiles and histograms are then taken from one sorted copy
+of each month's values, with bisect for the histogram bins.  This
+is plain Python over stdlib arrays (numpy is not a dependency),
+not array arithmetic.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import bisect
+import itertools
+from array import array
+
+from sparkwarden_file_lib import LF
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+WORDS_PER_MINUTE = 230
+WORD_BINS = (0, 250, 500, 1000, 2000, 5000)
+PERCENTILES = (50, 90)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def reading_minutes(words:int) -> float:
+	"""
+	return estimated reading time in minutes.
+	"""
+	return round(words / WORDS_PER_MINUTE, 1)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def percentile(sorted_vals, q:int) -> int:
+	"""
+	return nearest-rank [q]th percentile of ascending [sorted_vals].
+	"""
+	if not sorted_vals:
+		return 0
+	_rank = max(1, -(-q * len(sorted_vals) // 100))
+	return sorted_vals[_rank - 1]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def histogram(sorted_vals, edges=WORD_BINS) -> list:
+	"""
+	return counts of ascending [sorted_vals] in bins starting at
+	each of [edges], the last bin open-ended.
+	"""
+	_pos = [bisect.bisect_left(sorted_vals, e) for e in edges] + [len(sorted_vals)]
+	return [_pos[i + 1] - _pos[i] for i in range(len(edges))]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Content_Stats:
+	"""
+	Word, character and image counts of one post body.
+	"""
+
+	__slots__ = ('words', 'chars', 'images')
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, content, clean_text:str):
+		"""
+		[content] is the raw body, [clean_text] the body with
+		tags removed (WP_Export.wp_clean_text_tags).
+		"""
+		_words = clean_text.split() if isinstance(content, str) else []
+		self.words = len(_words)
+		self.chars = sum(map(len, _words))
+		self.images = content.lower().count('<img') if isinstance(content, str) else 0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@property
+	def reading_minutes(self) -> float:
+		return reading_minutes(self.words)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def as_xlsx_row(self) -> list:
+		return [self.words, self.chars, self.images, self.reading_minutes]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def as_xlsx_hdr() -> list:
+		return ['#words','#chars','#content images','reading min']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __repr__(self) -> str:
+		return f'{self.words} words, {self.chars} chars, {self.images} images, ' + \
+			f'{self.reading_minutes} min'
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Content_Metrics:
+	"""
+	Site-level length metrics over columns of post counts.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, post_list=()):
+		self.months = array('I')
+		self.words = array('I')
+		self.chars = array('I')
+		self.images = array('I')
+
+		for p in post_list:
+			self.add(p)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add(self, p):
+		_cs = p.content_stats
+		_month = p.sort_key[:6]
+		self.months.append(int(_month) if _month else 0)
+		self.words.append(_cs.words)
+		self.chars.append(_cs.chars)
+		self.images.append(_cs.images)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return len(self.words)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def summary(words, chars, images) -> dict:
+		"""
+		return totals, mean and percentiles for one slice of the columns.
+		"""
+		_n = len(words)
+		_sorted = sorted(words)
+		d = {}
+		d['posts'] = _n
+		d['words'] = sum(words)
+		d['chars'] = sum(chars)
+		d['images'] = sum(images)
+		d['mean_words'] = round(d['words'] / _n) if _n else 0
+		for q in PERCENTILES:
+			d[f'p{q}_words'] = percentile(_sorted, q)
+		d['max_words'] = _sorted[-1] if _sorted else 0
+		d['mean_minutes'] = reading_minutes(d['words'] / _n) if _n else 0.0
+		d['histogram'] = histogram(_sorted)
+		return d
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def by_month(self) -> list:
+		"""
+		return (YYYYMM, summary dict) per month, oldest first.
+		"""
+		_months = self.months
+		_order = sorted(range(len(_months)), key=_months.__getitem__)
+		ret_list = []
+		for _month, _idx in itertools.groupby(_order, key=_months.__getitem__):
+			_idx = list(_idx)
+			ret_list.append((_month, WP_Content_Metrics.summary(\
+				[self.words[i] for i in _idx],\
+				[self.chars[i] for i in _idx],\
+				[self.images[i] for i in _idx])))
+		return ret_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def bin_labels() -> list:
+		_labels = [f'{lo}-{hi - 1}' for lo, hi in zip(WORD_BINS, WORD_BINS[1:])]
+		return _labels + [f'{WORD_BINS[-1]}+']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def month_str(month:int) -> str:
+		if not month:
+			return 'undated'
+		return f'{month // 100}-{month % 100:02d}'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self) -> list:
+		_all = WP_Content_Metrics.summary(self.words, self.chars, self.images)
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Content Metrics: {_all["posts"]} published posts, ' + \
+			f'{_all["words"]} words, {_all["images"]} images. Words per post: mean ' + \
+			f'{_all["mean_words"]}, median {_all["p50_words"]}, p90 {_all["p90_words"]}, ' + \
+			f'max {_all["max_words"]}; mean reading time {_all["mean_minutes"]} min ' + \
+			f'({WORDS_PER_MINUTE} words/min). {LF}')
+
+		msg_list.append(f'{LF} Words per post (posts): ')
+		for _label, n in zip(WP_Content_Metrics.bin_labels(), _all['histogram']):
+			msg_list.append(f'{LF}  {_label:>10}  {n:8d}')
+
+		msg_list.append(f'{LF}{LF} By month: {"posts":>8} {"words":>10} {"median":>8} ' + \
+			f'{"p90":>8} {"read min":>9} {"images":>8}')
+		for _month, d in self.by_month():
+			msg_list.append(f'{LF}  {WP_Content_Metrics.month_str(_month):>7}   ' + \
+				f'{d["posts"]:8d} {d["words"]:10d} {d["p50_words"]:8d} {d["p90_words"]:8d} ' + \
+				f'{d["mean_minutes"]:9.1f} {d["images"]:8d}')
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self) -> list:
+		xlsx_list = [['month','posts','words','chars','images','mean words',\
+			'median words','p90 words','max words','mean reading min'] + \
+			[f'words {_label}' for _label in WP_Content_Metrics.bin_labels()]]
+		_rows = self.by_month()
+		_rows.append((None, WP_Content_Metrics.summary(self.words, self.chars, self.images)))
+		for _month, d in _rows:
+			_label = 'all' if _month is None else WP_Content_Metrics.month_str(_month)
+			xlsx_list.append([_label, d['posts'], d['words'], d['chars'], d['images'],\
+				d['mean_words'], d['p50_words'], d['p90_words'], d['max_words'],\
+				d['mean_minutes']] + d['histogram'])
+		return xlsx_list
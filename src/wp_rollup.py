@@ -0,0 +1,382 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_rollup summarizes many Wordpress export files
+(sites) in one report block and excel file.
+
+Each processed export yields a WP_Rollup: item counts by post
+type and status, the publish date span, attachment totals, the
+site's category and tag counts, and processing time, plus one
+summary row for the site.  Rollups hold counts only, never post
+records, and merge by adding counters, so the summary of
+hundreds of sites is built a file at a time, in any order.
+Term counters are kept whole through merges and only cut to
+the top terms when reported.
+Rollups are also saved as json, so runs done in parallel
+(separate processes, watch workers or machines) can be merged
+afterwards.
+
+Usage:
+ python wp_rollup.py run1_rollup.json run2_rollup.json [--xlsx summary.xlsx]
+
+Required modules:
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import json
+import sys
+from collections import Counter
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import sheets_to_xlsx
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def top_counts(cnt:Counter, n:int=None) -> list:
+	"""
+	return [n] (key, count) pairs of [cnt], highest count first,
+	ties by key, so merge order does not change the result.
+	"""
+	return sorted(cnt.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def date_str(sort_key:str) -> str:
+	"""
+	return YYYY-MM-DD of a WP_Export sort key, '' if undated.
+	"""
+	if not sort_key:
+		return ''
+	return f'{sort_key[:4]}-{sort_key[4:6]}-{sort_key[6:8]}'
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Rollup:
+	"""
+	Mergeable counts for one or more exports.
+	"""
+
+	version = 2
+	top_terms = 500			# terms per kind in the terms sheet
+	top_n = 20				# terms and sites listed in the report
+
+	site_hdr = ['path','items','published posts','attachments','unattached',\
+		'first published','last published','top category','top tag','seconds']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self):
+		self.sites = []						# one site_hdr row per export
+		self.item_cnt = 0
+		self.type_status_cnt = Counter()	# (post type, status): items
+		self.first = ''						# sort keys of the publish date span
+		self.last = ''
+		self.attach_cnt = 0
+		self.unattached_cnt = 0
+		self.cat_cnt = Counter()			# slug: posts
+		self.tag_cnt = Counter()
+		self.cat_site_cnt = Counter()		# slug: sites
+		self.tag_site_cnt = Counter()
+		self.seconds = 0.0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@classmethod
+	def for_export(cls, path, item_cnt:int=0, type_status_cnt=None, sort_keys=(),\
+		attach_cnt:int=0, unattached_cnt:int=0, cat_cnt=None, tag_cnt=None):
+		"""
+		return the rollup of one export: [sort_keys] of its
+		published posts, [cat_cnt] / [tag_cnt] as {slug: posts}.
+		"""
+		rollup = cls()
+		rollup.item_cnt = item_cnt
+		rollup.type_status_cnt.update(type_status_cnt or {})
+		_keys = [k for k in sort_keys if k]
+		if _keys:
+			rollup.first, rollup.last = min(_keys), max(_keys)
+		rollup.attach_cnt = attach_cnt
+		rollup.unattached_cnt = unattached_cnt
+		rollup.cat_cnt.update(cat_cnt or {})
+		rollup.tag_cnt.update(tag_cnt or {})
+		rollup.cat_site_cnt.update(rollup.cat_cnt.keys())
+		rollup.tag_site_cnt.update(rollup.tag_cnt.keys())
+
+		_top_cat = top_counts(rollup.cat_cnt, 1)
+		_top_tag = top_counts(rollup.tag_cnt, 1)
+		rollup.sites.append([str(path), item_cnt, rollup.published_cnt(), attach_cnt, unattached_cnt,\
+			date_str(rollup.first), date_str(rollup.last),\
+			_top_cat[0][0] if _top_cat else '', _top_tag[0][0] if _top_tag else '', 0.0])
+		return rollup
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def set_seconds(self, seconds:float):
+		"""
+		set the processing time of a one-export rollup.
+		"""
+		self.seconds = round(seconds, 3)
+		if len(self.sites) == 1:
+			self.sites[0][-1] = self.seconds
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def merge(self, other):
+		"""
+		add [other]'s counts to this rollup, return self.
+		"""
+		self.sites += [list(row) for row in other.sites]
+		self.item_cnt += other.item_cnt
+		self.type_status_cnt.update(other.type_status_cnt)
+		if other.first and (not self.first or other.first < self.first):
+			self.first = other.first
+		if other.last > self.last:
+			self.last = other.last
+		self.attach_cnt += other.attach_cnt
+		self.unattached_cnt += other.unattached_cnt
+		self.cat_cnt.update(other.cat_cnt)
+		self.tag_cnt.update(other.tag_cnt)
+		self.cat_site_cnt.update(other.cat_site_cnt)
+		self.tag_site_cnt.update(other.tag_site_cnt)
+		self.seconds = round(self.seconds + other.seconds, 3)
+		return self
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@classmethod
+	def merged(cls, rollup_iter):
+		"""
+		return one rollup of all of [rollup_iter].
+		"""
+		total = cls()
+		for rollup in rollup_iter:
+			total.merge(rollup)
+		return total
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return len(self.sites)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def published_cnt(self) -> int:
+		"""
+		return the number of published posts (post type 'post').
+		"""
+		return self.type_status_cnt[('post', 'publish')]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def to_dict(self) -> dict:
+		d = {}
+		d['version'] = WP_Rollup.version
+		d['sites'] = self.sites
+		d['item_cnt'] = self.item_cnt
+		d['type_status'] = [[t, s, n] for (t, s), n in self.type_status_cnt.items()]
+		d['first'] = self.first
+		d['last'] = self.last
+		d['attach_cnt'] = self.attach_cnt
+		d['unattached_cnt'] = self.unattached_cnt
+		d['categories'] = {k: [n, self.cat_site_cnt[k]] for k, n in self.cat_cnt.items()}
+		d['tags'] = {k: [n, self.tag_site_cnt[k]] for k, n in self.tag_cnt.items()}
+		d['seconds'] = self.seconds
+		return d
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@classmethod
+	def from_dict(cls, d:dict):
+		if d.get('version') != WP_Rollup.version:
+			raise ValueError(f'unsupported rollup version: {d.get("version")}')
+		rollup = cls()
+		rollup.sites = [list(row) for row in d['sites']]
+		rollup.item_cnt = d['item_cnt']
+		rollup.type_status_cnt = Counter({(t, s): n for t, s, n in d['type_status']})
+		rollup.first = d['first']
+		rollup.last = d['last']
+		rollup.attach_cnt = d['attach_cnt']
+		rollup.unattached_cnt = d['unattached_cnt']
+		for k, (n, sites) in d['categories'].items():
+			rollup.cat_cnt[k] = n
+			rollup.cat_site_cnt[k] = sites
+		for k, (n, sites) in d['tags'].items():
+			rollup.tag_cnt[k] = n
+			rollup.tag_site_cnt[k] = sites
+		rollup.seconds = d['seconds']
+		return rollup
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def write_json(self, json_path):
+		with open(json_path, 'w', encoding='utf-8') as fd:
+			json.dump(self.to_dict(), fd)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@classmethod
+	def read_json(cls, json_path):
+		with open(json_path, encoding='utf-8') as fd:
+			return cls.from_dict(json.load(fd))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def site_msg(self) -> str:
+		"""
+		return the one-line rollup of a one-export rollup.
+		"""
+		return f'{LF}{LF} Rollup: {self.item_cnt} items, {self.published_cnt()} published posts, ' + \
+			f'{self.attach_cnt} attachments ({self.unattached_cnt} unattached), published ' + \
+			f'{date_str(self.first) or "-"} to {date_str(self.last) or "-"}, {self.seconds:.2f} s.'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self) -> list:
+		"""
+		return the cross-site summary report messages.
+		"""
+		_top = WP_Rollup.top_n
+		_site_cnt = len(self.sites)
+		msg_list = []
+
+		msg_list.append(f'{LF}{LF} Cross-site Summary: {_site_cnt} exports, {self.item_cnt} items, ' + \
+			f'{self.published_cnt()} published posts, {self.attach_cnt} attachments ' + \
+			f'({self.unattached_cnt} unattached), published {date_str(self.first) or "-"} to ' + \
+			f'{date_str(self.last) or "-"}, {self.seconds:.2f} s processing ' + \
+			f'({self.seconds / _site_cnt if _site_cnt else 0.0:.2f} s per export). {LF}')
+
+		msg_list.append(f'{LF} Items by post type and status: ')
+		for (_type, _status), n in sorted(self.type_status_cnt.items(), key=lambda kv: (-kv[1], kv[0])):
+			msg_list.append(f'{LF}  {n:8d}  {_type:<20} {_status}')
+
+		msg_list.append(f'{LF}{LF} Top categories (posts, exports): ')
+		for k, n in top_counts(self.cat_cnt, _top):
+			msg_list.append(f'{LF}  {n:8d} {self.cat_site_cnt[k]:5d}  {k}')
+
+		msg_list.append(f'{LF}{LF} Top tags (posts, exports): ')
+		for k, n in top_counts(self.tag_cnt, _top):
+			msg_list.append(f'{LF}  {n:8d} {self.tag_site_cnt[k]:5d}  {k}')
+
+		msg_list.append(f'{LF}{LF} Largest exports (items, published posts, seconds): ')
+		for row in sorted(self.sites, key=lambda row: (-row[1], row[0]))[:_top]:
+			msg_list.append(f'{LF}  {row[1]:8d} {row[2]:8d} {row[-1]:8.2f}  {row[0]}')
+
+		msg_list.append(f'{LF}{LF} Slowest exports (seconds, items): ')
+		for row in sorted(self.sites, key=lambda row: (-row[-1], row[0]))[:_top]:
+			msg_list.append(f'{LF}  {row[-1]:8.2f} {row[1]:8d}  {row[0]}')
+
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def sheet_list(self) -> list:
+		"""
+		return [(sheet name, rows)] for sheets_to_xlsx: one row
+		per export, items by type and status, and terms.
+		"""
+		_site_rows = [WP_Rollup.site_hdr] + sorted(self.sites)
+		_site_rows.append(['all', self.item_cnt, self.published_cnt(), self.attach_cnt,\
+			self.unattached_cnt, date_str(self.first), date_str(self.last),\
+			top_counts(self.cat_cnt, 1)[0][0] if self.cat_cnt else '',\
+			top_counts(self.tag_cnt, 1)[0][0] if self.tag_cnt else '', self.seconds])
+
+		_type_rows = [['post type','status','items']]
+		for (_type, _status), n in sorted(self.type_status_cnt.items()):
+			_type_rows.append([_type, _status, n])
+
+		_term_rows = [['term type','term','posts','exports']]
+		for _kind, _cnt, _site_cnt in (('category', self.cat_cnt, self.cat_site_cnt),\
+			('tag', self.tag_cnt, self.tag_site_cnt)):
+			for k, n in top_counts(_cnt, WP_Rollup.top_terms):
+				_term_rows.append([_kind, k, n, _site_cnt[k]])
+
+		return [('sites', _site_rows), ('types', _type_rows), ('terms', _term_rows)]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def write_xlsx(self, xls_path):
+		sheets_to_xlsx(self.sheet_list(), xls_path)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_rollup', description='merge export rollups into one cross-site summary.')
+	ap.add_argument('paths', nargs='+', help='rollup json files (see wp_xml_export_extract)')
+	ap.add_argument('--xlsx', default=None, help='write the summary to this excel file')
+	ap.add_argument('--json', default=None, help='write the merged rollup to this json file')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+
+	total = WP_Rollup.merged(WP_Rollup.read_json(p) for p in args.paths)
+	print(''.join(total.report_msgs()))
+
+	if args.xlsx:
+		total.write_xlsx(args.xlsx)
+	if args.json:
+		total.write_json(args.json)
+
+	return 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
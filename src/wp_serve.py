@@ -0,0 +1,615 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_serve answers read-only queries about the posts
+of extracted Wordpress exports over a small localhost HTTP/JSON
+service: a post by post_id, the attachments of a post, and posts
+by category/tag and publish date range.
+
+Each export is read once into compact records (WP_Export_Index)
+with a post_id hash, a term to post list index and publish-time
+keys in ascending order, so a lookup is a dict access or two
+bisects rather than a scan.  Encoded responses are kept in an
+LRU cache (WP_LRU_Cache).  A background thread restats the
+exports; one whose file or excel output changed (reprocessed by
+wp_xml_export_extract, e.g. in --watch mode) is reloaded and
+swapped in, and the cache is cleared.
+
+Routes (GET only):
+ /exports                        loaded exports
+ /posts/<post_id>                the post(s) with that id
+ /posts/<post_id>/attachments    attachments of a post
+ /posts?term=&kind=&since=&until=&type=&status=&limit=&offset=
+                                 posts newest first
+ /stats                          cache and reload counters
+
+Usage:
+ python wp_serve.py [dir] --port 8765 --cache-size 256 --reload-seconds 5
+
+Required modules:
+ wp_xml_export_extract - export parsing.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import bisect
+import collections
+import heapq
+import http.server
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import urllib.parse
+from array import array
+
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import split_zip_path
+
+import wp_xml_export_extract as wpx
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+TERM_KINDS = ('category', 'tag')
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_LRU_Cache:
+	"""
+	Least recently used cache of up to [max_size] entries.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, max_size:int=256):
+		self.max_size = max_size
+		self.entries = collections.OrderedDict()
+		self.lock = threading.Lock()
+		self.hit_cnt = 0
+		self.miss_cnt = 0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def get(self, key):
+		with self.lock:
+			value = self.entries.get(key)
+			if value is None:
+				self.miss_cnt += 1
+				return None
+			self.entries.move_to_end(key)
+			self.hit_cnt += 1
+			return value
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def put(self, key, value):
+		if self.max_size <= 0:
+			return
+		with self.lock:
+			self.entries[key] = value
+			self.entries.move_to_end(key)
+			while len(self.entries) > self.max_size:
+				self.entries.popitem(last=False)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Export_Index:
+	"""
+	Query indexes over the records of one export.  Records are
+	plain dicts in ascending publish order; indexes hold their
+	positions.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, xml_path, sig:tuple=None):
+		self.xml_path = str(xml_path)
+		self.sig = sig
+		self.records = []
+		self.keys = array('Q')			# publish key (YYYYmmddHHMMSS) per record
+		self.by_postid = {}				# post_id: position
+		self.by_term = {}				# (kind, slug): array of positions
+		self.children = {}				# post_parent: list of positions
+		self.by_type_status = {}		# (post_type, status): array of positions
+		self.loaded = None
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def record(p) -> dict:
+		"""
+		return the JSON record of a WP_Export.
+		"""
+		_key = p.sort_key
+		_date = f'{_key[:4]}-{_key[4:6]}-{_key[6:8]} {_key[8:10]}:{_key[10:12]}:{_key[12:14]}' if _key else None
+		return {
+			'post_id': p.post_id,
+			'post_type': str(p.post_type),
+			'status': str(p.status),
+			'title': str(p.title),
+			'link': str(p.link),
+			'post_name': str(p.post_name),
+			'creator': str(p.creator),
+			'pub_date': _date,
+			'categories': p.categories,
+			'tags': p.tags,
+			'post_parent': p.post_parent,
+			'thumbnail_id': p.thumbnail_id,
+			'attachment_url': str(p.attachment_url) if p.post_type == 'attachment' else None,
+			'images': sorted(p.images),
+			'comments': p.comment_stats.comment_cnt,
+			}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def load(self):
+		"""
+		read the export and build the indexes.
+		"""
+		session = wpx.WP_Export_Session(self.xml_path)
+		session.load()
+		session.attach_images_to_parents()
+		_node_list = list(reversed(session.sorted_records()))
+
+		for pos, p in enumerate(_node_list):
+			self.records.append(WP_Export_Index.record(p))
+			self.keys.append(wpx.WP_Time_Index.node_key(p))
+			self.by_postid.setdefault(p.post_id, pos)
+			for _kind, _slug_list in (('category', p.categories), ('tag', p.tags)):
+				for _slug in _slug_list:
+					self.by_term.setdefault((_kind, _slug), array('I')).append(pos)
+			if p.post_parent:
+				self.children.setdefault(p.post_parent, []).append(pos)
+			_rec = self.records[-1]
+			self.by_type_status.setdefault((_rec['post_type'], _rec['status']), array('I')).append(pos)
+
+		session.close()
+		self.loaded = time.strftime('%Y-%m-%d %H:%M:%S')
+		return self
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def post(self, post_id:int):
+		pos = self.by_postid.get(post_id)
+		if pos is None:
+			return None
+		return self.records[pos]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def attachments(self, post_id:int) -> list:
+		"""
+		return attachments whose parent is [post_id], plus the
+		post's featured image.
+		"""
+		_pos_list = [pos for pos in self.children.get(post_id, ())\
+			if self.records[pos]['post_type'] == 'attachment']
+		p = self.post(post_id)
+		if p is not None and p['thumbnail_id']:
+			_thumb = self.by_postid.get(p['thumbnail_id'])
+			if _thumb is not None and _thumb not in _pos_list:
+				_pos_list.append(_thumb)
+		return [self.records[pos] for pos in _pos_list]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def positions(self, term:str=None, kind:str=None, lo_key:int=None, hi_key:int=None):
+		"""
+		return ascending record positions with [term] (of [kind],
+		or any kind) published from [lo_key] through [hi_key].
+		"""
+		lo = 0 if lo_key is None else bisect.bisect_left(self.keys, lo_key)
+		hi = len(self.keys) if hi_key is None else bisect.bisect_right(self.keys, hi_key)
+		if term is None:
+			return range(lo, hi)
+
+		_kinds = (kind,) if kind else TERM_KINDS
+		_lists = [self.by_term.get((k, term), ()) for k in _kinds]
+		_lists = [_l for _l in _lists if _l]
+		if len(_lists) == 1:
+			_pos = _lists[0]
+		else:
+			_pos = sorted(set().union(*_lists))
+		return _pos[bisect.bisect_left(_pos, lo):bisect.bisect_left(_pos, hi)]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def count(self, lo_key:int=None, hi_key:int=None, post_type=None, status=None) -> int:
+		"""
+		return the number of records of [post_type] and [status]
+		(None for any) published from [lo_key] through [hi_key],
+		by bisects of the per type and status position lists.
+		"""
+		_range = self.positions(None, None, lo_key, hi_key)
+		if post_type is None and status is None:
+			return len(_range)
+		cnt = 0
+		for (_type, _status), _pos in self.by_type_status.items():
+			if post_type is not None and _type != post_type:
+				continue
+			if status is not None and _status != status:
+				continue
+			cnt += bisect.bisect_left(_pos, _range.stop) - bisect.bisect_left(_pos, _range.start)
+		return cnt
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return len(self.records)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Query_Service:
+	"""
+	Indexes of the exports under [startdir], the queries over
+	them and the response cache.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, startdir:str, cache_size:int=256):
+		self.startdir = str(startdir)
+		self.index_dict = {}			# xml path: WP_Export_Index
+		self.lock = threading.Lock()
+		self.cache = WP_LRU_Cache(cache_size)
+		self.reload_cnt = 0
+		self.request_cnt = 0
+		self.count_lock = threading.Lock()		# request_cnt, bumped by handler threads
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def export_sig(xml_path) -> tuple:
+		"""
+		return (size, mtime_ns, excel output mtime_ns) of an export.
+		"""
+		_stat = os.stat(split_zip_path(xml_path)[0])
+		try:
+			_out_mtime = os.stat(wpx.export_output_path(xml_path, '.xlsx')).st_mtime_ns
+		except OSError:
+			_out_mtime = 0
+		return _stat.st_size, _stat.st_mtime_ns, _out_mtime
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def refresh(self) -> list:
+		"""
+		load exports that are new or changed, drop those removed,
+		return the paths loaded.  Indexes are built before they
+		are swapped in, so queries keep being answered meanwhile.
+		"""
+		_sig_dict = {}
+		for path in build_stream_file_list(self.startdir, '*.xml'):
+			try:
+				_sig_dict[path] = WP_Query_Service.export_sig(path)
+			except OSError:
+				continue
+
+		_new_dict = {}
+		for path, sig in _sig_dict.items():
+			_index = self.index_dict.get(path)
+			if _index is not None and _index.sig == sig:
+				continue
+			try:
+				_new_dict[path] = WP_Export_Index(path, sig).load()
+			except Exception as ex:
+				print(f'{path}: not loaded: {type(ex).__name__}: {ex}', file=sys.stderr)
+
+		_gone = [path for path in self.index_dict if path not in _sig_dict]
+		if _new_dict or _gone:
+			with self.lock:
+				for path in _gone:
+					del self.index_dict[path]
+				self.index_dict.update(_new_dict)
+				self.reload_cnt += len(_new_dict)
+			self.cache.clear()
+		return list(_new_dict)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def index_list(self) -> list:
+		with self.lock:
+			return list(self.index_dict.values())
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def exports(self) -> dict:
+		return {'exports': [{'export': ix.xml_path, 'records': len(ix), 'loaded': ix.loaded}\
+			for ix in self.index_list()]}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def post(self, post_id:int) -> dict:
+		_list = []
+		for ix in self.index_list():
+			p = ix.post(post_id)
+			if p is not None:
+				_list.append(dict(p, export=ix.xml_path))
+		return {'count': len(_list), 'posts': _list}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def attachments(self, post_id:int) -> dict:
+		_list = []
+		for ix in self.index_list():
+			if ix.post(post_id) is not None:
+				_list += [dict(a, export=ix.xml_path) for a in ix.attachments(post_id)]
+		return {'count': len(_list), 'attachments': _list}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def posts(self, term=None, kind=None, since=None, until=None, post_type=None,\
+		status=None, limit:int=100, offset:int=0) -> dict:
+		"""
+		return posts matching all given filters, newest first,
+		[limit] of them from [offset], with the total count.
+		Without a term the total comes from the per type and
+		status counts and only the returned page is merged.
+		"""
+		if kind is not None and kind not in TERM_KINDS:
+			raise ValueError(f'kind must be one of {", ".join(TERM_KINDS)}')
+		_lo = wpx.WP_Time_Index.date_key(since)
+		_hi = wpx.WP_Time_Index.date_key(until, end=True)
+
+		def _matches(ix):
+			_records = ix.records
+			_keys = ix.keys
+			for pos in reversed(ix.positions(term, kind, _lo, _hi)):
+				r = _records[pos]
+				if post_type is not None and r['post_type'] != post_type:
+					continue
+				if status is not None and r['status'] != status:
+					continue
+				yield _keys[pos], ix.xml_path, r
+
+		_index_list = self.index_list()
+		_merged = heapq.merge(*[_matches(ix) for ix in _index_list],\
+			key=lambda t: t[0], reverse=True)
+		_list = []
+		total = 0
+		for _key, _path, r in _merged:
+			if offset <= total < offset + limit:
+				_list.append(dict(r, export=_path))
+			total += 1
+			if term is None and total >= offset + limit:
+				break
+		if term is None:
+			total = sum(ix.count(_lo, _hi, post_type, status) for ix in _index_list)
+		return {'total': total, 'count': len(_list), 'offset': offset, 'posts': _list}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def stats(self) -> dict:
+		return {'exports': len(self.index_dict), 'records': sum(len(ix) for ix in self.index_list()),\
+			'requests': self.request_cnt, 'reloads': self.reload_cnt, 'cache_entries': len(self.cache),\
+			'cache_hits': self.cache.hit_cnt, 'cache_misses': self.cache.miss_cnt}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def answer(self, path:str, query:dict) -> dict:
+		"""
+		return the response dict for a route [path] and its
+		[query] parameters (name: value).  Raises LookupError for
+		an unknown route, ValueError for a bad parameter.
+		"""
+		_parts = [s for s in path.split('/') if s]
+		if _parts == ['exports']:
+			return self.exports()
+		if _parts == ['posts']:
+			return self.posts(term=query.get('term'), kind=query.get('kind'),\
+				since=query.get('since'), until=query.get('until'),\
+				post_type=query.get('type'), status=query.get('status'),\
+				limit=max(0, int(query.get('limit', 100))), offset=max(0, int(query.get('offset', 0))))
+		if len(_parts) == 2 and _parts[0] == 'posts':
+			return self.post(int(_parts[1]))
+		if len(_parts) == 3 and _parts[0] == 'posts' and _parts[2] == 'attachments':
+			return self.attachments(int(_parts[1]))
+		raise LookupError(path)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def respond(self, url:str) -> tuple:
+		"""
+		return (http status, JSON body bytes) for a request
+		[url], from the cache when the same query was answered
+		since the last reload.
+		"""
+		with self.count_lock:
+			self.request_cnt += 1
+		_split = urllib.parse.urlsplit(url)
+		if _split.path.rstrip('/') == '/stats':
+			return 200, json.dumps(self.stats()).encode('utf-8')
+
+		_query = dict(urllib.parse.parse_qsl(_split.query))
+		_key = (_split.path.rstrip('/'), tuple(sorted(_query.items())))
+		body = self.cache.get(_key)
+		if body is not None:
+			return 200, body
+		try:
+			body = json.dumps(self.answer(_split.path, _query)).encode('utf-8')
+		except LookupError:
+			return 404, json.dumps({'error': f'no route {_split.path}'}).encode('utf-8')
+		except ValueError as ex:
+			return 400, json.dumps({'error': str(ex)}).encode('utf-8')
+		self.cache.put(_key, body)
+		return 200, body
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Query_Handler(http.server.BaseHTTPRequestHandler):
+	"""
+	GET handler passing requests to the server's WP_Query_Service.
+	"""
+
+	server_version = 'wp_serve/' + __version__
+	quiet = True
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def do_GET(self):
+		_status, body = self.server.service.respond(self.path)
+		self.send_response(_status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def log_message(self, format, *args):
+		if not WP_Query_Handler.quiet:
+			super().log_message(format, *args)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def reload_loop(service:WP_Query_Service, every:float, stop_event:threading.Event):
+	"""
+	refresh [service] every [every] seconds until [stop_event].
+	"""
+	while not stop_event.wait(every):
+		for path in service.refresh():
+			print(f'reloaded: {path}', file=sys.stderr)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_serve', description='localhost JSON queries over Wordpress export posts.')
+	ap.add_argument('startdir', nargs='?', default=None, help='directory of exports (default: cwd)')
+	ap.add_argument('--host', default='127.0.0.1')
+	ap.add_argument('--port', type=int, default=8765)
+	ap.add_argument('--cache-size', type=int, default=256, help='cached responses')
+	ap.add_argument('--reload-seconds', type=float, default=5.0, help='seconds between change checks (0: never)')
+	ap.add_argument('--verbose', action='store_true', help='log each request')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+	WP_Query_Handler.quiet = not args.verbose
+
+	service = WP_Query_Service(args.startdir or str(pathlib.Path().cwd()), args.cache_size)
+	_start = time.perf_counter()
+	service.refresh()
+	print(f'{len(service.index_dict)} export(s), {service.stats()["records"]} records loaded ' + \
+		f'in {time.perf_counter() - _start:.1f} s.', file=sys.stderr)
+
+	server = http.server.ThreadingHTTPServer((args.host, args.port), WP_Query_Handler)
+	server.daemon_threads = True
+	server.service = service
+
+	stop_event = threading.Event()
+	if args.reload_seconds > 0:
+		threading.Thread(target=reload_loop, args=(service, args.reload_seconds, stop_event),\
+			daemon=True).start()
+
+	print(f'serving on http://{args.host}:{server.server_address[1]}/', file=sys.stderr)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		stop_event.set()
+		server.server_close()
+	return 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
@@ -0,0 +1,332 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_text_index keeps an inverted full-text index of
+post titles and cleaned content (see WP_Export.wp_clean_text_tags)
+across many Wordpress export files.
+
+The index is a sqlite3 file.  Each term row holds the sorted doc
+ids of one export as a packed int array, so updating an export
+only rewrites that export's rows, and a query is one indexed
+lookup per term.
+
+Usage:
+ python wp_text_index.py --db posts.idx index [dir]
+ python wp_text_index.py --db posts.idx query word [word ...]
+
+Required modules:
+ wp_xml_export_extract - export parsing.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import argparse
+import datetime
+import pathlib
+import re
+import sqlite3
+import sys
+import time
+from array import array
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import split_zip_path
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+STOP_WORDS = frozenset('''
+a an and are as at be but by for from has have he her his i if in into is it
+its me my no not of on or our she so than that the their them then there these
+they this to too us was we were what when which who will with you your
+'''.split())
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Text_Index:
+	"""
+	Inverted full-text index over post titles and content,
+	persisted in a sqlite3 file and updated per export.
+	"""
+
+	token_re = re.compile(r'\w+')
+	min_len = 2
+	fetch_chunk = 500			# doc ids per SELECT (sqlite caps bound variables)
+
+	schema = '''
+		CREATE TABLE IF NOT EXISTS exports(
+			export_id INTEGER PRIMARY KEY,
+			path TEXT UNIQUE,
+			size INTEGER,
+			mtime REAL,
+			indexed TEXT,
+			doc_cnt INTEGER);
+		CREATE TABLE IF NOT EXISTS docs(
+			doc_id INTEGER PRIMARY KEY,
+			export_id INTEGER,
+			post_id INTEGER,
+			link TEXT,
+			title TEXT,
+			status TEXT);
+		CREATE INDEX IF NOT EXISTS docs_export ON docs(export_id);
+		CREATE TABLE IF NOT EXISTS postings(
+			term TEXT,
+			export_id INTEGER,
+			doc_ids BLOB,
+			PRIMARY KEY(term, export_id)) WITHOUT ROWID;
+		CREATE INDEX IF NOT EXISTS postings_export ON postings(export_id);
+	'''
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, db_path:str):
+		self.db_path = db_path
+		self.db = sqlite3.connect(db_path)
+		self.db.executescript(WP_Text_Index.schema)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@classmethod
+	def tokenize(cls, text) -> set:
+		"""
+		return set of lowercase index terms in [text].
+		"""
+		_min = cls.min_len
+		return {t for t in cls.token_re.findall(str(text).lower())\
+			if len(t) >= _min and t not in STOP_WORDS}
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def is_current(self, path) -> bool:
+		"""
+		return True if [path] is indexed and unchanged on disk
+		(for a zip member, its zip file is unchanged).
+		"""
+		_stat = pathlib.Path(split_zip_path(path)[0]).stat()
+		row = self.db.execute('SELECT size, mtime FROM exports WHERE path=?',\
+			(str(path),)).fetchone()
+		return row is not None and row[0] == _stat.st_size and row[1] == _stat.st_mtime
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def remove_export(self, path):
+		row = self.db.execute('SELECT export_id FROM exports WHERE path=?',\
+			(str(path),)).fetchone()
+		if row is None:
+			return
+		_export_id = row[0]
+		self.db.execute('DELETE FROM postings WHERE export_id=?', (_export_id,))
+		self.db.execute('DELETE FROM docs WHERE export_id=?', (_export_id,))
+		self.db.execute('DELETE FROM exports WHERE export_id=?', (_export_id,))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_export(self, path, node_list:list) -> int:
+		"""
+		(re)index the posts in [node_list] read from export [path],
+		replacing any earlier index of that export.  Return the
+		number of posts indexed.
+		"""
+		_path = str(path)
+		_stat = pathlib.Path(split_zip_path(_path)[0]).stat()
+		_db = self.db
+
+		with _db:
+			self.remove_export(_path)
+			cur = _db.execute('INSERT INTO exports(path, size, mtime, indexed, doc_cnt) ' + \
+				'VALUES(?,?,?,?,0)', (_path, _stat.st_size, _stat.st_mtime,\
+				datetime.datetime.now().isoformat(timespec='seconds')))
+			_export_id = cur.lastrowid
+
+			postings = {}
+			doc_cnt = 0
+			for nd in node_list:
+				if nd.post_type != 'post':
+					continue
+				cur = _db.execute('INSERT INTO docs(export_id, post_id, link, title, status) ' + \
+					'VALUES(?,?,?,?,?)', (_export_id, nd.post_id, str(nd.link),\
+					str(nd.title), nd.status))
+				_doc_id = cur.lastrowid
+				for t in WP_Text_Index.tokenize(f'{nd.title} {nd.content}'):
+					_ids = postings.get(t)
+					if _ids is None:
+						_ids = postings[t] = array('I')
+					_ids.append(_doc_id)
+				doc_cnt += 1
+
+			# doc ids are assigned in increasing order, so each
+			# posting array is already sorted.
+			_db.executemany('INSERT INTO postings(term, export_id, doc_ids) VALUES(?,?,?)',\
+				((t, _export_id, ids.tobytes()) for t, ids in postings.items()))
+			_db.execute('UPDATE exports SET doc_cnt=? WHERE export_id=?', (doc_cnt, _export_id))
+
+		return doc_cnt
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def term_doc_ids(self, term:str) -> set:
+		"""
+		return set of doc ids containing [term] across all exports.
+		"""
+		doc_ids = set()
+		for (_blob,) in self.db.execute('SELECT doc_ids FROM postings WHERE term=?', (term,)):
+			_ids = array('I')
+			_ids.frombytes(_blob)
+			doc_ids.update(_ids)
+		return doc_ids
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def query(self, text:str, limit:int=None) -> list:
+		"""
+		return (post_id, link, title, export path) for posts
+		containing every term in [text].
+		"""
+		_terms = sorted(WP_Text_Index.tokenize(text))
+		if not _terms:
+			return []
+
+		doc_ids = None
+		# smallest posting lists first keeps the intersection small.
+		_sets = sorted((self.term_doc_ids(t) for t in _terms), key=len)
+		for _ids in _sets:
+			doc_ids = _ids if doc_ids is None else doc_ids & _ids
+			if not doc_ids:
+				return []
+
+		_ids = sorted(doc_ids)
+		if limit is not None:
+			_ids = _ids[:limit]
+
+		# hits are fetched a chunk of doc ids per query, then
+		# put back in doc id order.
+		row_dict = {}
+		_chunk = WP_Text_Index.fetch_chunk
+		for i in range(0, len(_ids), _chunk):
+			_part = _ids[i:i + _chunk]
+			_sql = 'SELECT d.doc_id, d.post_id, d.link, d.title, e.path FROM docs d ' + \
+				'JOIN exports e ON e.export_id = d.export_id ' + \
+				f'WHERE d.doc_id IN ({",".join("?" * len(_part))})'
+			for row in self.db.execute(_sql, _part):
+				row_dict[row[0]] = row[1:]
+		return [row_dict[_id] for _id in _ids if _id in row_dict]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def export_list(self) -> list:
+		return self.db.execute('SELECT path, doc_cnt, indexed FROM exports ORDER BY path').fetchall()
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def close(self):
+		self.db.close()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def index_exports(text_index:WP_Text_Index, xml_file_list:list, force=False) -> list:
+	"""
+	index each changed export in [xml_file_list],
+	return list of (path, posts indexed or None if unchanged).
+	"""
+	import wp_xml_export_extract as wpx
+
+	ret_list = []
+	for path in xml_file_list:
+		if not force and text_index.is_current(path):
+			ret_list.append((path, None))
+			continue
+		session = wpx.WP_Export_Session(path)
+		session.load()
+		ret_list.append((path, text_index.add_export(path, session.node_list)))
+		session.close()
+	return ret_list
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(prog='wp_text_index', description='full-text index of Wordpress export posts.')
+	ap.add_argument('--db', default='wp_text_index.idx', help='index file path')
+	sub = ap.add_subparsers(dest='cmd', required=True)
+	ap_index = sub.add_parser('index', help='index new or changed export xml files')
+	ap_index.add_argument('startdir', nargs='?', default=None)
+	ap_index.add_argument('--force', action='store_true', help='reindex unchanged exports')
+	ap_query = sub.add_parser('query', help='list posts containing all words')
+	ap_query.add_argument('words', nargs='+')
+	ap_query.add_argument('--limit', type=int, default=None)
+	sub.add_parser('list', help='list indexed exports')
+	return ap.parse_args(argv)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+
+	text_index = WP_Text_Index(args.db)
+
+	if args.cmd == 'index':
+		_startdir = args.startdir or str(pathlib.Path().cwd())
+		for path, cnt in index_exports(text_index, build_stream_file_list(_startdir, '*.xml'), args.force):
+			_msg = 'unchanged' if cnt is None else f'{cnt} posts indexed'
+			print(f'{path}: {_msg}')
+
+	elif args.cmd == 'query':
+		_start = time.perf_counter()
+		hit_list = text_index.query(' '.join(args.words), args.limit)
+		_ms = (time.perf_counter() - _start) * 1000
+		for post_id, link, title, path in hit_list:
+			print(f'{post_id}\t{link}\t{title}\t{path}')
+		print(f'{LF}{len(hit_list)} post(s) found in {_ms:.1f} ms.', file=sys.stderr)
+
+	else:
+		for path, doc_cnt, indexed in text_index.export_list():
+			print(f'{path}\t{doc_cnt}\t{indexed}')
+
+	text_index.close()
+	return 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+
+	sys.exit(main())
@@ -0,0 +1,434 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_tree builds the page/post hierarchy of an export
+from post_id and post_parent, for every post type (pages, posts,
+attachments and custom types).
+
+WP_Post_Tree keeps one compact row per item as the export is
+read.  Rows also keep each item's post_name and link, so the link
+graph can resolve links to pages and other post types.  build()
+resolves parents through a post_id hash, lays the children out as
+CSR arrays, walks the trees once depth-first for depth and
+preorder, and sums subtree sizes over the reversed preorder, so
+construction is linear in the number of items.  Breadcrumbs are
+read back along the parent links, with the middle of very deep
+paths elided.  A parent that is not in the export makes its child
+a root; a post_parent cycle is cut at its first item.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import bisect
+import heapq
+from array import array
+from collections import Counter
+
+from sparkwarden_file_lib import LF
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def int_or_zero(value) -> int:
+	try:
+		return int(value)
+	except (TypeError, ValueError):
+		return 0
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Post_Tree:
+	"""
+	post_parent hierarchy of the items of one export.
+	"""
+
+	top_n = 20
+	sep = ' > '
+	crumb_head = 3				# labels kept either side of an elided path
+	crumb_tail = 6
+	depth_bins = (0, 1, 2, 3, 4, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self):
+		self.ids = array('q')
+		self.parents = array('q')			# post_parent id, 0 for none
+		self.types = []
+		self.statuses = []
+		self.titles = []
+		self.names = []						# post_name
+		self.links = []
+		self.built = False
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add(self, post_id:int, post_parent:int, post_type:str, status:str, title:str,\
+		name:str='', link:str=''):
+		self.ids.append(post_id)
+		self.parents.append(post_parent)
+		self.types.append(post_type)
+		self.statuses.append(status)
+		self.titles.append(title)
+		self.names.append(name)
+		self.links.append(link)
+		self.built = False
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_item(self, item:dict):
+		"""
+		add the row of a raw export item dict.
+		"""
+		_title = item.get('title')
+		_name = item.get('wp:post_name')
+		_link = item.get('link')
+		self.add(int_or_zero(item.get('wp:post_id')), int_or_zero(item.get('wp:post_parent')),\
+			str(item.get('wp:post_type', '')), str(item.get('wp:status', '')),\
+			str(_title) if _title else '', str(_name) if _name else '', str(_link) if _link else '')
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def rows(self, lo:int=0, hi:int=None) -> list:
+		"""
+		return rows [lo:hi] as
+		(post_id, post_parent, type, status, title, post_name, link).
+		"""
+		return list(zip(self.ids[lo:hi], self.parents[lo:hi], self.types[lo:hi],\
+			self.statuses[lo:hi], self.titles[lo:hi], self.names[lo:hi], self.links[lo:hi]))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_rows(self, rows):
+		for row in rows:
+			self.add(*row)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def extend(self, other):
+		"""
+		append the rows of another tree (e.g. a parsed range).
+		"""
+		self.ids.extend(other.ids)
+		self.parents.extend(other.parents)
+		self.types += other.types
+		self.statuses += other.statuses
+		self.titles += other.titles
+		self.names += other.names
+		self.links += other.links
+		self.built = False
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def type_status_cnt(self) -> Counter:
+		"""
+		return Counter of (post type, status) over all items.
+		"""
+		return Counter(zip(self.types, self.statuses))
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def build(self):
+		"""
+		resolve parents and compute depth, preorder and subtree sizes.
+		"""
+		if self.built:
+			return self
+		n = len(self.ids)
+
+		self.index = {}						# post_id: row
+		for i, _id in enumerate(self.ids):
+			if _id:
+				self.index.setdefault(_id, i)
+
+		self.parent_pos = array('q', [-1]) * n
+		self.orphan_cnt = 0					# parent id not in the export
+		_child_cnt = array('I', [0]) * (n + 1)
+		for i, _parent in enumerate(self.parents):
+			if not _parent:
+				continue
+			j = self.index.get(_parent)
+			if j is None:
+				self.orphan_cnt += 1
+			elif j != i:
+				self.parent_pos[i] = j
+				_child_cnt[j + 1] += 1
+
+		# CSR: children of row i are children[offsets[i]:offsets[i+1]], in file order.
+		_offsets = _child_cnt
+		for i in range(n):
+			_offsets[i + 1] += _offsets[i]
+		_children = array('I', [0]) * _offsets[n]
+		_fill = array('I', _offsets[:n])
+		for i, j in enumerate(self.parent_pos):
+			if j >= 0:
+				_children[_fill[j]] = i
+				_fill[j] += 1
+
+		self.depth = array('I', [0]) * n
+		self.order = array('I')				# preorder
+		_visited = bytearray(n)
+
+		def _walk(root):
+			stack = [root]
+			_visited[root] = 1
+			while stack:
+				i = stack.pop()
+				self.order.append(i)
+				_d = self.depth[i] + 1
+				for k in range(_offsets[i + 1] - 1, _offsets[i] - 1, -1):
+					c = _children[k]
+					if not _visited[c]:
+						_visited[c] = 1
+						self.depth[c] = _d
+						stack.append(c)
+
+		for i in range(n):
+			if self.parent_pos[i] < 0:
+				_walk(i)
+
+		# whatever is left hangs off a post_parent cycle.
+		self.cycle_cnt = 0
+		for i in range(n):
+			if not _visited[i]:
+				self.cycle_cnt += 1
+				self.parent_pos[i] = -1
+				_walk(i)
+
+		self.preorder_pos = array('I', [0]) * n
+		for _pos, i in enumerate(self.order):
+			self.preorder_pos[i] = _pos
+
+		self.size = array('I', [1]) * n
+		for i in reversed(self.order):
+			j = self.parent_pos[i]
+			if j >= 0:
+				self.size[j] += self.size[i]
+
+		self.built = True
+		return self
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def subtree(self, i:int):
+		"""
+		return the preorder rows of row [i]'s subtree.
+		"""
+		_pos = self.preorder_pos[i]
+		return self.order[_pos:_pos + self.size[i]]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def label(self, i:int) -> str:
+		return self.titles[i] or f'#{self.ids[i]}'
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def breadcrumb(self, i:int) -> str:
+		"""
+		return the labels from row [i]'s root down to row [i].
+		"""
+		_labels = []
+		while i >= 0:
+			_labels.append(self.label(i))
+			i = self.parent_pos[i]
+		_labels.reverse()
+		return WP_Post_Tree.join_crumbs(_labels)
+		
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def join_crumbs(labels:list) -> str:
+		"""
+		return [labels] joined, eliding the middle of a long path.
+		"""
+		_head, _tail = WP_Post_Tree.crumb_head, WP_Post_Tree.crumb_tail
+		if len(labels) > _head + _tail + 1:
+			labels = labels[:_head] + [f'... {len(labels) - _head - _tail} ...'] + labels[-_tail:]
+		return WP_Post_Tree.sep.join(labels)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_cols(self, post_id:int) -> list:
+		"""
+		return [parent id, depth, subtree size, breadcrumb] of a post.
+		"""
+		i = self.build().index.get(post_id)
+		if i is None:
+			return [0, 0, 1, '']
+		return [self.parents[i], self.depth[i], self.size[i], self.breadcrumb(i)]
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def xlsx_hdr() -> list:
+		return ['parent id','depth','subtree size','breadcrumb']
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def in_hierarchy(self, i:int) -> bool:
+		"""
+		return True if row [i] has a post_parent (found or not) or children.
+		"""
+		return self.parents[i] != 0 or self.size[i] > 1
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def report_msgs(self) -> list:
+		self.build()
+		n = len(self.ids)
+		_child_types = Counter(self.types[i] for i in range(n) if self.parent_pos[i] >= 0)
+		_bins = WP_Post_Tree.depth_bins
+		_depth_cnt = Counter(bisect.bisect_right(_bins, self.depth[i]) - 1\
+			for i in range(n) if self.in_hierarchy(i))
+		_max_depth = max(self.depth) if n else 0
+		_tree_cnt = sum(1 for i in range(n) if self.parent_pos[i] < 0 and self.size[i] > 1)
+
+		msg_list = []
+		msg_list.append(f'{LF}{LF} Hierarchy Summary: {n} items, {sum(_child_types.values())} with ' + \
+			f'a parent in {_tree_cnt} trees, max depth {_max_depth}, ' + \
+			f'{self.orphan_cnt} with a missing parent, {self.cycle_cnt} parent cycles cut. {LF}')
+
+		msg_list.append(f'{LF} Children by post type: ')
+		for name, cnt in _child_types.most_common():
+			msg_list.append(f'{LF}  {cnt:8d}  {name}')
+
+		msg_list.append(f'{LF}{LF} Depth (items in trees): ')
+		for b in sorted(_depth_cnt):
+			_lo = _bins[b]
+			_hi = _bins[b + 1] - 1 if b + 1 < len(_bins) else None
+			_label = str(_lo) if _hi == _lo else f'{_lo}-{_hi if _hi is not None else ""}'
+			msg_list.append(f'{LF}  {_label:>9}  {_depth_cnt[b]:8d}')
+
+		msg_list.append(f'{LF}{LF} Largest trees (items, max depth): ')
+		_big = heapq.nlargest(WP_Post_Tree.top_n, (i for i in range(n) \
+			if self.parent_pos[i] < 0 and self.size[i] > 1), key=self.size.__getitem__)
+		for i in _big:
+			_tree_depth = max(self.depth[k] for k in self.subtree(i))
+			msg_list.append(f'{LF}  {self.size[i]:8d} {_tree_depth:4d}  {self.types[i]} ' + \
+				f'{self.ids[i]}  {self.label(i)}')
+
+		if _max_depth:
+			_deep = self.depth.index(_max_depth)
+			msg_list.append(f'{LF}{LF} Deepest: {self.types[_deep]} {self.ids[_deep]}  {self.breadcrumb(_deep)}')
+
+		return msg_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def xlsx_rows(self) -> list:
+		"""
+		return the hierarchy sheet: items with a post_parent or
+		children, each tree in preorder.
+		"""
+		return list(self.iter_xlsx_rows())
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def iter_xlsx_rows(self):
+		self.build()
+		yield ['post id','post type','status','title'] + WP_Post_Tree.xlsx_hdr()
+		_path = []
+		for i in self.order:
+			_d = self.depth[i]
+			del _path[_d:]
+			_path.append(self.label(i))
+			if not self.in_hierarchy(i):
+				continue
+			yield [self.ids[i], self.types[i], self.statuses[i], self.titles[i],\
+				self.parents[i], _d, self.size[i], WP_Post_Tree.join_crumbs(_path)]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Item_Counts:
+	"""
+	(post type, status) counts of every item, standing in for
+	WP_Post_Tree where the hierarchy is not kept (bounded memory).
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self):
+		self.cnt = Counter()
+		self.item_cnt = 0
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def add_item(self, item:dict):
+		self.cnt[(str(item.get('wp:post_type', '')), str(item.get('wp:status', '')))] += 1
+		self.item_cnt += 1
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __len__(self) -> int:
+		return self.item_cnt
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def type_status_cnt(self) -> Counter:
+		return Counter(self.cnt)
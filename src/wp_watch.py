@@ -0,0 +1,400 @@
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+__prog__ = str(__file__).rstrip('.py')
+__author__ = 'Gary D. Smith <https://github.com/sparkwarden>'
+__version__ = '1.0'
+__date__ = '2026/10/19'
+
+
+"""
+Description: wp_watch watches a directory tree for Wordpress
+export files that are new or changed and processes each one as
+wp_xml_export_extract would, without rescanning the rest.
+
+Each poll walks the tree once (os.walk), matching the export
+suffixes in memory, and takes one stat per export (File_Node size
+and mtime).  A file is processed once
+its size and mtime have not changed for the settle time, and
+only if that signature has not been processed already and its
+excel file is not newer than it (so a restart does not redo
+finished work).  Ready files go to a small worker pool; reports
+come back to the parent and are written to its log as each file
+finishes.
+
+Each file's WP_Rollup comes back with its report; the latest
+rollup of every file still in the tree makes up the cross-site
+summary.
+
+State is one entry per file present in the tree, at most
+2 x workers files are in flight, workers are replaced after a
+number of files, and no file is held open between polls, so
+memory and open handles stay flat however long the watch runs.
+
+Usage:
+ python wp_xml_export_extract.py --watch [--poll-seconds 5] [--settle-seconds 10]
+
+Required modules:
+ wp_xml_export_extract - export processing.
+ sparkwarden_file_lib - utility functions.
+"""
+
+#-------------------------------------------------------------
+#
+#------------------------------------------------------------
+
+import collections
+import concurrent.futures
+import os
+import signal
+import threading
+import time
+
+from sparkwarden_file_lib import LF
+from sparkwarden_file_lib import File_Node
+from sparkwarden_file_lib import zip_member_list
+from sparkwarden_file_lib import STREAM_OPENERS
+from wp_rollup import WP_Rollup
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+EXPORT_PATTERN = '*.xml'
+WATCH_SUFFIXES = ('.xml',) + tuple('.xml' + _ext for _ext in STREAM_OPENERS) + ('.zip',)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def export_list(path) -> list:
+	"""
+	return the exports in a watched file: its zip members, or
+	the file itself.
+	"""
+	if str(path).lower().endswith('.zip'):
+		return zip_member_list(path, EXPORT_PATTERN)
+	return [str(path)]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Message_List:
+	"""
+	Message writer that keeps messages in a list, so a worker's
+	report can be sent back to the parent's log.
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self):
+		self.msg_list = []
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def buffer_msg(self, s):
+		self.msg_list.append(s)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def ignore_interrupt():
+	"""
+	worker initializer: leave Ctrl-C to the parent, which
+	finishes or cancels the files in flight.
+	"""
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def process_watched_file(path, options:dict) -> tuple:
+	"""
+	worker: run process_xml_file on each export in [path] with
+	keyword [options] ('stats' and 'trace_memory' set up a
+	WP_Run_Stats per export; 'last_days' sets 'since' from
+	today, so a long watch keeps a moving window).  Return (path,
+	report messages, exports read, items read, WP_Rollup dict of
+	its exports).
+	"""
+	import wp_xml_export_extract as wpx
+
+	_options = dict(options)
+	_stats_on = _options.pop('stats', False)
+	_trace = _options.pop('trace_memory', True)
+	_last_days = _options.pop('last_days', None)
+	if _last_days is not None:
+		_options['since'] = wpx.last_days_since(_last_days)
+
+	writer = WP_Message_List()
+	item_cnt = 0
+	rollup = WP_Rollup()
+	_export_list = export_list(path)
+	for xml_path in _export_list:
+		stats = wpx.WP_Run_Stats(enabled=_stats_on, trace_memory=_trace)
+		session = wpx.process_xml_file(xml_path, stats, msg_writer=writer, **_options)
+		item_cnt += session.item_cnt
+		rollup.merge(session.rollup)
+		session.close()
+		if stats.enabled:
+			writer.buffer_msg(stats.as_str())
+	return path, writer.msg_list, len(_export_list), item_cnt, rollup.to_dict()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class WP_Export_Watcher:
+	"""
+	Polls [watch_dir] for new or changed export files and
+	processes each, once settled, in a pool of [workers].
+	"""
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def __init__(self, watch_dir, options:dict=None, msg_writer=None, poll_seconds:float=5.0,\
+		settle_seconds:float=10.0, workers:int=2, tasks_per_child:int=20):
+		self.watch_dir = str(watch_dir)
+		self.options = dict(options or {})
+		self.msg_writer = msg_writer			# anything with buffer_msg(s)
+		self.poll_seconds = poll_seconds
+		self.settle_seconds = settle_seconds
+		self.workers = max(1, workers)
+		self.tasks_per_child = tasks_per_child
+		self.max_pending = 2 * self.workers
+
+		self.seen = {}							# path: (size, mtime_ns), first seen at
+		self.done = {}							# path: (size, mtime_ns) processed
+		self.ready = collections.deque()		# settled paths waiting for a worker
+		self.pending = {}						# future: (path, (size, mtime_ns))
+		self.busy = set()						# paths ready or in flight
+		self.rollups = {}						# path: WP_Rollup of its last run
+
+		self.poll_cnt = 0
+		self.processed_cnt = 0
+		self.failed_cnt = 0
+		self.executor = None
+		self.stop_event = threading.Event()
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def emit(self, msg_list:list):
+		"""
+		send messages to the writer and write them out.
+		"""
+		if self.msg_writer is None:
+			print(''.join(msg_list))
+			return
+		for msg in msg_list:
+			self.msg_writer.buffer_msg(msg)
+		_flush = getattr(self.msg_writer, 'write_messages_from_buffer', None)
+		if _flush is not None:
+			_flush()
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def scan(self) -> dict:
+		"""
+		return {path: (size, mtime_ns)} for the watched files
+		now in the tree, from one walk of the tree.
+		"""
+		sig_dict = {}
+		for _dir, _, _names in os.walk(self.watch_dir):
+			for _name in _names:
+				if not _name.endswith(WATCH_SUFFIXES):
+					continue
+				path = os.path.join(_dir, _name)
+				try:
+					fn = File_Node(path)
+				except OSError:
+					continue			# removed since the walk
+				sig_dict[path] = (fn.filesize, fn.mtime_ns)
+		File_Node.clear_nodes()
+		return sig_dict
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	@staticmethod
+	def outputs_current(path, sig:tuple) -> bool:
+		"""
+		return True if every export in [path] has an excel file
+		at least as new as [path].
+		"""
+		import wp_xml_export_extract as wpx
+
+		for xml_path in export_list(path):
+			try:
+				if os.stat(wpx.export_output_path(xml_path, '.xlsx')).st_mtime_ns < sig[1]:
+					return False
+			except OSError:
+				return False
+		return True
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def poll(self, now:float=None) -> list:
+		"""
+		scan the tree once, return the paths newly ready to
+		process: changed or new, unchanged for the settle time,
+		and not already processed at this size and mtime.
+		"""
+		if now is None:
+			now = time.monotonic()
+		sig_dict = self.scan()
+		self.poll_cnt += 1
+
+		for path in [p for p in self.seen if p not in sig_dict]:
+			del self.seen[path]
+			self.done.pop(path, None)
+			self.rollups.pop(path, None)
+
+		ready_list = []
+		for path, sig in sig_dict.items():
+			_seen = self.seen.get(path)
+			if _seen is None or _seen[0] != sig:
+				self.seen[path] = (sig, now)
+				continue
+			if now - _seen[1] < self.settle_seconds:
+				continue
+			if path in self.busy or self.done.get(path) == sig:
+				continue
+			if WP_Export_Watcher.outputs_current(path, sig):
+				self.done[path] = sig
+				continue
+			ready_list.append(path)
+		return ready_list
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def start_executor(self):
+		"""
+		start the worker pool: processes replaced every
+		[tasks_per_child] files where supported, else threads.
+		"""
+		try:
+			try:
+				self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,\
+					initializer=ignore_interrupt, max_tasks_per_child=self.tasks_per_child)
+			except TypeError:
+				self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,\
+					initializer=ignore_interrupt)
+		except (ImportError, NotImplementedError, OSError):
+			self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def submit(self):
+		"""
+		hand ready paths to the pool, up to [max_pending] in flight.
+		"""
+		while self.ready and len(self.pending) < self.max_pending:
+			path = self.ready.popleft()
+			_sig = self.seen[path][0] if path in self.seen else None
+			if _sig is None:
+				self.busy.discard(path)
+				continue
+			try:
+				fut = self.executor.submit(process_watched_file, path, self.options)
+			except concurrent.futures.BrokenExecutor:
+				self.executor.shutdown(wait=False)
+				self.start_executor()
+				fut = self.executor.submit(process_watched_file, path, self.options)
+			self.pending[fut] = (path, _sig)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def collect(self, timeout:float=None):
+		"""
+		wait up to [timeout] seconds for files in flight, log
+		the reports of those that finished.
+		"""
+		if not self.pending:
+			self.stop_event.wait(timeout)
+			return
+		_done, _ = concurrent.futures.wait(self.pending, timeout=timeout,\
+			return_when=concurrent.futures.FIRST_COMPLETED)
+		for fut in _done:
+			path, sig = self.pending.pop(fut)
+			self.busy.discard(path)
+			self.done[path] = sig
+			try:
+				_, msg_list, _export_cnt, _item_cnt, _rollup = fut.result()
+			except Exception as ex:
+				self.failed_cnt += 1
+				self.emit([f'{LF}{LF} watch: {path} failed: {type(ex).__name__}: {ex} {LF}'])
+				continue
+			self.processed_cnt += 1
+			self.rollups[path] = WP_Rollup.from_dict(_rollup)
+			msg_list.append(f'{LF}{LF} watch: {path} processed, {_export_cnt} export(s), ' + \
+				f'{_item_cnt} items. {LF}')
+			self.emit(msg_list)
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def summary(self):
+		"""
+		return the WP_Rollup of the files processed and still in
+		the tree.
+		"""
+		return WP_Rollup.merged(self.rollups[p] for p in sorted(self.rollups))
+		
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def stop(self):
+		self.stop_event.set()
+
+	#-------------------------------------------------------------
+	#
+	#-------------------------------------------------------------
+
+	def run(self, max_polls:int=None):
+		"""
+		poll until stop() (or [max_polls] polls), then finish
+		the files in flight.
+		"""
+		self.emit([f'{LF} watch: watching {self.watch_dir} every {self.poll_seconds} s, ' + \
+			f'settle {self.settle_seconds} s, {self.workers} worker(s). {LF}'])
+		self.start_executor()
+		try:
+			while not self.stop_event.is_set():
+				for path in self.poll():
+					self.busy.add(path)
+					self.ready.append(path)
+				self.submit()
+				if max_polls is not None and self.poll_cnt >= max_polls:
+					break
+				self.collect(self.poll_seconds)
+			while self.pending:
+				self.collect(None)
+		finally:
+			self.executor.shutdown(wait=True, cancel_futures=True)
+			self.emit([f'{LF} watch: stopped after {self.poll_cnt} polls, ' + \
+				f'{self.processed_cnt} file(s) processed, {self.failed_cnt} failed. {LF}'])
@@ -17,6 +17,9 @@ Tested with Python 3.10
 Operating System: iPadOS 17.4
 iOS Python apps: Pythonista, a-Shell
 
+Usage:
+ python -m wp_xml_export_extract [options]
+
 Required modules:
  xmltodict - convert xml file to nested dict.
  sparkwarden_file_lib - utility functions.
@@ -26,19 +29,41 @@ Required modules:
 # 
 #------------------------------------------------------------
 
-import xmltodict
+from xml.parsers import expat
 import pathlib
 import datetime
+import argparse
 
 from operator import attrgetter
-import copy
+from operator import itemgetter
+from collections import Counter
+from array import array
+import itertools
+import threading
+import collections
 import re
+import bisect
+import heapq
+import types
+import os
+import sys
+import time
 
 from sparkwarden_file_lib import Message_Writer
 from sparkwarden_file_lib import LF
-from sparkwarden_file_lib import build_file_list
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import open_stream
+from sparkwarden_file_lib import split_zip_path
+from sparkwarden_file_lib import strip_stream_ext
 from sparkwarden_file_lib import list_to_xlsx
+from sparkwarden_file_lib import sheets_to_xlsx
 from sparkwarden_file_lib import make_dt_output_filepath
+from sparkwarden_file_lib import Stage_Timer
+from sparkwarden_file_lib import External_Sorter
+
+# wp_blocks, wp_links, wp_metrics, wp_tree and wp_rollup, like
+# json, csv, pickle and mmap, are imported where they are used
+# so that --help and small runs start fast (wp_bench --startup).
 
 #-------------------------------------------------------------
 # 
@@ -46,6 +71,12 @@ from sparkwarden_file_lib import make_dt_output_filepath
 
 g_msgwr = None
 
+# a resumed parse starts with these open elements, standing in for
+# the <rss> and <channel> tags of the skipped part of the file.
+RESUME_PREFIX = b'<rss><channel>'
+RESUME_SUFFIX = b'</channel></rss>'
+ITEM_END_TAG = b'</item>'
+
 def buffer_msg(s):
 	g_msgwr.buffer_msg(s)
 
@@ -55,12 +86,14 @@ def buffer_msg(s):
 
 class WP_Export:
 	"""
-	Wordpress export class.  Extracts data from each blog post,
-	outputs to report log and excel file for subsequent analysis.
+	Wordpress export class.  Extracts data from one blog post or
+	attachment.  The records of an export file are held, reported
+	and written to excel by a WP_Export_Session.  Content metrics,
+	block stats and link urls are only taken from the body if
+	[metrics], [blocks] or [links] is set, else they are None, None
+	and ().
 	"""
 	
-	node_list = []
-	srt_node_list = []
 	none_str =  '<none>'
 	
 	#-------------------------------------------------------------
@@ -68,7 +101,8 @@ class WP_Export:
 	#-------------------------------------------------------------
 	
 	
-	def __init__(self, postno:int, item:dict, xml_path:str):
+	def __init__(self, postno:int, item:dict, xml_path:str, term_dict=None,\
+		metrics=False, blocks=False, links=False):
 		
 		_cls = WP_Export
 		
@@ -78,7 +112,19 @@ class WP_Export:
 		self.link = item.get('link',_none)
 		self.post_type = item.get('wp:post_type',_none)
 		_content = item.get('content:encoded',_none)
+		self.block_stats = None
+		if blocks:
+			from wp_blocks import WP_Block_Stats
+			self.block_stats = WP_Block_Stats(_content)
+		self.link_urls = ()
+		if links:
+			from wp_links import find_link_urls
+			self.link_urls = find_link_urls(_content)
 		self.content = self.wp_clean_text_tags(_content)
+		self.content_stats = None
+		if metrics:
+			from wp_metrics import WP_Content_Stats
+			self.content_stats = WP_Content_Stats(_content, self.content)
 		
 		self.post_name = item.get('wp:post_name',_none)
 		self.creator = item.get('dc:creator',_none)
@@ -92,28 +138,26 @@ class WP_Export:
 		_post_parent = item.get('wp:post_parent',0)
 		self.post_parent = int(_post_parent)
 		
-		_out_date, _ = _cls.to_pubdate(_pub_date,"%Y%m%d%H%M%S")
-		self.sort_key = _out_date
+		if self.pub_date:
+			self.sort_key = _pub_date_time.strftime("%Y%m%d%H%M%S")
+		else:
+			self.sort_key = ''
 		
 		self.attachment_url = item.get('wp:attachment_url',_none)
 		
 		self.xml_path = xml_path
 		self.postno = postno
 		
-		self.categories = []
-		self.tags = []
+		self.category_ids = array('I')
+		self.tag_ids = array('I')
 		self.attachments = []
 		self.images = []
 		
-		_cats_tags = item.get('category',[])
+		if term_dict is None:
+			term_dict = WP_Term_Dict()
+		self.term_dict = term_dict
 		
-		for x in _cats_tags:
-			_k = x['@domain']
-			_v = x['@nicename']
-			if _k == 'category':
-				self.categories.append(_v)
-			else:
-				self.tags.append(_v)
+		self.intern_terms(term_dict)
 				
 		_postmeta = item.get('wp:postmeta',[])
 		
@@ -129,9 +173,43 @@ class WP_Export:
 		self.thumbnail_id = _thumbnail_id
 		#self.postmeta = _postmeta
 		
-		if self not in _cls.node_list:
-			_cls.node_list.append(self)
+		self.comment_stats = item.get('_comment_stats')
+		if self.comment_stats is None:
+			self.comment_stats = WP_Comment_Stats()
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def intern_terms(self, term_dict):
+		"""
+		set category and tag ids from the item's terms in [term_dict].
+		"""
+		self.term_dict = term_dict
+		self.category_ids = array('I')
+		self.tag_ids = array('I')
+		_intern = term_dict.intern
+		
+		for x in self.item.get('category',[]):
+			_k = x['@domain']
+			_v = x['@nicename']
+			if _k == 'category':
+				self.category_ids.append(_intern(_v))
+			else:
+				self.tag_ids.append(_intern(_v))
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
+	@property
+	def categories(self) -> list:
+		return self.term_dict.slugs(self.category_ids)
+		
+	@property
+	def tags(self) -> list:
+		return self.term_dict.slugs(self.tag_ids)
+		
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
@@ -177,69 +255,10 @@ class WP_Export:
 			retdt = datetime.datetime.strptime(indate,'%a, %d %b %Y %H:%M:%S +0000')
 			retdtstr = retdt.strftime(outfmt)
 			
-		except ValueError as ex:
+		except (ValueError, TypeError) as ex:
 			print(ex)
 		return retdtstr, retdt
 		
-	#-------------------------------------------------------------
-	# 
-	#-------------------------------------------------------------
-	
-	@classmethod
-	def setup(cls):
-		"""
-		setup node lists and message_writer.
-		"""
-		cls.node_list.clear()
-		cls.srt_node_list.clear()
-		
-	#-------------------------------------------------------------
-	# 
-	#-------------------------------------------------------------
-	
-	@classmethod
-	def set_srt_node_list(cls):
-		"""
-		sort the node list.
-		"""
-		_deep_node_list = copy.deepcopy(cls.node_list)
-		srt_node_list = \
-			sorted(_deep_node_list, key=attrgetter('sort_key'),reverse=True)
-		cls.srt_node_list = srt_node_list
-	
-	#-------------------------------------------------------------
-	# 
-	#-------------------------------------------------------------
-	
-	@classmethod
-	def get_post_by_postno(cls,postno):
-		"""
-		return class instance by post number.
-		"""
-		post_list = [nd for nd in cls.node_list if nd.postno == postno]
-		retnode = None
-		if post_list:
-			if len(post_list) > 0:
-				retnode = post_list[0]
-		return retnode
-		
-	#-------------------------------------------------------------
-	# 
-	#-------------------------------------------------------------
-
-	@classmethod
-	def get_post_by_postid(cls,post_id):
-		"""
-		return class instance by post id.
-		"""
-		post_list = [nd for nd in cls.node_list if nd.post_id == post_id]
-		retnode = None
-		if post_list:
-			if len(post_list) == 1:
-				retnode = post_list[0]
-		return retnode
-		
-	
 	#---------------------------------------------------------------------
 	#
 	#---------------------------------------------------------------------
@@ -264,27 +283,6 @@ class WP_Export:
 			_text = str(_text).replace(_tag,' ')
 		return _text
 					
-	#---------------------------------------------------------------------
-	#
-	#---------------------------------------------------------------------
-					
-	@classmethod
-	def attach_images_to_parents(cls):
-		"""
-		attach image filename(s) to each post instance.
-		"""
-		_attach_list = [a for a in cls.srt_node_list if a.status == 'inherit']
-		_publish_list = [p for p in cls.srt_node_list if p.status == 'publish']
-		for p in _publish_list:
-			_att_list = [a for a in _attach_list if a.post_parent == p.post_id]
-			_att_list += [a for a in _attach_list if a.post_id == p.thumbnail_id]
-			p.attachments = _att_list
-			_img_set = set()
-			for a in _att_list:
-				_img_set.add(a.attachment_url)
-			p.images = list(_img_set)
-			
-		
 	#---------------------------------------------------------------------
 	#
 	#---------------------------------------------------------------------
@@ -314,17 +312,15 @@ class WP_Export:
 		self.field_str('thumbnail_id',LF)
 		#self.field_str('content',LF)
 		
-		_cats = f'{LF} categories: '
-		_tags = f'{LF} tags: '
+		retstr += f'{LF} categories: ' + ', '.join(self.categories)
+		retstr += f'{LF} tags: ' + ', '.join(self.tags)
 		
-		for c in self.categories:
-			_cats += str(c) + ', '
-		
-		for t in self.tags:
-			_tags += str(t) + ', '
+		if self.comment_stats.comment_cnt:
+			retstr += f'{LF} comments: {self.comment_stats.as_str()}'
 			
-		retstr += _cats[:-2]
-		retstr += _tags[:-2]
+		_bs = self.block_stats
+		if _bs is not None and (_bs.block_cnt or _bs.shortcode_cnt):
+			retstr += f'{LF} blocks: {self.block_stats.as_str()}'
 		
 		retstr += f'{LF}{LF}{len(self.images)} image(s) attached. {LF}'
 		
@@ -341,21 +337,13 @@ class WP_Export:
 		"""
 		return data elements to excel row list.
 		"""
-		_cats = ''
-		_tags = ''
-		for c in self.categories:
-			_cats += str(c) + ', '
-		
-		for t in self.tags:
-			_tags += str(t) + ', '
-			
-		_cats = _cats[:-2]
-		_tags = _tags[:-2]
+		_cats = ', '.join(self.categories)
+		_tags = ', '.join(self.tags)
 		
 		_num_images = len(self.images)
 		return [self.postno,self.post_id,self.status,self.post_type,\
 		self.pub_date,self.sort_key,self.title,self.post_name,_cats,\
-		_tags,_num_images]
+		_tags,_num_images] + self.comment_stats.as_xlsx_row()
 	
 	#-------------------------------------------------------------
 	# 
@@ -366,7 +354,8 @@ class WP_Export:
 		""" 
 		return data element names as excel header list.
 		"""
-		return ['post no','post id','status','post type','pubdate','sort key','title','name','categories','tags','#images']
+		return ['post no','post id','status','post type','pubdate','sort key','title','name','categories','tags','#images'] + \
+			WP_Comment_Stats.as_xlsx_hdr()
 		
 		
 	#-------------------------------------------------------------
@@ -375,137 +364,2486 @@ class WP_Export:
 	
 	def __repr__(self) -> str:
 		return self.as_str()
-	
+		
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
-
-	@classmethod
-	def report_and_xlsx(cls):
+	
+	def __getstate__(self) -> dict:
 		"""
-		generate report log, report excel file.
+		pickle without the session's term dictionary; the
+		restoring session attaches its own.
 		"""
-		
-		cls.set_srt_node_list()
-		cls.attach_images_to_parents()
-		
-		publish_list = [p for p in cls.srt_node_list if p.status == 'publish']
-		
-		topnode = publish_list[0]
-		_path = str(topnode.xml_path)
-		
-		buffer_msg(f'{LF}{LF}{"*"*80}{LF}')
-		
-		buffer_msg(f'{LF} Report for WP xml path: {_path}')
-		
-		buffer_msg(f'{LF}{LF} Published Posts: {LF}')
-		
-		for p in publish_list:
-			buffer_msg(f'{LF} {p.as_str()}')
-			
-		#------------------------------------------------------------
-		# 
-		#------------------------------------------------------------
-		
-		attach_list = [a for a in cls.srt_node_list if a.status == 'inherit']
-			
-		buffer_msg(f'{LF}{LF} Attachments: {LF}')
-		
-		for a in attach_list:
-			buffer_msg(f'{LF} {a.as_str()}')
-			
-		#------------------------------------------------------------
-		# 
-		#------------------------------------------------------------
-			
-		xlsx_list = [cls.as_xlsx_hdr()]
-		
-		for p in publish_list:
-			xlsx_list.append(p.as_xlsx_row())
-		
-		list_to_xlsx(xlsx_list,_path.rstrip('.xml')+'.xlsx')
-			
-		
+		d = dict(self.__dict__)
+		d['term_dict'] = None
+		return d
+	
 #-------------------------------------------------------------
 # 
 #-------------------------------------------------------------
 
-def process_xml_file(path):
-	WP_Export.setup()
+class WP_Export_Session:
+	"""
+	Records, indexes and output of one export file.  Sessions share
+	no state, so several can run at once in threads, or one after
+	another in a long-running worker without leaking between jobs.
+	Methods lock the session, so one session may also be read
+	from several threads.
+	"""
 	
-	item_list = []
-
-	with open(path,"r",encoding="utf-8") as fd:
-		doc = xmltodict.parse(fd.read())
-		
-		item_list = doc['rss']['channel']['item']
+	keep_post_types = ('post', 'attachment')
+	
+	# keeps each session's report together in a shared writer.
+	writer_lock = threading.Lock()
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	for item_no, item in enumerate(item_list,start=1):
+	def __init__(self, xml_path, msg_writer=None, stats=None):
+		from wp_tree import WP_Post_Tree
+		self.xml_path = str(xml_path)
+		self.msg_writer = msg_writer		# anything with buffer_msg(s)
+		self.msg_list = []					# report msgs when no msg_writer
+		if stats is None:
+			stats = WP_Run_Stats.disabled
+		self.stats = stats
+		self.term_dict = WP_Term_Dict()
+		self.node_list = []
+		self.srt_node_list = []
+		self.time_index = None
+		self.node_by_postid = {}
+		self.item_cnt = 0
+		self.date_err_cnt = 0
+		self.metrics = False				# content metrics columns, report, sheet
+		self.blocks = False					# block/shortcode columns, report, sheet
+		self.links = False					# link graph report, sheet
+		self.tree = WP_Post_Tree()			# post_parent hierarchy of every item
+		self.site_link = ''					# channel <link>
+		self.rollup = None					# WP_Rollup, set by report_and_xlsx
+		self.lock = threading.RLock()
 		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add_item(self, item_no, item):
+		"""
+		create a WP_Export record if the item is a post or
+		attachment, return the record or None.  Every item goes
+		into the hierarchy tree.
+		"""
 		_post_type = item.get('wp:post_type','')
-		if _post_type in ['post', 'attachment']:
-			WP_Export(item_no, item, path)
+		_keep = _post_type in self.keep_post_types
+		node = None
+		
+		with self.lock:
+			self.item_cnt += 1
+			self.tree.add_item(item)
+			if _keep:
+				node = WP_Export(item_no, item, self.xml_path, self.term_dict,\
+					self.metrics, self.blocks, self.links)
+				self.add_node(node)
+				
+		if self.stats.enabled:
+			self.stats.count_item(_post_type, _keep)
 			
-	WP_Export.report_and_xlsx()
-
-#-------------------------------------------------------------
-# 
-#-------------------------------------------------------------
+		return node
 		
-def main():
-	
 	#-------------------------------------------------------------
 	# 
-	#------------------------------------------------------------
-	
-	curdir = pathlib.Path().cwd()
-	
-	xml_file_list = build_file_list(curdir, '*.xml')
+	#-------------------------------------------------------------
 	
-	for xml_path in xml_file_list:
-		process_xml_file(xml_path)
+	def add_channel(self, key:str, value):
+		"""
+		note an element of the export's channel.
+		"""
+		if key == 'link' and isinstance(value, str) and not self.site_link:
+			self.site_link = value.strip()
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	buffer_msg(f'{LF}{LF}{"*"*80}')
-	buffer_msg(f'{LF}{LF}Totals:')
-	buffer_msg(f'{LF} {len(xml_file_list)} export xml files read.')
+	def add_node(self, node):
+		"""
+		add a record built elsewhere (already in this session's terms).
+		"""
+		with self.lock:
+			self.node_list.append(node)
+			self.node_by_postid.setdefault(node.post_id, node)
+			if not node.pub_date:
+				self.date_err_cnt += 1
+			self.time_index = None
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	#------------------------------------------------------------
+	def load_parallel(self, workers:int) -> int:
+		"""
+		load a plain export file with [workers] processes, each
+		parsing a range of whole items (see find_item_splits).
+		Records come back in file order and are renumbered and
+		re-interned here, so the session ends up as after load.
+		Falls back to load for compressed or zipped files, or
+		where processes are not available.  Return items read.
+		"""
+		_path = self.xml_path
+		if workers < 2 or split_zip_path(_path)[1] is not None or strip_stream_ext(_path) != _path:
+			return self.load()
+		import concurrent.futures
+		try:
+			executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+		except (ImportError, NotImplementedError, OSError):
+			return self.load()
+			
+		with self.lock:
+			_date_err_cnt = self.date_err_cnt
+			_item_cnt = self.item_cnt
+			with self.stats.stage('parse_construct', _path) as st:
+				with executor:
+					# the last range runs to the end of the file, so
+					# it ends with the file's own closing tags.
+					_splits = find_item_splits(_path, workers * 4)
+					_result_iter = executor.map(parse_item_range, itertools.repeat(_path),\
+						_splits[:-1], _splits[1:-1] + [None], itertools.repeat(self.metrics),\
+						itertools.repeat(self.blocks), itertools.repeat(self.links))
+					for item_cnt, node_list, seen_cnt, kept_cnt, tree, site_link in _result_iter:
+						_base = self.item_cnt
+						self.tree.extend(tree)
+						self.add_channel('link', site_link)
+						for node in node_list:
+							node.postno += _base
+							node.intern_terms(self.term_dict)
+							self.add_node(node)
+						self.item_cnt += item_cnt
+						if self.stats.enabled:
+							self.stats.add_counts(seen_cnt, kept_cnt)
+				st['items'] = self.item_cnt - _item_cnt
+				
+			if self.stats.enabled:
+				self.stats.add_date_errors(self.date_err_cnt - _date_err_cnt)
+		return st['items']
+		
+	#-------------------------------------------------------------
 	# 
-	#------------------------------------------------------------
+	#-------------------------------------------------------------
 	
+	def load(self, comment_callback=None, checkpoint=None, resume=False) -> int:
+		"""
+		stream the export file into this session, return number
+		of items read.  With a WP_Checkpoint, checkpoints are saved
+		as items are read and, with [resume], the load continues
+		from the last one.
+		"""
+		with self.lock:
+			_date_err_cnt = self.date_err_cnt
+			_item_cnt = self.item_cnt
+			_offset, _item_no = 0, 0
+			if checkpoint is not None:
+				if resume:
+					_offset, _item_no = checkpoint.restore()
+				if not _offset:
+					checkpoint.start()
+					
+			with self.stats.stage('parse_construct', self.xml_path) as st:
+				if checkpoint is None:
+					parse_xml_items(self.xml_path, self.add_item, comment_callback,\
+						channel_callback=self.add_channel)
+				else:
+					def _add_item(item_no, item, end_offset):
+						checkpoint.add(self.add_item(item_no, item), item_no, end_offset)
+					parse_xml_items(self.xml_path, _add_item, comment_callback,\
+						start_offset=_offset, start_item_no=_item_no, with_offsets=True,\
+						channel_callback=self.add_channel)
+					checkpoint.remove()
+				st['items'] = self.item_cnt - _item_cnt
+				
+			if self.stats.enabled:
+				self.stats.add_date_errors(self.date_err_cnt - _date_err_cnt)
+		return st['items']
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-#-------------------------------------------------------------
-# 
-#-------------------------------------------------------------
-
-if __name__ == "__main__":
+	def restore(self, node_list:list, slugs:list, item_cnt:int, tree_rows=(), site_link:str=''):
+		"""
+		reload records and hierarchy rows saved by a WP_Checkpoint.
+		"""
+		from wp_tree import WP_Post_Tree
+		with self.lock:
+			self.tree = WP_Post_Tree()
+			self.tree.add_rows(tree_rows)
+			self.site_link = site_link
+			self.term_dict = WP_Term_Dict()
+			for _slug in slugs:
+				self.term_dict.intern(_slug)
+			self.node_list = []
+			self.node_by_postid = {}
+			self.date_err_cnt = 0
+			for node in node_list:
+				node.term_dict = self.term_dict
+				self.node_list.append(node)
+				self.node_by_postid.setdefault(node.post_id, node)
+				if not node.pub_date:
+					self.date_err_cnt += 1
+			self.item_cnt = item_cnt
+			self.time_index = None
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
+	def sort(self):
+		"""
+		sort the records newest first and index them by publish date.
+		"""
+		with self.lock:
+			srt_node_list = \
+				sorted(self.node_list, key=attrgetter('sort_key'),reverse=True)
+			self.srt_node_list = srt_node_list
+			self.time_index = WP_Time_Index(srt_node_list)
+			
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
 	
-	msg_log_file = make_dt_output_filepath(prefix=__prog__, ext='.log')
+	def sorted_records(self) -> list:
+		"""
+		return records newest first, sorting if needed.
+		"""
+		with self.lock:
+			if self.time_index is None:
+				self.sort()
+			return self.srt_node_list
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	g_msgwr = Message_Writer(name='root',file_path=msg_log_file)
+	def iter_records(self, post_type=None, status=None, newest_first=False):
+		"""
+		yield records, optionally filtered by post type and status,
+		in file order or newest first.  Iterates over a snapshot, so
+		records added meanwhile are not seen.
+		"""
+		with self.lock:
+			if newest_first:
+				_snapshot = tuple(self.sorted_records())
+			else:
+				_snapshot = tuple(self.node_list)
+				
+		for nd in _snapshot:
+			if post_type is not None and nd.post_type != post_type:
+				continue
+			if status is not None and nd.status != status:
+				continue
+			yield nd
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	buffer_msg(f'{LF}program {__file__} started. {LF}')
+	def __iter__(self):
+		return self.iter_records()
+		
+	def __len__(self) -> int:
+		return len(self.node_list)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
+	def get_post_by_postno(self, postno):
+		"""
+		return record by post number.
+		"""
+		with self.lock:
+			for nd in self.node_list:
+				if nd.postno == postno:
+					return nd
+		return None
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+
+	def get_post_by_postid(self, post_id):
+		"""
+		return record by post id.
+		"""
+		with self.lock:
+			return self.node_by_postid.get(post_id)
+			
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
 	
-	main()
+	def range(self, since=None, until=None) -> list:
+		"""
+		return records published from [since] through [until], newest first.
+		"""
+		with self.lock:
+			self.sorted_records()
+			return self.time_index.range(since, until)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
+	def latest(self, n:int, node_list=None, newest_first=False) -> list:
+		"""
+		return the latest [n] records, of [node_list] if given
+		(see WP_Time_Index.latest).
+		"""
+		with self.lock:
+			self.sorted_records()
+			return self.time_index.latest(n, node_list, newest_first)
+			
+	#---------------------------------------------------------------------
+	#
+	#---------------------------------------------------------------------
+					
+	def attach_images_to_parents(self, post_list=None):
+		"""
+		attach image filename(s) to each post instance, or only
+		to the published posts in [post_list] if given.
+		"""
+		with self.lock:
+			_srt_node_list = self.sorted_records()
+			if post_list is None:
+				post_list = _srt_node_list
+			# index attachments by parent and by id once, rather
+			# than scanning them for every post.
+			_by_parent = collections.defaultdict(list)
+			_by_id = collections.defaultdict(list)
+			for a in _srt_node_list:
+				if a.status == 'inherit':
+					_by_parent[a.post_parent].append(a)
+					_by_id[a.post_id].append(a)
+			_publish_list = [p for p in post_list if p.status == 'publish']
+			for p in _publish_list:
+				_att_list = list(_by_parent.get(p.post_id, ()))
+				_att_list += _by_id.get(p.thumbnail_id, ())
+				p.attachments = _att_list
+				_img_set = set()
+				for a in _att_list:
+					_img_set.add(a.attachment_url)
+				p.images = list(_img_set)
+				
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
 	
-	buffer_msg(LF)
-	buffer_msg(f'{LF}program {__file__} completed. {LF}')
+	def output_path(self, suffix:str) -> str:
+		"""
+		return export path with [suffix] (see export_output_path).
+		"""
+		return export_output_path(self.xml_path, suffix)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
 	
-	g_msgwr.shutdown()
-
+	def emit(self, msg_list:list):
+		"""
+		send report messages to the session's writer in one block,
+		or keep them in msg_list if it has none.
+		"""
+		if self.msg_writer is None:
+			self.msg_list += msg_list
+			return
+		with WP_Export_Session.writer_lock:
+			for msg in msg_list:
+				self.msg_writer.buffer_msg(msg)
+				
 	#-------------------------------------------------------------
 	# 
 	#-------------------------------------------------------------
-	
\ No newline at end of file
+
+	def report_and_xlsx(self, since=None, until=None, latest=None, output_writer=None):
+		"""
+		generate report log, report excel file.  [since], [until]
+		restrict output to a publish date window, [latest] to the
+		latest N published posts.  With [output_writer] the excel
+		file is written in the background.
+		"""
+		stats = self.stats
+		_path = self.xml_path
+		
+		with self.lock:
+			if not self.node_list:
+				return
+			
+			with stats.stage('set_srt_node_list', _path) as st:
+				self.sort()
+				st['items'] = len(self.srt_node_list)
+				
+			_windowed = since is not None or until is not None
+			if _windowed:
+				window_list = self.time_index.range(since, until)
+			else:
+				window_list = self.srt_node_list
+			
+			publish_list = [p for p in window_list if p.status == 'publish']
+			attach_list = [a for a in window_list if a.status == 'inherit']
+			
+			if latest is not None:
+				# window_list comes from the index, newest first.
+				publish_list = self.time_index.latest(latest, publish_list, newest_first=True)
+				
+			with stats.stage('attach_images_to_parents', _path) as st:
+				self.attach_images_to_parents(publish_list)
+				st['items'] = len(publish_list)
+			
+			msg_list = []
+			
+			if _windowed or latest is not None:
+				msg_list.append(f'{LF}{LF} Date window: since {since} until {until} latest {latest}: ' + \
+					f'{len(publish_list)} published posts, {len(attach_list)} attachments selected.')
+			
+			with stats.stage('report', _path) as st:
+				msg_list += self.report_msgs(publish_list, attach_list)
+				st['items'] = len(publish_list) + len(attach_list)
+				
+			with stats.stage('term_stats', _path) as st:
+				term_stats = WP_Term_Stats(publish_list, self.term_dict)
+				msg_list += term_stats.report_msgs()
+				st['items'] = len(publish_list)
+				
+			if self.blocks:
+				from wp_blocks import WP_Block_Totals
+				with stats.stage('block_totals', _path) as st:
+					block_totals = WP_Block_Totals(publish_list)
+					msg_list += block_totals.report_msgs()
+					st['items'] = len(publish_list)
+					
+			if self.links:
+				from wp_links import WP_Link_Graph
+				with stats.stage('link_graph', _path) as st:
+					link_graph = WP_Link_Graph(self.srt_node_list, self.tree, self.site_link)
+					msg_list += link_graph.report_msgs()
+					st['items'] = link_graph.link_cnt
+					
+			with stats.stage('hierarchy', _path) as st:
+				self.tree.build()
+				msg_list += self.tree.report_msgs()
+				st['items'] = len(self.tree)
+				
+			with stats.stage('rollup', _path) as st:
+				self.rollup = self.make_rollup(term_stats, [p.sort_key for p in publish_list],\
+					len(attach_list), sum(1 for a in attach_list if not a.post_parent))
+				st['items'] = len(publish_list)
+				
+			if self.metrics:
+				from wp_metrics import WP_Content_Metrics
+				with stats.stage('content_metrics', _path) as st:
+					content_metrics = WP_Content_Metrics(publish_list)
+					msg_list += content_metrics.report_msgs()
+					st['items'] = len(publish_list)
+					
+			self.emit(msg_list)
+				
+			_sheet_list = [(None, self.xlsx_rows(publish_list, self.metrics, self.tree, self.blocks)),\
+				('terms', term_stats.xlsx_rows())]
+			if self.blocks:
+				_sheet_list.append(('blocks', block_totals.xlsx_rows()))
+			if self.links:
+				_sheet_list.append(('links', link_graph.xlsx_rows()))
+			_sheet_list.append(('hierarchy', self.tree.xlsx_rows()))
+			if self.metrics:
+				_sheet_list.append(('metrics', content_metrics.xlsx_rows()))
+				
+			if output_writer is not None:
+				with stats.stage('xlsx_submit', _path) as st:
+					output_writer.submit(_sheet_list, self.output_path('.xlsx'))
+					st['items'] = len(publish_list)
+			else:
+				with stats.stage('list_to_xlsx', _path) as st:
+					sheets_to_xlsx(_sheet_list, self.output_path('.xlsx'))
+					st['items'] = len(publish_list)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def make_rollup(self, term_stats, sort_keys, attach_cnt:int, unattached_cnt:int):
+		"""
+		return the WP_Rollup of this export from its report's
+		term stats, publish [sort_keys] and attachment counts.
+		"""
+		from wp_rollup import WP_Rollup
+		_slug = self.term_dict.slug
+		return WP_Rollup.for_export(self.xml_path, self.item_cnt, self.tree.type_status_cnt(),\
+			sort_keys, attach_cnt, unattached_cnt,\
+			{_slug(i): n for i, n in term_stats.cat_cnt.items()},\
+			{_slug(i): n for i, n in term_stats.tag_cnt.items()})
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def report_msgs(self, publish_list, attach_list) -> list:
+		"""
+		return report log messages for published posts, attachments.
+		"""
+		msg_list = []
+		
+		msg_list.append(f'{LF}{LF}{"*"*80}{LF}')
+		
+		msg_list.append(f'{LF} Report for WP xml path: {self.xml_path}')
+		
+		msg_list.append(f'{LF}{LF} Published Posts: {LF}')
+		
+		for p in publish_list:
+			msg_list.append(f'{LF} {p.as_str()}')
+			
+		#------------------------------------------------------------
+		# 
+		#------------------------------------------------------------
+			
+		msg_list.append(f'{LF}{LF} Attachments: {LF}')
+		
+		for a in attach_list:
+			msg_list.append(f'{LF} {a.as_str()}')
+			
+		return msg_list
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def xlsx_rows(publish_list, metrics=False, tree=None, blocks=False) -> list:
+		"""
+		return excel header and rows for published posts, with
+		block columns if [blocks], content metrics columns if
+		[metrics] and hierarchy columns from WP_Post_Tree [tree]
+		if given.
+		"""
+		return list(WP_Export_Session.iter_xlsx_rows(publish_list, metrics, tree, blocks))
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def iter_xlsx_rows(publish_iter, metrics=False, tree=None, blocks=False):
+		_hdr = WP_Export.as_xlsx_hdr()
+		if blocks:
+			from wp_blocks import WP_Block_Stats
+			_hdr += WP_Block_Stats.as_xlsx_hdr()
+		if metrics:
+			from wp_metrics import WP_Content_Stats
+			_hdr += WP_Content_Stats.as_xlsx_hdr()
+		if tree is not None:
+			_hdr += tree.xlsx_hdr()
+		yield _hdr
+		for p in publish_iter:
+			_row = p.as_xlsx_row()
+			if blocks:
+				_row += p.block_stats.as_xlsx_row()
+			if metrics:
+				_row += p.content_stats.as_xlsx_row()
+			if tree is not None:
+				_row += tree.xlsx_cols(p.post_id)
+			yield _row
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def close(self):
+		"""
+		release the session's records.
+		"""
+		from wp_tree import WP_Post_Tree
+		with self.lock:
+			self.node_list = []
+			self.srt_node_list = []
+			self.time_index = None
+			self.node_by_postid = {}
+			self.term_dict = WP_Term_Dict()
+			self.tree = WP_Post_Tree()
+			
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Comment_Stats:
+	"""
+	Per-post comment counters, filled one comment at a time
+	so comments never have to be held in memory.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self):
+		self.comment_cnt = 0
+		self.approved_cnt = 0
+		self.pending_cnt = 0
+		self.spam_cnt = 0
+		self.other_cnt = 0
+		self.commenter_set = set()
+		self.first_date = ''
+		self.last_date = ''
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add(self, comment:dict):
+		"""
+		count one parsed wp:comment dict.
+		"""
+		self.comment_cnt += 1
+		
+		_approved = comment.get('wp:comment_approved')
+		if _approved == '1':
+			self.approved_cnt += 1
+		elif _approved == '0':
+			self.pending_cnt += 1
+		elif _approved == 'spam':
+			self.spam_cnt += 1
+		else:
+			self.other_cnt += 1
+			
+		# commenters are kept as hashes, not strings.
+		_who = comment.get('wp:comment_author_email') or comment.get('wp:comment_author') or ''
+		self.commenter_set.add(hash(str(_who).lower()))
+		
+		_date = comment.get('wp:comment_date_gmt') or comment.get('wp:comment_date') or ''
+		if _date:
+			if not self.first_date or _date < self.first_date:
+				self.first_date = _date
+			if _date > self.last_date:
+				self.last_date = _date
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@property
+	def commenter_cnt(self) -> int:
+		return len(self.commenter_set)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def as_str(self) -> str:
+		return f'{self.comment_cnt} ({self.approved_cnt} approved, {self.pending_cnt} pending, ' + \
+			f'{self.spam_cnt} spam), {self.commenter_cnt} commenter(s), ' + \
+			f'first {self.first_date} last {self.last_date}'
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def as_xlsx_row(self) -> list:
+		return [self.comment_cnt, self.approved_cnt, self.pending_cnt, self.spam_cnt,\
+			self.commenter_cnt, self.first_date, self.last_date]
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def as_xlsx_hdr() -> list:
+		return ['#comments','#approved','#pending','#spam','#commenters','first comment','last comment']
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __repr__(self) -> str:
+		return self.as_str()
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Comment_Writer:
+	"""
+	Stream comments to a csv file as they are parsed.
+	"""
+	
+	fields = ['wp:comment_id','wp:comment_parent','wp:comment_date_gmt',\
+		'wp:comment_approved','wp:comment_type','wp:comment_author',\
+		'wp:comment_author_email','wp:comment_author_url','wp:comment_content']
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, csv_path:str, append=False):
+		import csv
+		self.csv_path = csv_path
+		self.comment_cnt = 0
+		if append and os.path.exists(csv_path):
+			self.fd = open(csv_path, 'a', encoding='utf-8', newline='')
+			self.writer = csv.writer(self.fd)
+		else:
+			self.fd = open(csv_path, 'w', encoding='utf-8', newline='')
+			self.writer = csv.writer(self.fd)
+			self.writer.writerow(['post_id'] + [f.split(':',1)[1] for f in WP_Comment_Writer.fields])
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def write(self, post_id, comment:dict):
+		self.writer.writerow([post_id] + [comment.get(f) or '' for f in WP_Comment_Writer.fields])
+		self.comment_cnt += 1
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def flush(self) -> int:
+		"""
+		flush to disk, return file size.
+		"""
+		self.fd.flush()
+		os.fsync(self.fd.fileno())
+		return os.path.getsize(self.csv_path)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def truncate(self, size:int):
+		"""
+		cut the file back to [size] bytes, as at a checkpoint.
+		"""
+		self.fd.flush()
+		os.truncate(self.csv_path, size)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def close(self):
+		self.fd.close()
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Term_Dict:
+	"""
+	Term dictionary of one export session.  Maps each category/tag
+	slug to a small int id so posts hold compact int arrays instead
+	of lists of strings.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self):
+		self.slug_to_id = {}
+		self.id_to_slug = []
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def intern(self, slug:str) -> int:
+		"""
+		return id for [slug], adding it if new.
+		"""
+		_id = self.slug_to_id.get(slug)
+		if _id is None:
+			_id = len(self.id_to_slug)
+			self.id_to_slug.append(slug)
+			self.slug_to_id[slug] = _id
+		return _id
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def slug(self, term_id:int) -> str:
+		return self.id_to_slug[term_id]
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def slugs(self, term_ids) -> list:
+		_slugs = self.id_to_slug
+		return [_slugs[i] for i in term_ids]
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __len__(self) -> int:
+		return len(self.id_to_slug)
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Term_Stats:
+	"""
+	Category/tag frequency, per-month counts and tag co-occurrence
+	for posts, aggregated with Counters over term ids.  Posts may
+	be given as a list or iterable, or added one at a time.
+	"""
+	
+	top_n = 20
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, post_list, term_dict:WP_Term_Dict):
+		self.term_dict = term_dict
+		self.post_cnt = 0
+		self.cat_cnt = Counter()
+		self.tag_cnt = Counter()
+		self.cat_month_cnt = Counter()
+		self.tag_month_cnt = Counter()
+		self.tag_pair_cnt = Counter()
+		
+		for p in post_list:
+			self.add(p)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add(self, p):
+		self.post_cnt += 1
+		_month = p.sort_key[:6]
+		_cat_ids = p.category_ids
+		_tag_ids = p.tag_ids
+		self.cat_cnt.update(_cat_ids)
+		self.tag_cnt.update(_tag_ids)
+		self.cat_month_cnt.update((_month, i) for i in _cat_ids)
+		self.tag_month_cnt.update((_month, i) for i in _tag_ids)
+		if len(_tag_ids) > 1:
+			self.tag_pair_cnt.update(itertools.combinations(sorted(set(_tag_ids)), 2))
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def report_msgs(self) -> list:
+		"""
+		return term summary report messages.
+		"""
+		_slug = self.term_dict.slug
+		_top = WP_Term_Stats.top_n
+		msg_list = []
+		
+		msg_list.append(f'{LF}{LF} Term Summary: {self.post_cnt} published posts, ' + \
+			f'{len(self.cat_cnt)} categories, {len(self.tag_cnt)} tags used. {LF}')
+		
+		msg_list.append(f'{LF} Top categories: ')
+		for i, n in self.cat_cnt.most_common(_top):
+			msg_list.append(f'{LF}  {n:6d}  {_slug(i)}')
+			
+		msg_list.append(f'{LF}{LF} Top tags: ')
+		for i, n in self.tag_cnt.most_common(_top):
+			msg_list.append(f'{LF}  {n:6d}  {_slug(i)}')
+			
+		msg_list.append(f'{LF}{LF} Top tag pairs: ')
+		for (a, b), n in self.tag_pair_cnt.most_common(_top):
+			msg_list.append(f'{LF}  {n:6d}  {_slug(a)} + {_slug(b)}')
+			
+		_month_posts = Counter()
+		_month_terms = Counter()
+		for (m, _), n in self.cat_month_cnt.items():
+			_month_posts[m] += n
+		for (m, _), n in self.tag_month_cnt.items():
+			_month_terms[m] += n
+			
+		msg_list.append(f'{LF}{LF} Category / tag assignments per month: ')
+		for m in sorted(set(_month_posts) | set(_month_terms), reverse=True):
+			msg_list.append(f'{LF}  {m[:4]}-{m[4:]}  {_month_posts[m]:6d}  {_month_terms[m]:6d}')
+			
+		return msg_list
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def xlsx_hdr() -> list:
+		return ['measure','term type','term','other term','month','count']
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def xlsx_rows(self) -> list:
+		"""
+		return excel header and long-format rows for the terms sheet.
+		"""
+		_slug = self.term_dict.slug
+		xlsx_list = [WP_Term_Stats.xlsx_hdr()]
+		
+		for i, n in self.cat_cnt.most_common():
+			xlsx_list.append(['frequency','category',_slug(i),'','',n])
+		for i, n in self.tag_cnt.most_common():
+			xlsx_list.append(['frequency','tag',_slug(i),'','',n])
+			
+		for (m, i), n in sorted(self.cat_month_cnt.items(), reverse=True):
+			xlsx_list.append(['month','category',_slug(i),'',f'{m[:4]}-{m[4:]}',n])
+		for (m, i), n in sorted(self.tag_month_cnt.items(), reverse=True):
+			xlsx_list.append(['month','tag',_slug(i),'',f'{m[:4]}-{m[4:]}',n])
+			
+		for (a, b), n in self.tag_pair_cnt.most_common():
+			xlsx_list.append(['co-occurrence','tag',_slug(a),_slug(b),'',n])
+			
+		return xlsx_list
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Time_Index:
+	"""
+	Publish-time index over a sort_key ordered node list.
+	Keys are sort_key values as int (YYYYmmddHHMMSS), held in
+	ascending order for bisect range queries.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, srt_node_list:list):
+		# srt_node_list is sorted newest first.
+		self.node_list = list(reversed(srt_node_list))
+		self.key_list = [WP_Time_Index.node_key(nd) for nd in self.node_list]
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def node_key(node) -> int:
+		_key = node.sort_key
+		if _key:
+			return int(_key)
+		return 0
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def date_key(value, end=False):
+		"""
+		return int key for a date given as datetime, date or str
+		'YYYY-MM-DD[ HH:MM[:SS]]'.  A bare date with [end] set
+		covers the whole day.  None stays None.
+		"""
+		if value is None:
+			return None
+		if isinstance(value, datetime.datetime):
+			return int(value.strftime('%Y%m%d%H%M%S'))
+		if isinstance(value, datetime.date):
+			_time = '235959' if end else '000000'
+			return int(value.strftime('%Y%m%d') + _time)
+		_str = str(value).strip()
+		for _fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M'):
+			try:
+				return WP_Time_Index.date_key(datetime.datetime.strptime(_str, _fmt))
+			except ValueError:
+				pass
+		return WP_Time_Index.date_key(datetime.datetime.strptime(_str, '%Y-%m-%d').date(), end)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def range(self, since=None, until=None) -> list:
+		"""
+		return nodes published from [since] through [until]
+		(inclusive, either may be None), newest first.
+		"""
+		_lo_key = WP_Time_Index.date_key(since)
+		_hi_key = WP_Time_Index.date_key(until, end=True)
+		
+		lo = 0
+		hi = len(self.key_list)
+		if _lo_key is not None:
+			lo = bisect.bisect_left(self.key_list, _lo_key)
+		if _hi_key is not None:
+			hi = bisect.bisect_right(self.key_list, _hi_key)
+		
+		ret_list = self.node_list[lo:hi]
+		ret_list.reverse()
+		return ret_list
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def latest(self, n:int, node_list=None, newest_first=False) -> list:
+		"""
+		return latest [n] nodes, newest first.  Without [node_list]
+		this slices the index, as it does a [node_list] already
+		[newest_first] (e.g. taken from the index); otherwise it
+		selects from node_list with a bounded heap instead of
+		sorting it.
+		"""
+		if n <= 0:
+			return []
+		if node_list is None:
+			ret_list = self.node_list[-n:]
+			ret_list.reverse()
+			return ret_list
+		if newest_first:
+			return node_list[:n]
+		return heapq.nlargest(n, node_list, key=WP_Time_Index.node_key)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __len__(self) -> int:
+		return len(self.key_list)
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Run_Stats:
+	"""
+	Optional run instrumentation: per-stage timings (via Stage_Timer)
+	and item counters.  When not enabled the stages are no-ops and
+	nothing is counted.  Counters may be shared by sessions running
+	in threads; peak memory is process-wide.
+	"""
+	
+	disabled = None
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, enabled=False, trace_memory=True):
+		self.enabled = enabled
+		self.lock = threading.Lock()
+		self.timer = Stage_Timer(enabled=enabled, trace_memory=trace_memory)
+		self.seen_cnt = Counter()
+		self.kept_cnt = Counter()
+		self.date_err_cnt = 0
+		self.started = datetime.datetime.now()
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def stage(self, name, path=''):
+		"""
+		return context manager timing stage [name] for file [path].
+		"""
+		return self.timer.stage(name, file=str(path))
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def count_item(self, post_type, kept):
+		with self.lock:
+			self.seen_cnt[post_type] += 1
+			if kept:
+				self.kept_cnt[post_type] += 1
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add_date_errors(self, n):
+		with self.lock:
+			self.date_err_cnt += n
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add_counts(self, seen_cnt:Counter, kept_cnt:Counter):
+		with self.lock:
+			self.seen_cnt.update(seen_cnt)
+			self.kept_cnt.update(kept_cnt)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def stage_totals(self) -> dict:
+		"""
+		return stage timings summed over all files, keyed by stage name.
+		"""
+		totals = {}
+		for st in self.timer.stage_list:
+			t = totals.setdefault(st['name'],\
+				{'name': st['name'], 'items': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mem_kb': 0.0})
+			t['items'] += st['items']
+			t['wall_s'] += st['wall_s']
+			t['cpu_s'] += st['cpu_s']
+			t['peak_mem_kb'] = max(t['peak_mem_kb'], st.get('peak_mem_kb', 0.0))
+		for t in totals.values():
+			t['items_per_s'] = t['items'] / t['wall_s'] if t['wall_s'] > 0 else 0.0
+		return totals
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def as_dict(self) -> dict:
+		d = {}
+		d['program'] = 'wp_xml_export_extract'
+		d['version'] = __version__
+		d['started'] = self.started.isoformat(timespec='seconds')
+		d['stages'] = self.timer.as_dict_list()
+		d['stage_totals'] = list(self.stage_totals().values())
+		d['post_types'] = {k: {'seen': v, 'kept': self.kept_cnt[k]}\
+			for k, v in sorted(self.seen_cnt.items())}
+		d['date_parse_failures'] = self.date_err_cnt
+		return d
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def as_str(self) -> str:
+		retstr = f'{LF}{LF} Stage timings (all files):'
+		retstr += f'{LF} {"stage":<26} {"wall s":>10} {"cpu s":>10} {"items":>10} {"items/s":>12} {"peak KB":>12}'
+		for t in self.stage_totals().values():
+			retstr += f'{LF} {t["name"]:<26} {t["wall_s"]:10.4f} {t["cpu_s"]:10.4f} ' + \
+				f'{t["items"]:10d} {t["items_per_s"]:12.1f} {t["peak_mem_kb"]:12.1f}'
+		retstr += f'{LF}{LF} Items seen / kept by post type:'
+		for k, v in sorted(self.seen_cnt.items()):
+			retstr += f'{LF}  {k}: {v} / {self.kept_cnt[k]}'
+		retstr += f'{LF}{LF} Date parse failures: {self.date_err_cnt}'
+		return retstr
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def write_json(self, json_path):
+		import json
+		with open(json_path, 'w', encoding='utf-8') as fd:
+			json.dump(self.as_dict(), fd, indent=2)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __repr__(self) -> str:
+		return self.as_str()
+		
+WP_Run_Stats.disabled = WP_Run_Stats(enabled=False)
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def parse_xml_items(path, item_callback, comment_callback=None,\
+	start_offset=0, start_item_no=0, with_offsets=False, end_offset=None,\
+	channel_callback=None) -> int:
+	"""
+	stream the items of a WP export xml file to
+	item_callback(item_no, item), one item at a time.  The file
+	may be compressed or a zip member (see open_stream).
+	
+	Comments are taken out of each item as they are parsed:
+	they are counted into a WP_Comment_Stats stored in the item
+	under '_comment_stats', and passed to
+	comment_callback(post_id, comment) if given.  Parsing stops
+	early if item_callback returns False.  The channel's own
+	elements (title, link, ...) go to channel_callback(key, value)
+	if given.
+	
+	With [with_offsets] the callback is
+	item_callback(item_no, item, end_offset), end_offset being
+	the byte offset just past the item's </item> tag.  Passing
+	such an offset back as [start_offset], with the item's number
+	as [start_item_no], resumes parsing after that item; another
+	such offset as [end_offset] stops after the item ending there.
+	Return number of the last item read.
+	"""
+	# single category or postmeta elements would otherwise
+	# come back from xmltodict as a dict instead of a list.
+	_force_list = ('category', 'wp:postmeta')
+	
+	state = {'item_no': start_item_no, 'post_id': 0, 'comments': WP_Comment_Stats(),\
+		'parser': None}
+		
+	def _parser_create(*args, **kwargs):
+		state['parser'] = expat.ParserCreate(*args, **kwargs)
+		return state['parser']
+		
+	# xmltodict creates the expat parser itself; handing it this
+	# stand-in module lets us read the parser's byte position.
+	_expat = types.SimpleNamespace(ParserCreate=_parser_create)
+	_base = start_offset - len(RESUME_PREFIX) if start_offset else 0
+	
+	def _postprocessor(xml_path, key, value):
+		if len(xml_path) == 4:
+			if key == 'wp:comment':
+				if value is not None:
+					state['comments'].add(value)
+					if comment_callback is not None:
+						comment_callback(state['post_id'], value)
+				return None
+			if key == 'wp:post_id':
+				state['post_id'] = value
+		return key, value
+		
+	def _item_callback(xml_path, item):
+		if xml_path[-1][0] != 'item':
+			if channel_callback is not None:
+				channel_callback(xml_path[-1][0], item)
+			return True
+		if item is None:
+			item = {}
+		state['item_no'] += 1
+		item['_comment_stats'] = state['comments']
+		state['comments'] = WP_Comment_Stats()
+		state['post_id'] = 0
+		if with_offsets:
+			_end_offset = _base + state['parser'].CurrentByteIndex + len(ITEM_END_TAG)
+			return item_callback(state['item_no'], item, _end_offset) is not False
+		return item_callback(state['item_no'], item) is not False
+
+	import xmltodict
+	
+	with open_stream(path) as fd:
+		_input = fd
+		if start_offset or end_offset is not None:
+			_input = resume_chunks(fd, start_offset, end_offset)
+		try:
+			xmltodict.parse(_input, item_depth=3, item_callback=_item_callback,\
+				postprocessor=_postprocessor, force_list=_force_list, expat=_expat)
+		except xmltodict.ParsingInterrupted:
+			pass
+		
+	return state['item_no']
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def export_output_path(xml_path, suffix:str) -> str:
+	"""
+	return export path with its .xml extension replaced by
+	[suffix].  A compressed export keeps its compression in the
+	name (site.xml.gz: site_gz), so it does not share output
+	with a plain copy.  Output for a zip member goes next to
+	the zip file, named after the zip and the member's folders
+	(archive.zip/sub/a.xml: archive_sub_a).
+	"""
+	_zip_path, _member = split_zip_path(xml_path)
+	if _member is not None:
+		_path = os.path.splitext(_zip_path)[0] + '_' + _member.replace('/', '_')
+	else:
+		_path = _zip_path
+	_root = strip_stream_ext(_path)
+	_ext = _path[len(_root):].lower()
+	if _root.lower().endswith('.xml'):
+		_root = _root[:-4]
+	if _ext:
+		_root += '_' + _ext[1:]
+	return _root + suffix
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def resume_chunks(fd, start_offset:int, end_offset:int=None, chunk_size:int=1 << 20):
+	"""
+	yield the export bytes following the </item> tag that ends
+	at [start_offset] (from the start of the file if 0), up to
+	[end_offset] if given.  Stand-in <rss><channel> tags wrap a
+	range cut out of the middle of the file.
+	"""
+	if start_offset:
+		fd.seek(start_offset - len(ITEM_END_TAG))
+		if fd.read(len(ITEM_END_TAG)) != ITEM_END_TAG:
+			raise ValueError(f'no </item> tag ends at byte {start_offset}')
+		yield RESUME_PREFIX
+		
+	_left = None
+	if end_offset is not None:
+		_left = end_offset - start_offset
+	while _left is None or _left > 0:
+		chunk = fd.read(chunk_size if _left is None else min(chunk_size, _left))
+		if not chunk:
+			break
+		if _left is not None:
+			_left -= len(chunk)
+		yield chunk
+		
+	if end_offset is not None:
+		yield RESUME_SUFFIX
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def in_markup_section(mm, pos:int) -> bool:
+	"""
+	return True if byte [pos] of [mm] lies inside a CDATA
+	section or xml comment.  A section ends at the first
+	terminator after its start, so only the nearest start
+	before [pos] needs checking.
+	"""
+	for _start, _end in ((b'<![CDATA[', b']]>'), (b'<!--', b'-->')):
+		_open = mm.rfind(_start, 0, pos)
+		if _open >= 0 and mm.find(_end, _open + len(_start), pos) < 0:
+			return True
+	return False
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def find_item_splits(path, parts:int) -> list:
+	"""
+	return byte offsets [0, ..., file size] cutting a plain
+	export file into up to [parts] ranges of whole items.  Each
+	inner offset is just past an </item> tag that is not inside
+	CDATA or a comment.  The file is memory-mapped, not read.
+	"""
+	import mmap
+	_size = os.path.getsize(path)
+	splits = [0]
+	if parts < 2 or _size == 0:
+		return splits + [_size]
+		
+	with open(path, 'rb') as fd:
+		with mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+			for k in range(1, parts):
+				_pos = max(_size * k // parts, splits[-1])
+				_split = -1
+				while _split < 0:
+					_idx = mm.find(ITEM_END_TAG, _pos)
+					if _idx < 0:
+						break
+					if in_markup_section(mm, _idx):
+						_pos = _idx + 1
+					else:
+						_split = _idx + len(ITEM_END_TAG)
+				if _split < 0:
+					break
+				if _split > splits[-1]:
+					splits.append(_split)
+					
+	if splits[-1] != _size:
+		splits.append(_size)
+	return splits
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def parse_item_range(xml_path, start_offset:int, end_offset:int, metrics=False,\
+	blocks=False, links=False) -> tuple:
+	"""
+	build the records of the items between two offsets from
+	find_item_splits, for WP_Export_Session.load_parallel, with
+	the session's [metrics], [blocks] and [links] options.
+	Return (items read, records, Counter of post types seen,
+	Counter of post types kept, WP_Post_Tree of the range,
+	channel <link> or '' if the range does not start the file).
+	Records are numbered from 1.
+	"""
+	stats = WP_Run_Stats(enabled=True, trace_memory=False)
+	session = WP_Export_Session(xml_path, stats=stats)
+	session.metrics, session.blocks, session.links = metrics, blocks, links
+	item_cnt = parse_xml_items(xml_path, session.add_item,\
+		start_offset=start_offset, end_offset=end_offset, channel_callback=session.add_channel)
+	return item_cnt, session.node_list, stats.seen_cnt, stats.kept_cnt, session.tree,\
+		session.site_link
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def read_xml_items(path) -> list:
+	"""
+	return list of item dicts from a WP export xml file.
+	"""
+	item_list = []
+	
+	def _add_item(item_no, item):
+		item_list.append(item)
+		
+	parse_xml_items(path, _add_item)
+		
+	return item_list
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Preview:
+	"""
+	Shape of the start of an export: item counts by post type
+	and status, the publish date span and the first few records,
+	read until an item, byte or time budget runs out.  Parsing
+	stops there, so the rest of the file is never read.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, xml_path, max_items:int=None, max_bytes:int=None, max_seconds:float=None,\
+		sample:int=3):
+		self.xml_path = xml_path
+		self.max_items = max_items			# matching (kept post type) items
+		self.max_bytes = max_bytes			# bytes of (decompressed) xml parsed
+		self.max_seconds = max_seconds
+		self.sample = sample
+		
+		self.term_dict = WP_Term_Dict()
+		self.type_cnt = Counter()
+		self.status_cnt = Counter()
+		self.seen_cnt = 0
+		self.match_cnt = 0
+		self.byte_cnt = 0
+		self.first_key = ''
+		self.last_key = ''
+		self.sample_list = []
+		self.stop_reason = 'end of export'
+		self.started = None
+		self.elapsed = 0.0
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add(self, item_no:int, item:dict, end_offset:int) -> bool:
+		"""
+		parse_xml_items callback: count one item, return False
+		once a budget is used up.
+		"""
+		self.seen_cnt += 1
+		self.byte_cnt = end_offset
+		_none = WP_Export.none_str
+		_type = item.get('wp:post_type', _none)
+		self.type_cnt[_type] += 1
+		self.status_cnt[item.get('wp:status', _none)] += 1
+		
+		if _type in WP_Export_Session.keep_post_types:
+			self.match_cnt += 1
+			p = WP_Export(item_no, item, self.xml_path, self.term_dict)
+			if p.sort_key:
+				if not self.first_key or p.sort_key < self.first_key:
+					self.first_key = p.sort_key
+				if p.sort_key > self.last_key:
+					self.last_key = p.sort_key
+			if len(self.sample_list) < self.sample:
+				self.sample_list.append(p.as_str())
+				
+		if self.max_items is not None and self.match_cnt >= self.max_items:
+			self.stop_reason = f'{self.max_items} item budget'
+			return False
+		if self.max_bytes is not None and end_offset >= self.max_bytes:
+			self.stop_reason = f'{self.max_bytes} byte budget'
+			return False
+		if self.max_seconds is not None and time.perf_counter() - self.started >= self.max_seconds:
+			self.stop_reason = f'{self.max_seconds} s time budget'
+			return False
+		return True
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def read(self):
+		self.started = time.perf_counter()
+		parse_xml_items(self.xml_path, self.add, with_offsets=True)
+		self.elapsed = time.perf_counter() - self.started
+		return self
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def report_msgs(self) -> list:
+		_file_size = os.stat(split_zip_path(self.xml_path)[0]).st_size
+		_plain = split_zip_path(self.xml_path)[1] is None and strip_stream_ext(self.xml_path) == str(self.xml_path)
+		
+		msg_list = []
+		msg_list.append(f'{LF}{LF}{"*"*80}{LF}{LF} Preview of WP xml path: {self.xml_path}')
+		msg_list.append(f'{LF}{LF} Stopped at {self.stop_reason} after {self.elapsed:.3f} s: ' + \
+			f'{self.seen_cnt} items seen, {self.match_cnt} post/attachment items, ' + \
+			f'{self.byte_cnt} xml bytes parsed (file size {_file_size}).')
+		if _plain and self.byte_cnt and self.stop_reason != 'end of export':
+			_est = round(self.seen_cnt * _file_size / self.byte_cnt)
+			msg_list.append(f'{LF} About {_est} items in the whole file at this rate.')
+		if self.first_key:
+			_fmt = lambda k: f'{k[:4]}-{k[4:6]}-{k[6:8]}'
+			msg_list.append(f'{LF} Published {_fmt(self.first_key)} through {_fmt(self.last_key)}.')
+			
+		msg_list.append(f'{LF}{LF} Post types (items): ')
+		for name, n in self.type_cnt.most_common():
+			msg_list.append(f'{LF}  {n:8d}  {name}')
+		msg_list.append(f'{LF}{LF} Status (items): ')
+		for name, n in self.status_cnt.most_common():
+			msg_list.append(f'{LF}  {n:8d}  {name}')
+			
+		msg_list.append(f'{LF}{LF} First {len(self.sample_list)} record(s): {LF}')
+		msg_list += self.sample_list
+		return msg_list
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def preview_xml_file(path, max_items:int=None, max_bytes:int=None, max_seconds:float=None,\
+	sample:int=3, msg_writer=None) -> WP_Preview:
+	"""
+	preview the start of one export file (see WP_Preview),
+	report it and return the WP_Preview.  No excel file is
+	written.
+	"""
+	if msg_writer is None:
+		msg_writer = g_msgwr
+	preview = WP_Preview(path, max_items, max_bytes, max_seconds, sample).read()
+	for msg in preview.report_msgs():
+		msg_writer.buffer_msg(msg)
+	return preview
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Spill_Session(WP_Export_Session):
+	"""
+	Bounded-memory export session for exports larger than RAM.
+	Records are stripped of their raw item and content and spilled
+	to sorted temporary runs (External_Sorter) instead of being
+	kept; the report streams a k-way merge of the runs in sort_key
+	order, and images are joined to their posts by sort-merge
+	joins on post id.  Buffers are limited to [memory_budget]
+	bytes in all.  The link graph and post hierarchy need every
+	record in memory, so they are not built: the report says so,
+	and the excel file has no links or hierarchy sheets or
+	hierarchy columns.  Otherwise the report and excel file are
+	the same as from WP_Export_Session.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, xml_path, msg_writer=None, stats=None, memory_budget:int=64 << 20,\
+		tmpdir=None):
+		from wp_tree import WP_Item_Counts
+		super().__init__(xml_path, msg_writer, stats)
+		self.tree = WP_Item_Counts()
+		self.tmpdir = tmpdir
+		# at most three sorters fill at a time.
+		self.sorter_budget = max(1 << 20, memory_budget // 3)
+		self.record_cnt = 0
+		self.sorter_list = []
+		self.record_sorter = self.new_sorter(WP_Spill_Session.srt_rank)
+		self.parent_sorter = self.new_sorter(itemgetter(0))	# (post_parent, rank, url)
+		self.attach_sorter = self.new_sorter(itemgetter(0))	# (post_id, rank, url)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def new_sorter(self, key) -> External_Sorter:
+		sorter = External_Sorter(key, self.sorter_budget, self.tmpdir)
+		self.sorter_list.append(sorter)
+		return sorter
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def srt_rank(node) -> tuple:
+		"""
+		return ascending key giving WP_Export_Session.sort order:
+		newest first, file order among equal dates.
+		"""
+		return (-WP_Time_Index.node_key(node), node.postno)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add_node(self, node):
+		with self.lock:
+			self.record_cnt += 1
+			if not node.pub_date:
+				self.date_err_cnt += 1
+			node.item = {}
+			node.content = ''
+			node.link_urls = ()
+			if node.status == 'inherit':
+				_rank = WP_Spill_Session.srt_rank(node)
+				self.parent_sorter.add((node.post_parent, _rank, node.attachment_url))
+				self.attach_sorter.add((node.post_id, _rank, node.attachment_url))
+			self.record_sorter.add(node)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __len__(self) -> int:
+		return self.record_cnt
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def iter_records(self, post_type=None, status=None, newest_first=True):
+		"""
+		yield records newest first, streamed from the spilled runs.
+		"""
+		_term_dict = self.term_dict
+		for nd in self.record_sorter:
+			if post_type is not None and nd.post_type != post_type:
+				continue
+			if status is not None and nd.status != status:
+				continue
+			nd.term_dict = _term_dict
+			yield nd
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def iter_window(self, since=None, until=None, latest=None):
+		"""
+		yield (record, selected) newest first, selected being
+		'publish' or 'inherit' for records in the date window
+		(and among the [latest] published), else None.
+		"""
+		_lo_key = WP_Time_Index.date_key(since)
+		_hi_key = WP_Time_Index.date_key(until, end=True)
+		_pub_cnt = 0
+		for nd in self.iter_records():
+			_key = WP_Time_Index.node_key(nd)
+			_selected = None
+			if (_lo_key is None or _key >= _lo_key) and (_hi_key is None or _key <= _hi_key):
+				if nd.status == 'publish':
+					if latest is None or _pub_cnt < latest:
+						_pub_cnt += 1
+						_selected = 'publish'
+				elif nd.status == 'inherit':
+					_selected = 'inherit'
+			yield nd, _selected
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	@staticmethod
+	def merge_join(post_iter, attach_iter, phase:int, out_sorter:External_Sorter):
+		"""
+		sort-merge join (id, post rank) with (id, attachment rank,
+		url), both ordered by id, adding
+		((post rank, phase, attachment rank), url) to [out_sorter].
+		"""
+		_attach = next(attach_iter, None)
+		for _id, _group in itertools.groupby(post_iter, key=itemgetter(0)):
+			_rank_list = [_rank for _, _rank in _group]
+			while _attach is not None and _attach[0] < _id:
+				_attach = next(attach_iter, None)
+			while _attach is not None and _attach[0] == _id:
+				for _rank in _rank_list:
+					out_sorter.add(((_rank, phase, _attach[1]), _attach[2]))
+				_attach = next(attach_iter, None)
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def iter_with_images(self, since, until, latest, image_sorter, kind):
+		"""
+		yield selected records of [kind] newest first, published
+		posts with images set from [image_sorter].
+		"""
+		_image_iter = iter(image_sorter)
+		_image = next(_image_iter, None)
+		for nd, _selected in self.iter_window(since, until, latest):
+			if _selected != kind:
+				continue
+			if kind == 'publish':
+				_rank = WP_Spill_Session.srt_rank(nd)
+				_img_set = set()
+				while _image is not None and _image[0][0] <= _rank:
+					if _image[0][0] == _rank:
+						_img_set.add(_image[1])
+					_image = next(_image_iter, None)
+				nd.images = list(_img_set)
+			yield nd
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def emit_iter(self, msg_iter, flush_every:int=1000):
+		"""
+		send report messages to the session's writer as one block,
+		flushing the writer's buffer to its file as it goes.
+		"""
+		if self.msg_writer is None:
+			self.msg_list.extend(msg_iter)
+			return
+		_flush = getattr(self.msg_writer, 'write_messages_from_buffer', None)
+		with WP_Export_Session.writer_lock:
+			for i, msg in enumerate(msg_iter, start=1):
+				self.msg_writer.buffer_msg(msg)
+				if _flush is not None and i % flush_every == 0:
+					_flush()
+					
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+
+	def report_and_xlsx(self, since=None, until=None, latest=None, output_writer=None):
+		"""
+		generate report log, report excel file as
+		WP_Export_Session.report_and_xlsx does, streaming records
+		from the spilled runs.  The excel file is always written
+		here, not by [output_writer].
+		"""
+		stats = self.stats
+		_path = self.xml_path
+		
+		with self.lock:
+			if not self.record_cnt:
+				return
+				
+			post_sorter = self.new_sorter(itemgetter(0))	# (post_id, rank)
+			thumb_sorter = self.new_sorter(itemgetter(0))	# (thumbnail_id, rank)
+			image_sorter = self.new_sorter(itemgetter(0))	# ((rank, phase, rank), url)
+			
+			with stats.stage('spill_merge_select', _path) as st:
+				term_stats = WP_Term_Stats((), self.term_dict)
+				block_totals = None
+				if self.blocks:
+					from wp_blocks import WP_Block_Totals
+					block_totals = WP_Block_Totals()
+				content_metrics = None
+				if self.metrics:
+					from wp_metrics import WP_Content_Metrics
+					content_metrics = WP_Content_Metrics()
+				_pub_cnt = 0
+				_attach_cnt = 0
+				_unattached_cnt = 0
+				_first_key, _last_key = '', ''	# publish date span (records come newest first)
+				for nd, _selected in self.iter_window(since, until, latest):
+					if _selected == 'publish':
+						_pub_cnt += 1
+						_rank = WP_Spill_Session.srt_rank(nd)
+						post_sorter.add((nd.post_id, _rank))
+						# post id 0 is never an attachment's.
+						if nd.thumbnail_id:
+							thumb_sorter.add((nd.thumbnail_id, _rank))
+						term_stats.add(nd)
+						if block_totals is not None:
+							block_totals.add(nd.block_stats)
+						if content_metrics is not None:
+							content_metrics.add(nd)
+						if nd.sort_key:
+							_last_key = _last_key or nd.sort_key
+							_first_key = nd.sort_key
+					elif _selected == 'inherit':
+						_attach_cnt += 1
+						if not nd.post_parent:
+							_unattached_cnt += 1
+				st['items'] = self.record_cnt
+				
+			with stats.stage('attach_join', _path) as st:
+				WP_Spill_Session.merge_join(iter(post_sorter), iter(self.parent_sorter), 0, image_sorter)
+				WP_Spill_Session.merge_join(iter(thumb_sorter), iter(self.attach_sorter), 1, image_sorter)
+				st['items'] = len(image_sorter)
+				
+			with stats.stage('rollup', _path) as st:
+				self.rollup = self.make_rollup(term_stats, (_first_key, _last_key), _attach_cnt, _unattached_cnt)
+				st['items'] = _pub_cnt
+				
+			_windowed = since is not None or until is not None
+			
+			def _msg_iter():
+				if _windowed or latest is not None:
+					yield f'{LF}{LF} Date window: since {since} until {until} latest {latest}: ' + \
+						f'{_pub_cnt} published posts, {_attach_cnt} attachments selected.'
+				yield f'{LF}{LF}{"*"*80}{LF}'
+				yield f'{LF} Report for WP xml path: {_path}'
+				yield f'{LF}{LF} Published Posts: {LF}'
+				for p in self.iter_with_images(since, until, latest, image_sorter, 'publish'):
+					yield f'{LF} {p.as_str()}'
+				yield f'{LF}{LF} Attachments: {LF}'
+				for a in self.iter_with_images(since, until, latest, image_sorter, 'inherit'):
+					yield f'{LF} {a.as_str()}'
+				yield from term_stats.report_msgs()
+				if block_totals is not None:
+					yield from block_totals.report_msgs()
+				yield f'{LF}{LF} Link graph and hierarchy: not built under --memory-budget ' + \
+					f'(they keep every post in memory); run without it for the links and hierarchy sheets.'
+				if self.metrics:
+					yield from content_metrics.report_msgs()
+				
+			with stats.stage('report', _path) as st:
+				self.emit_iter(_msg_iter())
+				st['items'] = _pub_cnt + _attach_cnt
+				
+			with stats.stage('list_to_xlsx', _path) as st:
+				_row_iter = self.iter_xlsx_rows(self.iter_with_images(since, until, latest,\
+					image_sorter, 'publish'), self.metrics, None, self.blocks)
+				_sheet_list = [(None, _row_iter),\
+					('terms', term_stats.xlsx_rows())]
+				if block_totals is not None:
+					_sheet_list.append(('blocks', block_totals.xlsx_rows()))
+				if self.metrics:
+					_sheet_list.append(('metrics', content_metrics.xlsx_rows()))
+				sheets_to_xlsx(_sheet_list, self.output_path('.xlsx'))
+				st['items'] = _pub_cnt
+				
+			for sorter in (post_sorter, thumb_sorter, image_sorter):
+				sorter.close()
+				self.sorter_list.remove(sorter)
+				
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def close(self):
+		"""
+		remove the spilled runs.
+		"""
+		with self.lock:
+			for sorter in self.sorter_list:
+				sorter.close()
+			super().close()
+			
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Checkpoint:
+	"""
+	Periodic checkpoints of a session's load.  Every [every] items
+	the records built since the last checkpoint are appended to a
+	spill file and a small json file records the byte offset and
+	number of the last item, the term dictionary and the size of
+	the spill and comments csv files.  The spill also holds the
+	hierarchy rows of all items read since the last checkpoint.
+	A resumed load restores the records and continues parsing
+	after that item, so the report and excel file come out the
+	same as from an uninterrupted run.
+	"""
+	
+	version = 3
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, session, every:int=5000, comment_writer=None):
+		self.session = session
+		self.every = max(1, every)
+		self.comment_writer = comment_writer
+		self.json_path = session.output_path('_checkpoint.json')
+		self.spill_path = session.output_path('_checkpoint.spill')
+		self.pending = []
+		self.tree_pos = 0				# hierarchy rows already spilled
+		self.saved_cnt = 0
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def source_sig(self) -> list:
+		"""
+		return [size, mtime] of the export (or its zip) file.
+		"""
+		_stat = os.stat(split_zip_path(self.session.xml_path)[0])
+		return [_stat.st_size, _stat.st_mtime]
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def read(self) -> dict:
+		"""
+		return the checkpoint dict, or None if there is no usable
+		checkpoint for this export.
+		"""
+		import json
+		try:
+			with open(self.json_path, encoding='utf-8') as fd:
+				d = json.load(fd)
+		except (OSError, ValueError):
+			return None
+		if d.get('version') != WP_Checkpoint.version or \
+			d.get('xml_path') != self.session.xml_path or \
+			d.get('source') != self.source_sig():
+			return None
+		return d
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def restore(self) -> tuple:
+		"""
+		restore the session's records from the last checkpoint,
+		return (byte offset, item number) to resume from, or
+		(0, 0) to start from the beginning.
+		"""
+		import pickle
+		d = self.read()
+		if d is None:
+			return 0, 0
+			
+		node_list = []
+		tree_rows = []
+		with open(self.spill_path, 'rb') as fd:
+			while fd.tell() < d['spill_size']:
+				_nodes, _rows = pickle.load(fd)
+				node_list += _nodes
+				tree_rows += _rows
+		os.truncate(self.spill_path, d['spill_size'])
+		
+		if self.comment_writer is not None:
+			self.comment_writer.truncate(d['comments_size'])
+			
+		self.session.restore(node_list, d['slugs'], d['item_no'], tree_rows, d.get('site_link', ''))
+		self.tree_pos = len(tree_rows)
+		return d['offset'], d['item_no']
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def start(self):
+		"""
+		begin a fresh load, dropping any earlier checkpoint.
+		"""
+		self.remove()
+		open(self.spill_path, 'wb').close()
+		self.tree_pos = len(self.session.tree)
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def add(self, node, item_no:int, end_offset:int):
+		"""
+		note a newly read item, saving a checkpoint every [every] items.
+		"""
+		if node is not None:
+			self.pending.append(node)
+		if item_no % self.every == 0:
+			self.save(item_no, end_offset)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def save(self, item_no:int, end_offset:int):
+		import json
+		import pickle
+		with open(self.spill_path, 'ab') as fd:
+			_tree_rows = self.session.tree.rows(self.tree_pos)
+			pickle.dump((self.pending, _tree_rows), fd, protocol=pickle.HIGHEST_PROTOCOL)
+			fd.flush()
+			os.fsync(fd.fileno())
+			_spill_size = fd.tell()
+		self.pending = []
+		self.tree_pos += len(_tree_rows)
+		
+		_comments_size = 0
+		if self.comment_writer is not None:
+			_comments_size = self.comment_writer.flush()
+			
+		d = {}
+		d['version'] = WP_Checkpoint.version
+		d['xml_path'] = self.session.xml_path
+		d['source'] = self.source_sig()
+		d['item_no'] = item_no
+		d['offset'] = end_offset
+		d['spill_size'] = _spill_size
+		d['comments_size'] = _comments_size
+		d['slugs'] = self.session.term_dict.id_to_slug
+		d['site_link'] = self.session.site_link
+		
+		_tmp_path = self.json_path + '.tmp'
+		with open(_tmp_path, 'w', encoding='utf-8') as fd:
+			json.dump(d, fd)
+		os.replace(_tmp_path, self.json_path)
+		self.saved_cnt += 1
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def remove(self):
+		for _path in (self.json_path, self.spill_path):
+			if os.path.exists(_path):
+				os.remove(_path)
+				
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+class WP_Output_Writer:
+	"""
+	Background excel writer.  Workbooks handed to submit are
+	written by one worker process (a thread where processes are
+	not available) while the caller parses the next export.  At
+	most [max_pending] workbooks are in flight; submit waits for
+	the oldest when the limit is reached, which bounds memory.
+	"""
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def __init__(self, max_pending:int=2, use_process=True):
+		import concurrent.futures
+		
+		self.max_pending = max(1, max_pending)
+		self.pending = collections.deque()
+		self.written_cnt = 0
+		self.executor = None
+		if use_process:
+			try:
+				self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+			except (ImportError, NotImplementedError, OSError):
+				self.executor = None
+		if self.executor is None:
+			self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+			
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def submit(self, sheet_list:list, xls_path:str):
+		"""
+		queue sheets_to_xlsx(sheet_list, xls_path), first waiting
+		for the oldest workbook if max_pending are in flight.
+		"""
+		while len(self.pending) >= self.max_pending:
+			self.wait_oldest()
+		self.pending.append(self.executor.submit(sheets_to_xlsx, sheet_list, xls_path))
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def wait_oldest(self):
+		self.pending.popleft().result()
+		self.written_cnt += 1
+		
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	def close(self):
+		"""
+		wait for all workbooks to be written and stop the worker.
+		Re-raises the first error from the worker.
+		"""
+		try:
+			while self.pending:
+				self.wait_oldest()
+		finally:
+			self.executor.shutdown(wait=True, cancel_futures=True)
+			
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def process_xml_file(path, stats=None, since=None, until=None, latest=None,\
+	text_index=None, dedupe=None, comments_csv=False, msg_writer=None,\
+	output_writer=None, checkpoint_every=None, resume=False, workers=None,\
+	memory_budget=None, metrics=False, blocks=False, links=False):
+	"""
+	load, report and write excel for one export file,
+	return its WP_Export_Session.  With [output_writer] the excel
+	file is written in the background.  With [checkpoint_every]
+	the load is checkpointed every N items and, with [resume],
+	continues from the last checkpoint.  With [workers], a plain
+	export is parsed by that many processes (not combined with
+	comments csv or checkpoints).  With [memory_budget] (bytes)
+	records are spilled to disk (WP_Spill_Session), and the
+	session is closed after its report.  [metrics] adds content
+	metrics, [blocks] block and shortcode stats and [links] the
+	link graph to the report and excel file.  The session's rollup
+	(WP_Rollup, with processing time) ends its report.
+	"""
+	if msg_writer is None:
+		msg_writer = g_msgwr
+		
+	_start = time.perf_counter()
+	
+	if memory_budget is not None:
+		session = WP_Spill_Session(path, msg_writer, stats, memory_budget)
+	else:
+		session = WP_Export_Session(path, msg_writer, stats)
+	session.metrics = metrics
+	session.blocks = blocks
+	session.links = links
+	stats = session.stats
+	
+	checkpoint = None
+	if checkpoint_every is not None:
+		checkpoint = WP_Checkpoint(session, checkpoint_every)
+		resume = resume and checkpoint.read() is not None
+	else:
+		resume = False
+		
+	comment_writer = None
+	if comments_csv:
+		comment_writer = WP_Comment_Writer(session.output_path('_comments.csv'), append=resume)
+		if checkpoint is not None:
+			checkpoint.comment_writer = comment_writer
+	
+	try:
+		_comment_cb = comment_writer.write if comment_writer is not None else None
+		if workers and comment_writer is None and checkpoint is None:
+			session.load_parallel(workers)
+		else:
+			session.load(_comment_cb, checkpoint, resume)
+	finally:
+		if comment_writer is not None:
+			comment_writer.close()
+	
+	if text_index is not None:
+		with stats.stage('text_index', path) as st:
+			st['items'] = text_index.add_export(path, session.node_list)
+			
+	if dedupe is not None:
+		with stats.stage('dedupe_signatures', path) as st:
+			st['items'] = dedupe.add_posts(path, session.node_list)
+			
+	session.report_and_xlsx(since=since, until=until, latest=latest,\
+		output_writer=output_writer)
+		
+	if session.rollup is None:
+		from wp_rollup import WP_Rollup
+		session.rollup = WP_Rollup.for_export(path, session.item_cnt, session.tree.type_status_cnt())
+	session.rollup.set_seconds(time.perf_counter() - _start)
+	session.emit([session.rollup.site_msg()])
+		
+	if memory_budget is not None:
+		session.close()
+	
+	return session
+
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+		
+def last_days_since(days:int) -> datetime.date:
+	"""
+	return the --since date for --last-days [days], from today.
+	"""
+	return datetime.date.today() - datetime.timedelta(days=days)
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def parse_args(argv=None):
+	ap = argparse.ArgumentParser(description='extract and report Wordpress export xml files.')
+	ap.add_argument('--stats', action='store_true',\
+		help='time each stage and count items, report in log totals and json sidecar')
+	ap.add_argument('--stats-json', default=None,\
+		help='stats sidecar path (default: log file name with _stats.json)')
+	ap.add_argument('--no-trace-memory', action='store_true',\
+		help='with --stats, skip tracemalloc peak memory (lower overhead)')
+	ap.add_argument('--since', default=None,\
+		help='report posts published on or after YYYY-MM-DD[ HH:MM:SS]')
+	ap.add_argument('--until', default=None,\
+		help='report posts published on or before YYYY-MM-DD[ HH:MM:SS]')
+	ap.add_argument('--last-days', type=int, default=None,\
+		help='report posts published in the last N days (sets --since)')
+	ap.add_argument('--latest', type=int, default=None,\
+		help='report only the latest N published posts')
+	ap.add_argument('--text-index', default=None, metavar='DB',\
+		help='also add each export to this full-text index (see wp_text_index.py)')
+	ap.add_argument('--dedupe', action='store_true',\
+		help='report near-duplicate posts across all exports read')
+	ap.add_argument('--dedupe-threshold', type=float, default=0.8,\
+		help='estimated similarity for --dedupe (default 0.8)')
+	ap.add_argument('--comments-csv', action='store_true',\
+		help='stream each export\'s comments to <export>_comments.csv')
+	ap.add_argument('--metrics', action='store_true',\
+		help='add word/char/image counts and reading time columns, a monthly length summary and metrics sheet')
+	ap.add_argument('--blocks', action='store_true',\
+		help='add Gutenberg block and shortcode columns, a block summary and blocks sheet')
+	ap.add_argument('--links', action='store_true',\
+		help='add the internal link graph: broken links, most linked and orphan posts, links sheet')
+	ap.add_argument('--checkpoint-every', type=int, default=None, metavar='N',\
+		help='checkpoint each export\'s load every N items so it can be resumed')
+	ap.add_argument('--resume', action='store_true',\
+		help='with --checkpoint-every, continue each export from its last checkpoint')
+	ap.add_argument('--workers', type=int, default=None, metavar='N',\
+		help='parse each plain .xml export with N processes, split at item boundaries')
+	ap.add_argument('--memory-budget', type=float, default=None, metavar='MB',\
+		help='spill records to sorted temp files, keeping buffers under MB megabytes')
+	ap.add_argument('--pipeline', action='store_true',\
+		help='write excel files in a background process while the next export parses')
+	ap.add_argument('--max-pending', type=int, default=2,\
+		help='with --pipeline, excel files waiting to be written (default 2)')
+	ap.add_argument('--preview', type=int, default=None, metavar='N',\
+		help='only preview each export: stop after N post/attachment items, no excel file')
+	ap.add_argument('--preview-mb', type=float, default=None, metavar='MB',\
+		help='preview: stop after MB megabytes of xml')
+	ap.add_argument('--preview-seconds', type=float, default=None, metavar='S',\
+		help='preview: stop after S seconds')
+	ap.add_argument('--preview-sample', type=int, default=3, metavar='K',\
+		help='preview: records shown (default 3)')
+	ap.add_argument('--watch', action='store_true',\
+		help='keep running, processing exports that are new or changed (see wp_watch.py)')
+	ap.add_argument('--poll-seconds', type=float, default=5.0,\
+		help='with --watch, seconds between scans (default 5)')
+	ap.add_argument('--settle-seconds', type=float, default=10.0,\
+		help='with --watch, seconds a file must be unchanged before it is read (default 10)')
+	ap.add_argument('--watch-workers', type=int, default=2, metavar='N',\
+		help='with --watch, exports processed at once (default 2)')
+	args = ap.parse_args(argv)
+	
+	try:
+		WP_Time_Index.date_key(args.since)
+		WP_Time_Index.date_key(args.until, end=True)
+	except ValueError as ex:
+		ap.error(f'bad date: {ex}')
+		
+	if args.resume and args.checkpoint_every is None:
+		ap.error('--resume requires --checkpoint-every')
+		
+	if args.workers and (args.comments_csv or args.checkpoint_every is not None):
+		ap.error('--workers cannot be combined with --comments-csv or --checkpoint-every')
+		
+	if args.memory_budget is not None and (args.workers or args.checkpoint_every is not None or\
+		args.text_index or args.dedupe):
+		ap.error('--memory-budget cannot be combined with --workers, --checkpoint-every, ' + \
+			'--text-index or --dedupe')
+		
+	if args.watch and (args.text_index or args.dedupe or args.workers or args.pipeline):
+		ap.error('--watch cannot be combined with --text-index, --dedupe, --workers or --pipeline')
+		
+	args.preview_mode = args.preview is not None or args.preview_mb is not None or\
+		args.preview_seconds is not None
+	if args.preview_mode and args.watch:
+		ap.error('--preview options cannot be combined with --watch')
+		
+	if args.last_days is not None:
+		args.since = last_days_since(args.last_days)
+		
+	return args
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+		
+def main(args=None):
+	
+	#-------------------------------------------------------------
+	# 
+	#------------------------------------------------------------
+	
+	if args is None:
+		args = parse_args([])
+		
+	stats = WP_Run_Stats(enabled=args.stats, trace_memory=not args.no_trace_memory)
+	
+	curdir = pathlib.Path().cwd()
+	
+	xml_file_list = build_stream_file_list(curdir, '*.xml')
+	
+	if args.preview_mode:
+		_max_bytes = None
+		if args.preview_mb is not None:
+			_max_bytes = int(args.preview_mb * (1 << 20))
+		for xml_path in xml_file_list:
+			preview_xml_file(xml_path, args.preview, _max_bytes, args.preview_seconds,\
+				args.preview_sample)
+		buffer_msg(f'{LF}{LF}{"*"*80}')
+		buffer_msg(f'{LF}{LF}Totals:')
+		buffer_msg(f'{LF} {len(xml_file_list)} export xml files previewed.')
+		return
+	
+	text_index = None
+	if args.text_index:
+		from wp_text_index import WP_Text_Index
+		text_index = WP_Text_Index(args.text_index)
+	
+	dedupe = None
+	if args.dedupe:
+		from wp_dedupe import WP_Dedupe
+		dedupe = WP_Dedupe(threshold=args.dedupe_threshold)
+	
+	_memory_budget = None
+	if args.memory_budget is not None:
+		_memory_budget = int(args.memory_budget * (1 << 20))
+		
+	output_writer = None
+	if args.pipeline:
+		output_writer = WP_Output_Writer(args.max_pending)
+	
+	# only each export's rollup is kept once it is done.
+	from wp_rollup import WP_Rollup
+	summary = WP_Rollup()
+	
+	try:
+		for xml_path in xml_file_list:
+			session = process_xml_file(xml_path, stats, since=args.since, until=args.until,\
+				latest=args.latest, text_index=text_index, dedupe=dedupe,\
+				comments_csv=args.comments_csv, output_writer=output_writer,\
+				checkpoint_every=args.checkpoint_every, resume=args.resume,\
+				workers=args.workers, memory_budget=_memory_budget, metrics=args.metrics,\
+				blocks=args.blocks, links=args.links)
+			summary.merge(session.rollup)
+			session.close()
+	finally:
+		if output_writer is not None:
+			output_writer.close()
+		
+	if text_index is not None:
+		text_index.close()
+		
+	if dedupe is not None:
+		cluster_list = dedupe.clusters()
+		for msg in dedupe.report_msgs(cluster_list):
+			buffer_msg(msg)
+		_xlsx_path = str(g_msgwr.file_path).rsplit('.log',1)[0] + '_dedupe.xlsx'
+		list_to_xlsx(dedupe.xlsx_rows(cluster_list), _xlsx_path)
+	
+	buffer_msg(f'{LF}{LF}{"*"*80}')
+	buffer_msg(f'{LF}{LF}Totals:')
+	buffer_msg(f'{LF} {len(xml_file_list)} export xml files read.')
+	
+	write_summary(summary)
+	
+	if stats.enabled:
+		buffer_msg(stats.as_str())
+		if args.stats_json:
+			_json_path = args.stats_json
+		else:
+			_json_path = str(g_msgwr.file_path).rsplit('.log',1)[0] + '_stats.json'
+		stats.write_json(_json_path)
+		buffer_msg(f'{LF}{LF} Stats written to: {_json_path}')
+	
+	#------------------------------------------------------------
+	# 
+	#------------------------------------------------------------
+	
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def write_summary(summary):
+	"""
+	report the cross-site summary of a WP_Rollup and write it to
+	_summary.xlsx and _rollup.json next to the log.
+	"""
+	if not len(summary):
+		return
+	for msg in summary.report_msgs():
+		buffer_msg(msg)
+	_base = str(g_msgwr.file_path).rsplit('.log',1)[0]
+	summary.write_xlsx(_base + '_summary.xlsx')
+	summary.write_json(_base + '_rollup.json')
+	buffer_msg(f'{LF}{LF} Summary written to: {_base}_summary.xlsx, {_base}_rollup.json')
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def watch(args):
+	"""
+	watch the current directory tree, processing each new or
+	changed export with the options in [args] until interrupted.
+	"""
+	from wp_watch import WP_Export_Watcher
+	
+	_memory_budget = None
+	if args.memory_budget is not None:
+		_memory_budget = int(args.memory_budget * (1 << 20))
+		
+	# with --last-days the window is worked out again for each file.
+	options = {'since': args.since, 'last_days': args.last_days, 'until': args.until,\
+		'latest': args.latest, 'comments_csv': args.comments_csv, 'checkpoint_every': args.checkpoint_every,\
+		'resume': args.resume, 'memory_budget': _memory_budget, 'metrics': args.metrics,\
+		'blocks': args.blocks, 'links': args.links,\
+		'stats': args.stats, 'trace_memory': not args.no_trace_memory}
+		
+	watcher = WP_Export_Watcher(pathlib.Path().cwd(), options, msg_writer=g_msgwr,\
+		poll_seconds=args.poll_seconds, settle_seconds=args.settle_seconds,\
+		workers=args.watch_workers)
+	try:
+		watcher.run()
+	except KeyboardInterrupt:
+		buffer_msg(f'{LF} watch: interrupted. {LF}')
+	write_summary(watcher.summary())
+		
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+def run(argv=None) -> int:
+	"""
+	command line entry point: parse [argv] (default sys.argv),
+	open the log, run main and return the exit status.  Heavy
+	modules (xmltodict, openpyxl, the index and dedupe modules)
+	are imported only once a run needs them, so --help and runs
+	with nothing to read start quickly.
+	"""
+	global g_msgwr
+	
+	args = parse_args(argv)
+	
+	msg_log_file = make_dt_output_filepath(prefix=__prog__, ext='.log')
+	
+	g_msgwr = Message_Writer(name='root',file_path=msg_log_file)
+	
+	buffer_msg(f'{LF}program {__file__} started. {LF}')
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	if args.watch:
+		watch(args)
+	else:
+		main(args)
+	
+	#-------------------------------------------------------------
+	# 
+	#-------------------------------------------------------------
+	
+	buffer_msg(LF)
+	buffer_msg(f'{LF}program {__file__} completed. {LF}')
+	
+	g_msgwr.shutdown()
+	
+	return 0
+	
+#-------------------------------------------------------------
+# 
+#-------------------------------------------------------------
+
+if __name__ == "__main__":
+	
+	sys.exit(run())
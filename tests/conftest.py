@@ -0,0 +1,14 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+"""
+Tests import the modules in src/ the way the scripts do, by name.
+"""
+
+import pathlib
+import sys
+
+SRC_DIR = pathlib.Path(__file__).resolve().parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+	sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,76 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+from wp_blocks import WP_Block_Stats
+from wp_blocks import WP_Block_Totals
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_blocks_depth_and_attrs():
+	bs = WP_Block_Stats('<!-- wp:group {"layout":{"type":"flex"}} --><div>' + \
+		'<!-- wp:paragraph --><p>a</p><!-- /wp:paragraph -->' + \
+		'<!-- wp:image {"id":5} /--></div><!-- /wp:group -->')
+	assert bs.block_cnt == {'group': 1, 'paragraph': 1, 'image': 1}
+	assert bs.attr_cnt[('group', 'layout')] == 1
+	assert bs.max_depth == 2
+	assert bs.error_cnt == 0
+
+def test_unbalanced_blocks():
+	bs = WP_Block_Stats('<!-- wp:quote --><!-- wp:paragraph --><!-- /wp:quote -->')
+	assert bs.error_cnt == 1
+
+def test_known_shortcodes():
+	bs = WP_Block_Stats('[gallery ids="1,2"] [youtube https://youtu.be/x] [caption]c[/caption]')
+	assert bs.shortcode_cnt == {'gallery': 1, 'youtube': 1, 'caption': 1}
+
+def test_prose_brackets_not_counted():
+	bs = WP_Block_Stats('<p>He said [sic] it was [1] fine [see below].</p>')
+	assert bs.total_shortcodes == 0
+
+def test_unknown_shortcode_by_syntax():
+	bs = WP_Block_Stats('[button url="x"]Go[/button] [note]n[/note] [aside]')
+	assert bs.shortcode_cnt == {'button': 1, 'note': 1}
+
+def test_brackets_in_tag_attributes_skipped():
+	bs = WP_Block_Stats('<a title="[gallery ids=1]" href="#">x</a> <img alt="[video]"> [audio src="a.mp3"]')
+	assert bs.shortcode_cnt == {'audio': 1}
+
+def test_block_comment_brackets_skipped():
+	bs = WP_Block_Stats('<!-- wp:gallery {"ids":[1,2]} --><figure></figure><!-- /wp:gallery -->')
+	assert bs.total_shortcodes == 0
+
+def test_totals():
+	class _Post:
+		def __init__(self, text):
+			self.block_stats = WP_Block_Stats(text)
+	totals = WP_Block_Totals([_Post('<!-- wp:paragraph --><!-- /wp:paragraph -->[gallery]'),\
+		_Post('no blocks [embed]x[/embed]')])
+	assert totals.post_cnt == 2
+	assert totals.block_post_cnt == 1
+	assert totals.shortcode_posts == {'gallery': 1, 'embed': 1}
+
+def test_stray_lt_scan_is_linear():
+	class _Text(str):
+		# counts characters str.find walks over looking for '>'
+		scanned = 0
+		def find(self, sub, start=0, *args):
+			pos = str.find(self, sub, start, *args)
+			if sub == '>':
+				_Text.scanned += (len(self) if pos < 0 else pos) - start
+			return pos
+
+	n = 20000
+	text = _Text('a < b [gallery] ' * n)
+	bs = WP_Block_Stats(text)
+	# no '>' anywhere: every '[' after the first '<' is inside a tag
+	assert bs.total_shortcodes == 0
+	assert _Text.scanned <= len(text)
+
+	_Text.scanned = 0
+	text = _Text('<p>x</p> [video] ' + 'a < b [gallery] <i>y</i> ' * n)
+	bs = WP_Block_Stats(text)
+	assert bs.shortcode_cnt == {'video': 1}
+	assert _Text.scanned <= len(text)
@@ -0,0 +1,129 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import json
+import os
+
+import openpyxl
+import pytest
+
+import wp_xml_export_extract as wpx
+from wp_bench import WXR_Generator
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class Msg_Sink:
+	def __init__(self):
+		self.msg_list = []
+
+	def buffer_msg(self, s):
+		self.msg_list.append(s)
+
+def make_export(tmp_path, name='site.xml'):
+	path = tmp_path / name
+	WXR_Generator(posts=40, attachments=15, comments=3, terms=20, body_size=300, pages=6).write(str(path))
+	return path
+
+def read_output(path) -> tuple:
+	"""
+	return (rows of every sheet, comments csv text) of an export's output.
+	"""
+	_base = wpx.export_output_path(str(path), '')
+	wb = openpyxl.load_workbook(_base + '.xlsx', read_only=True)
+	try:
+		_sheets = {ws.title: list(ws.iter_rows(values_only=True)) for ws in wb.worksheets}
+	finally:
+		wb.close()
+	with open(_base + '_comments.csv', encoding='utf-8') as fd:
+		return _sheets, fd.read()
+
+def report_msgs(sink) -> list:
+	# the rollup line carries the run time.
+	return [s for s in sink.msg_list if 'Rollup:' not in s]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_parse_resumes_after_offset(tmp_path):
+	path = make_export(tmp_path)
+	_all = []
+	wpx.parse_xml_items(str(path), lambda n, item: _all.append(item.get('wp:post_id')))
+
+	_head, _offsets = [], []
+
+	def _stop(item_no, item, end_offset):
+		_head.append(item.get('wp:post_id'))
+		_offsets.append(end_offset)
+		return item_no < 17
+
+	assert wpx.parse_xml_items(str(path), _stop, with_offsets=True) == 17
+	_tail = []
+	_last = wpx.parse_xml_items(str(path), lambda n, item, off: _tail.append(item.get('wp:post_id')),\
+		start_offset=_offsets[-1], start_item_no=17, with_offsets=True)
+	assert _last == len(_all)
+	assert _head + _tail == _all
+
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+	clean_dir = tmp_path / 'clean'
+	clean_dir.mkdir()
+	path = make_export(clean_dir)
+	_sink = Msg_Sink()
+	wpx.process_xml_file(str(path), msg_writer=_sink, comments_csv=True)
+	_clean = read_output(path)
+
+	path = make_export(tmp_path)
+	_add_item = wpx.WP_Export_Session.add_item
+
+	def _failing_add_item(self, item_no, item):
+		if item_no > 23:
+			raise RuntimeError('killed')
+		return _add_item(self, item_no, item)
+
+	monkeypatch.setattr(wpx.WP_Export_Session, 'add_item', _failing_add_item)
+	with pytest.raises(RuntimeError):
+		wpx.process_xml_file(str(path), msg_writer=Msg_Sink(), comments_csv=True, checkpoint_every=5)
+	_json_path = wpx.export_output_path(str(path), '_checkpoint.json')
+	with open(_json_path, encoding='utf-8') as fd:
+		assert json.load(fd)['item_no'] == 20
+
+	# the resumed load parses only the items after the checkpoint.
+	_parsed = []
+
+	def _counting_add_item(self, item_no, item):
+		_parsed.append(item_no)
+		return _add_item(self, item_no, item)
+
+	monkeypatch.setattr(wpx.WP_Export_Session, 'add_item', _counting_add_item)
+	_resumed_sink = Msg_Sink()
+	session = wpx.process_xml_file(str(path), msg_writer=_resumed_sink, comments_csv=True,\
+		checkpoint_every=5, resume=True)
+	assert read_output(path) == _clean
+	assert session.item_cnt == 61
+	assert _parsed == list(range(21, 62))
+	assert report_msgs(_resumed_sink) == [s.replace(str(clean_dir), str(tmp_path))\
+		for s in report_msgs(_sink)]
+	assert not os.path.exists(_json_path)
+
+def test_wrong_version_rejected(tmp_path):
+	path = make_export(tmp_path)
+	session = wpx.WP_Export_Session(str(path))
+	checkpoint = wpx.WP_Checkpoint(session, every=5)
+	def _load_some(item_no, item, end_offset):
+		checkpoint.add(session.add_item(item_no, item), item_no, end_offset)
+		return item_no < 10
+
+	checkpoint.start()
+	wpx.parse_xml_items(str(path), _load_some, with_offsets=True)
+	assert checkpoint.read()['item_no'] == 10
+
+	with open(checkpoint.json_path, encoding='utf-8') as fd:
+		d = json.load(fd)
+	d['version'] = wpx.WP_Checkpoint.version - 1
+	with open(checkpoint.json_path, 'w', encoding='utf-8') as fd:
+		json.dump(d, fd)
+	assert checkpoint.read() is None
+	assert wpx.WP_Checkpoint(wpx.WP_Export_Session(str(path)), every=5).restore() == (0, 0)
@@ -0,0 +1,88 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import csv
+
+from wp_xml_export_extract import WP_Comment_Writer
+from wp_xml_export_extract import parse_xml_items
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def comment_xml(comment_id, approved, author, email, date, content='hi') -> str:
+	return f'<wp:comment><wp:comment_id>{comment_id}</wp:comment_id>' + \
+		f'<wp:comment_author><![CDATA[{author}]]></wp:comment_author>' + \
+		f'<wp:comment_author_email>{email}</wp:comment_author_email>' + \
+		f'<wp:comment_date_gmt>{date}</wp:comment_date_gmt>' + \
+		f'<wp:comment_content><![CDATA[{content}]]></wp:comment_content>' + \
+		f'<wp:comment_approved>{approved}</wp:comment_approved>' + \
+		'<wp:commentmeta><wp:meta_key>k</wp:meta_key><wp:meta_value>v</wp:meta_value></wp:commentmeta>' + \
+		'</wp:comment>'
+
+def write_export(tmp_path):
+	_item_1 = '<item><title>one</title><wp:post_id>11</wp:post_id>' + \
+		comment_xml(1, '1', 'Ann', 'ann@ex.com', '2024-03-02 10:00:00', 'first, "quoted"') + \
+		comment_xml(2, '1', 'ANN', 'Ann@ex.com', '2024-01-05 09:00:00') + \
+		comment_xml(3, '0', 'Bob', 'bob@ex.com', '2024-02-01 08:00:00') + \
+		comment_xml(4, 'spam', 'Spammer', '', '2024-04-01 00:00:00') + \
+		'<wp:post_type>post</wp:post_type></item>'
+	_item_2 = '<item><title>two</title><wp:post_id>12</wp:post_id>' + \
+		comment_xml(5, '1', 'Cy', 'cy@ex.com', '2023-12-31 23:59:59') + '</item>'
+	_item_3 = '<item><title>three</title><wp:post_id>13</wp:post_id></item>'
+	path = tmp_path / 'site.xml'
+	path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" ' + \
+		'xmlns:wp="http://wordpress.org/export/1.2/"><channel><title>t</title>' + \
+		_item_1 + _item_2 + _item_3 + '</channel></rss>\n', encoding='utf-8')
+	return path
+
+def read_csv(path) -> list:
+	with open(path, encoding='utf-8', newline='') as fd:
+		return list(csv.reader(fd))
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_comments_counted_streamed_and_dropped(tmp_path):
+	path = write_export(tmp_path)
+	_csv_path = str(tmp_path / 'site_comments.csv')
+	writer = WP_Comment_Writer(_csv_path)
+	_items = []
+	parse_xml_items(str(path), lambda n, item: _items.append(item), writer.write)
+	writer.close()
+
+	assert all('wp:comment' not in item for item in _items)
+	assert _items[0]['wp:post_type'] == 'post'
+
+	cs = _items[0]['_comment_stats']
+	assert (cs.comment_cnt, cs.approved_cnt, cs.pending_cnt, cs.spam_cnt) == (4, 2, 1, 1)
+	assert cs.commenter_cnt == 3				# ann@ex.com in any case, bob, Spammer
+	assert (cs.first_date, cs.last_date) == ('2024-01-05 09:00:00', '2024-04-01 00:00:00')
+	cs = _items[1]['_comment_stats']
+	assert (cs.comment_cnt, cs.approved_cnt, cs.first_date) == (1, 1, '2023-12-31 23:59:59')
+	assert _items[2]['_comment_stats'].comment_cnt == 0
+
+	rows = read_csv(_csv_path)
+	assert rows[0] == ['post_id','comment_id','comment_parent','comment_date_gmt',\
+		'comment_approved','comment_type','comment_author','comment_author_email',\
+		'comment_author_url','comment_content']
+	assert [(r[0], r[1], r[4]) for r in rows[1:]] == [('11', '1', '1'), ('11', '2', '1'),\
+		('11', '3', '0'), ('11', '4', 'spam'), ('12', '5', '1')]
+	assert rows[1][6:] == ['Ann', 'ann@ex.com', '', 'first, "quoted"']
+	assert writer.comment_cnt == 5
+
+def test_writer_truncate_and_append(tmp_path):
+	_csv_path = str(tmp_path / 'c.csv')
+	writer = WP_Comment_Writer(_csv_path)
+	writer.write(1, {'wp:comment_id': '1'})
+	_size = writer.flush()
+	writer.write(2, {'wp:comment_id': '2'})
+	writer.truncate(_size)
+	writer.close()
+
+	writer = WP_Comment_Writer(_csv_path, append=True)
+	writer.write(3, {'wp:comment_id': '3'})
+	writer.close()
+	assert [r[:2] for r in read_csv(_csv_path)[1:]] == [['1', '1'], ['3', '3']]
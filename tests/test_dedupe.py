@@ -0,0 +1,63 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import random
+import types
+
+from wp_dedupe import WP_Dedupe
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+WORDS = [f'w{i}' for i in range(500)]
+
+def text(seed:int, n:int=200) -> str:
+	_rng = random.Random(seed)
+	return ' '.join(_rng.choice(WORDS) for _ in range(n))
+
+def post(post_id:int, content:str, post_type:str='post'):
+	return types.SimpleNamespace(post_id=post_id, post_type=post_type, title=f't{post_id}',\
+		link=f'https://example.com/{post_id}/', content=content)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_signature_is_deterministic_and_sized():
+	dedupe = WP_Dedupe(bands=8, rows=4)
+	sig_a, n = dedupe.signature(text(1))
+	sig_b, _ = dedupe.signature(text(1))
+	assert n == 200
+	assert len(sig_a) == 32
+	assert sig_a == sig_b
+
+def test_similarity_tracks_overlap():
+	dedupe = WP_Dedupe()
+	_base = text(1).split()
+	_near = ' '.join(_base[:190] + text(2, 10).split())
+	sig = dedupe.signature(' '.join(_base))[0]
+	assert WP_Dedupe.similarity(sig, sig) == 1.0
+	assert WP_Dedupe.similarity(sig, dedupe.signature(_near)[0]) > 0.7
+	assert WP_Dedupe.similarity(sig, dedupe.signature(text(3))[0]) < 0.2
+
+def test_banding_clusters_near_duplicates_only():
+	dedupe = WP_Dedupe(threshold=0.7)
+	_base = text(1)
+	_copy = _base.replace('w1 ', 'w499 ', 1)
+	node_list = [post(1, _base), post(2, text(5)), post(3, _copy), post(4, text(6)),\
+		post(5, _base, post_type='page'), post(6, 'too short')]
+	assert dedupe.add_posts('site.xml', node_list) == 4
+	assert dedupe.skipped_cnt == 1
+	cluster_list = dedupe.clusters()
+	assert len(cluster_list) == 1
+	_ids = sorted(dedupe.doc_list[i][1] for i, _ in cluster_list[0])
+	assert _ids == [1, 3]
+	assert cluster_list[0][0][1] == 1.0
+
+def test_short_text_densified():
+	dedupe = WP_Dedupe(bands=16, rows=4)
+	sig, n = dedupe.signature('one two three four five six')
+	assert n == 6
+	assert len(set(sig)) > 2
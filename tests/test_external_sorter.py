@@ -0,0 +1,50 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import os
+import random
+from operator import itemgetter
+
+from sparkwarden_file_lib import External_Sorter
+from wp_tree import WP_Item_Counts
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_merge_order_across_runs(tmp_path):
+	rng = random.Random(7)
+	items = [(rng.randrange(50), i) for i in range(2000)]
+	sorter = External_Sorter(itemgetter(0), budget=4096, tmpdir=str(tmp_path))
+	for item in items:
+		sorter.add(item)
+	assert len(sorter.run_list) > 3
+	assert len(sorter) == len(items)
+	# stable: equal keys keep the order they were added in.
+	assert list(sorter) == sorted(items, key=itemgetter(0))
+	assert list(sorter) == sorted(items, key=itemgetter(0))
+	_run_dir = sorter.run_dir
+	sorter.close()
+	assert not os.path.exists(_run_dir)
+
+def test_buffer_only_and_default_key(tmp_path):
+	sorter = External_Sorter(budget=1 << 20, tmpdir=str(tmp_path))
+	for x in (5, 1, 4, 1, 3):
+		sorter.add(x)
+	assert sorter.run_list == []
+	assert list(sorter) == [1, 1, 3, 4, 5]
+	sorter.add(0)
+	assert list(sorter) == [0, 1, 1, 3, 4, 5]
+
+def test_empty_sorter():
+	sorter = External_Sorter(itemgetter(0))
+	assert list(sorter) == []
+	sorter.close()
+
+def test_item_counts():
+	counts = WP_Item_Counts()
+	for t, s in (('post', 'publish'), ('page', 'draft'), ('post', 'publish')):
+		counts.add_item({'wp:post_type': t, 'wp:status': s})
+	assert len(counts) == 3
+	assert counts.type_status_cnt() == {('post', 'publish'): 2, ('page', 'draft'): 1}
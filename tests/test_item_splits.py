@@ -0,0 +1,89 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import pytest
+
+from wp_xml_export_extract import ITEM_END_TAG
+from wp_xml_export_extract import find_item_splits
+from wp_xml_export_extract import in_markup_section
+from wp_xml_export_extract import parse_item_range
+from wp_xml_export_extract import resume_chunks
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def make_export(tmp_path, n:int=12):
+	"""
+	write an export of [n] posts; some hide an </item> tag in
+	CDATA or a comment, where no split may fall.
+	"""
+	_item_list = []
+	for i in range(1, n + 1):
+		_content = f'post {i}'
+		if i % 3 == 0:
+			_content += ' </item> in cdata'
+		_extra = '<!-- </item> in a comment -->' if i % 4 == 0 else ''
+		_item_list.append(f'<item><title>p{i}</title>{_extra}<wp:post_id>{i}</wp:post_id>' + \
+			f'<wp:post_type>{"page" if i % 5 == 0 else "post"}</wp:post_type><wp:status>publish</wp:status>' + \
+			f'<content:encoded><![CDATA[{_content}]]></content:encoded></item>\n')
+	_xml = '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" ' + \
+		'xmlns:wp="http://wordpress.org/export/1.2/" xmlns:content="http://purl.org/rss/1.0/modules/content/">\n' + \
+		'<channel><title>t</title><link>https://ex.com</link>\n' + ''.join(_item_list) + '</channel></rss>\n'
+	path = tmp_path / 'site.xml'
+	path.write_text(_xml, encoding='utf-8')
+	return path
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+@pytest.mark.parametrize('parts', [1, 2, 3, 5, 12, 40])
+def test_splits_fall_after_real_item_ends(tmp_path, parts):
+	path = make_export(tmp_path)
+	data = path.read_bytes()
+	splits = find_item_splits(path, parts)
+	assert splits[0] == 0 and splits[-1] == len(data)
+	assert splits == sorted(set(splits))
+	assert len(splits) <= parts + 1
+	for pos in splits[1:-1]:
+		assert data[pos - len(ITEM_END_TAG):pos] == ITEM_END_TAG
+		assert not in_markup_section(data, pos - len(ITEM_END_TAG))
+
+@pytest.mark.parametrize('parts', [2, 4, 40])
+def test_ranges_cover_every_item_once(tmp_path, parts):
+	path = make_export(tmp_path)
+	splits = find_item_splits(path, parts)
+	ids, item_total, links = [], 0, []
+	for lo, hi in zip(splits[:-1], splits[1:-1] + [None]):
+		item_cnt, node_list, seen_cnt, kept_cnt, tree, site_link = parse_item_range(path, lo, hi)
+		item_total += item_cnt
+		ids += [nd.post_id for nd in node_list]
+		assert [nd.postno for nd in node_list] == sorted(nd.postno for nd in node_list)
+		assert len(tree) == item_cnt
+		links.append(site_link)
+	assert item_total == 12
+	assert ids == [i for i in range(1, 13) if i % 5]
+	assert links[0] == 'https://ex.com'
+	assert not any(links[1:])
+
+def test_empty_and_itemless_files(tmp_path):
+	empty = tmp_path / 'empty.xml'
+	empty.write_bytes(b'')
+	assert find_item_splits(empty, 4) == [0, 0]
+	bare = tmp_path / 'bare.xml'
+	bare.write_bytes(b'<rss><channel><title>t</title></channel></rss>')
+	assert find_item_splits(bare, 4) == [0, bare.stat().st_size]
+
+def test_resume_chunks_checks_offset(tmp_path):
+	path = make_export(tmp_path, 2)
+	data = path.read_bytes()
+	_end = data.index(ITEM_END_TAG) + len(ITEM_END_TAG)
+	with open(path, 'rb') as fd:
+		_chunks = b''.join(resume_chunks(fd, _end, len(data), chunk_size=7))
+	assert _chunks.startswith(b'<rss><channel>\n<item><title>p2')
+	assert _chunks.endswith(b'</channel></rss>')
+	with open(path, 'rb') as fd:
+		with pytest.raises(ValueError):
+			b''.join(resume_chunks(fd, _end - 1))
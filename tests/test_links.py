@@ -0,0 +1,79 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import types
+
+from wp_links import WP_Link_Graph
+from wp_links import find_link_urls
+from wp_links import is_archive_url
+from wp_tree import WP_Post_Tree
+
+SITE = 'https://example.com'
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def make_node(post_id, post_type, name, link_urls=(), status='publish', attachment_url=''):
+	return types.SimpleNamespace(post_id=post_id, post_type=post_type, status=status,\
+		post_name=name, title=name, link=f'{SITE}/{name}/', attachment_url=attachment_url,\
+		link_urls=tuple(link_urls))
+
+def make_graph(urls):
+	node_list = [make_node(1, 'post', 'first', urls), make_node(2, 'post', 'second'),\
+		make_node(3, 'attachment', 'pic', attachment_url=f'{SITE}/wp-content/uploads/2024/01/pic.jpg')]
+	tree = WP_Post_Tree()
+	tree.add(1, 0, 'post', 'publish', 'first', 'first', f'{SITE}/first/')
+	tree.add(2, 0, 'post', 'publish', 'second', 'second', f'{SITE}/second/')
+	tree.add(3, 1, 'attachment', 'inherit', 'pic', 'pic', f'{SITE}/first/pic/')
+	tree.add(10, 0, 'page', 'publish', 'About', 'about', f'{SITE}/about/')
+	tree.add(11, 10, 'page', 'publish', 'Team', 'team', f'{SITE}/about/team/')
+	return WP_Link_Graph(node_list, tree, SITE + '/')
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_find_link_urls():
+	assert find_link_urls('<a href="/x">x</a><img src=\'/y.jpg\'>') == ('/x', '/y.jpg')
+	assert find_link_urls(None) == ()
+
+def test_posts_and_attachments():
+	g = make_graph([f'{SITE}/second/', '/second', f'{SITE}/wp-content/uploads/2024/01/pic-300x200.jpg'])
+	assert g.out_links(0).tolist() == [1]
+	assert g.inbound[1] == 1
+	assert g.attach_link_cnt == 1
+	assert g.broken_list == []
+
+def test_pages_resolve_as_items():
+	g = make_graph([f'{SITE}/about/', '/about/team/', '/?page_id=11', 'https://example.com/team'])
+	assert g.item_link_cnt == 4
+	assert g.broken_list == []
+
+def test_archives_are_other():
+	g = make_graph(['/category/news/', '/tag/x', '/2024/01/', '/feed/', '/first/feed/',\
+		'/author/bob', '/?s=term', '/wp-login.php', '#top', 'mailto:a@b.c'])
+	assert g.other_cnt == 10
+	assert g.broken_list == []
+
+def test_broken_and_external():
+	g = make_graph(['/missing-post/', '/?p=99', f'{SITE}/wp-content/uploads/2020/02/gone.jpg',\
+		'https://other.org/page'])
+	assert [kind for _, _, kind in g.broken_list] == ['broken post', 'broken post', 'broken media']
+	assert g.external_cnt == 1
+
+def test_root_relative_uses_channel_host():
+	# the channel host decides, not whichever host a set yields first.
+	node_list = [make_node(1, 'post', 'first', ['/second/']),\
+		types.SimpleNamespace(post_id=2, post_type='post', status='publish', post_name='second',\
+			title='second', link='https://cdn.example.net/second/', attachment_url='', link_urls=())]
+	g = WP_Link_Graph(node_list, None, 'https://cdn.example.net')
+	assert g.site_host == 'cdn.example.net'
+	assert g.out_links(0).tolist() == [1]
+
+def test_is_archive_url():
+	assert is_archive_url('/2024/05/17')
+	assert not is_archive_url('/2024/05/17/a-post')
+	assert is_archive_url('', 'cat=3')
+	assert not is_archive_url('/some-page', 'utm_source=x')
@@ -0,0 +1,72 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+from wp_media_verify import WP_Media_Check
+from wp_media_verify import WP_Media_Index
+from wp_media_verify import attachment_filesize
+from wp_media_verify import upload_rel_path
+
+META = 'a:6:{s:5:"width";i:800;s:6:"height";i:600;s:4:"file";s:14:"2024/01/a.jpg";' + \
+	's:8:"filesize";i:5;s:5:"sizes";a:1:{s:9:"thumbnail";a:2:{s:4:"file";s:17:"a-150x150.jpg";' + \
+	's:8:"filesize";i:999;}}s:10:"image_meta";a:0:{}}'
+
+WXR = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:wp="http://wordpress.org/export/1.2/">
+<channel><title>t</title><link>https://site.files.wordpress.com</link>
+<item><title>a</title><wp:post_id>7</wp:post_id><wp:post_type>attachment</wp:post_type>
+<wp:attachment_url>https://site.files.wordpress.com/2024/01/a.jpg</wp:attachment_url>
+<wp:postmeta><wp:meta_key>_wp_attachment_metadata</wp:meta_key>
+<wp:meta_value><![CDATA[%s]]></wp:meta_value></wp:postmeta></item>
+<item><title>p</title><wp:post_id>8</wp:post_id><wp:post_type>post</wp:post_type>
+<wp:postmeta><wp:meta_key>_thumbnail_id</wp:meta_key><wp:meta_value>7</wp:meta_value></wp:postmeta></item>
+</channel></rss>
+''' % META
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_upload_rel_path():
+	assert upload_rel_path('https://ex.com/wp-content/uploads/2024/01/a%20b.jpg') == '2024/01/a b.jpg'
+	assert upload_rel_path('https://ex.wordpress.com/files/2024/01/a.jpg') == '2024/01/a.jpg'
+	assert upload_rel_path('https://site.files.wordpress.com/2024/01/pic.jpg') == '2024/01/pic.jpg'
+	assert upload_rel_path('https://cdn.ex.com/2024/01/pic.jpg?w=300') == '2024/01/pic.jpg'
+	assert upload_rel_path('https://cdn.ex.com/images/pic.jpg') == ''
+
+def test_attachment_filesize():
+	assert attachment_filesize(META) == 5
+	assert attachment_filesize('a:1:{s:5:"sizes";a:1:{s:8:"filesize";i:9;}}') == 0
+	assert attachment_filesize(None) == 0
+
+def test_check_missing_mismatch_unmapped(tmp_path):
+	media = tmp_path / 'uploads'
+	(media / '2024' / '01').mkdir(parents=True)
+	(media / '2024' / '01' / 'a.jpg').write_bytes(b'12345')
+	(media / '2024' / '01' / 'b.jpg').write_bytes(b'123')
+	(media / '2024' / '01' / 'a-150x150.jpg').write_bytes(b'1')
+	index = WP_Media_Index(media, workers=2)
+	index.build()
+
+	check = WP_Media_Check()
+	check.add_ref('https://ex.com/wp-content/uploads/2024/01/a.jpg', 'x.xml', 1, 'attachment', 5)
+	check.add_ref('https://ex.com/wp-content/uploads/2024/01/b.jpg', 'x.xml', 2, 'attachment', 4)
+	check.add_ref('https://ex.com/wp-content/uploads/2024/01/c.jpg', 'x.xml', 3, 'attachment')
+	check.add_ref('https://cdn.ex.com/img/d.jpg', 'x.xml', 4, 'attachment')
+	result = check.check(index)
+	assert [rel for rel, _ in result['missing']] == ['2024/01/c.jpg']
+	assert result['size_mismatch'] == [('2024/01/b.jpg', 4, 3)]
+	assert result['orphaned'] == []
+	assert check.unmapped_list == [('x.xml', 4, 'attachment', 'https://cdn.ex.com/img/d.jpg')]
+	_msgs = ''.join(check.report_msgs(index, result))
+	assert '1 unmapped urls' in _msgs
+	assert [r[0] for r in check.xlsx_rows(result)[1:]] == ['missing', 'size mismatch', 'unmapped url']
+
+def test_add_export(tmp_path):
+	xml = tmp_path / 'site.xml'
+	xml.write_text(WXR, encoding='utf-8')
+	check = WP_Media_Check()
+	check.add_export(xml)
+	assert sorted(k for _, _, k in check.ref_dict['2024/01/a.jpg']) == ['attachment', 'thumbnail']
+	assert check.size_dict == {'2024/01/a.jpg': 5}
+	assert check.unmapped_list == []
@@ -0,0 +1,88 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import shutil
+import types
+
+import openpyxl
+
+import wp_xml_export_extract as wpx
+from wp_bench import WXR_Generator
+from wp_metrics import WP_Content_Metrics
+from wp_metrics import WP_Content_Stats
+from wp_metrics import histogram
+from wp_metrics import percentile
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class Msg_Sink:
+	def buffer_msg(self, s):
+		pass
+
+def make_post(sort_key, words, images=0):
+	_stats = types.SimpleNamespace(words=words, chars=words * 4, images=images)
+	return types.SimpleNamespace(sort_key=sort_key, content_stats=_stats)
+
+def metrics_sheet(xml_path, **options) -> list:
+	wpx.process_xml_file(str(xml_path), msg_writer=Msg_Sink(), metrics=True, **options)
+	wb = openpyxl.load_workbook(wpx.export_output_path(str(xml_path), '.xlsx'), read_only=True)
+	try:
+		return list(wb['metrics'].iter_rows(values_only=True))
+	finally:
+		wb.close()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_nearest_rank_percentile():
+	_vals = list(range(1, 11))
+	assert percentile(_vals, 50) == 5
+	assert percentile(_vals, 90) == 9
+	assert percentile(_vals, 91) == 10
+	assert percentile(_vals, 100) == 10
+	assert percentile(_vals, 0) == 1
+	assert percentile([1, 2], 50) == 1
+	assert percentile([7], 90) == 7
+	assert percentile([], 50) == 0
+
+def test_histogram_bin_edges():
+	# a value on an edge starts the next bin
+	_vals = [0, 249, 250, 499, 500, 999, 1000, 5000, 9999]
+	assert histogram(_vals) == [2, 2, 2, 1, 0, 2]
+	assert histogram([]) == [0] * 6
+	assert WP_Content_Metrics.bin_labels() == ['0-249', '250-499', '500-999', '1000-1999',\
+		'2000-4999', '5000+']
+
+def test_content_stats_counts():
+	cs = WP_Content_Stats('<p>one <b>two</b></p><IMG src="a"><img src="b">', 'one two ')
+	assert (cs.words, cs.chars, cs.images) == (2, 6, 2)
+	assert WP_Content_Stats(None, '').words == 0
+
+def test_by_month_with_undated():
+	metrics = WP_Content_Metrics([make_post('20240215080000', 300), make_post('', 40),\
+		make_post('20240101080000', 100, 2), make_post('20240220080000', 500)])
+	_months = metrics.by_month()
+	assert [m for m, _ in _months] == [0, 202401, 202402]
+	d = dict(_months)[202402]
+	assert (d['posts'], d['words'], d['p50_words'], d['max_words']) == (2, 800, 300, 500)
+	assert d['histogram'] == [0, 1, 1, 0, 0, 0]
+
+	_rows = metrics.xlsx_rows()
+	assert [r[0] for r in _rows[1:]] == ['undated', '2024-01', '2024-02', 'all']
+	assert _rows[-1][1:5] == [4, 940, 3760, 2]
+
+def test_spill_metrics_sheet_matches(tmp_path):
+	_src = tmp_path / 'site.xml'
+	WXR_Generator(posts=60, attachments=10, comments=1, terms=10, body_size=1500).write(str(_src))
+	_sheets = []
+	for name, options in (('plain', {}), ('spill', {'memory_budget': 1 << 16})):
+		_dir = tmp_path / name
+		_dir.mkdir()
+		shutil.copy(_src, _dir / 'site.xml')
+		_sheets.append(metrics_sheet(_dir / 'site.xml', **options))
+	assert len(_sheets[0]) > 3
+	assert _sheets[0] == _sheets[1]
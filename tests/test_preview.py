@@ -0,0 +1,66 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import os
+
+import wp_xml_export_extract as wpx
+from wp_bench import WXR_Generator
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+class Msg_Sink:
+	def __init__(self):
+		self.msg_list = []
+
+	def buffer_msg(self, s):
+		self.msg_list.append(s)
+
+def make_export(tmp_path):
+	path = tmp_path / 'site.xml'
+	WXR_Generator(posts=30, attachments=10, comments=1, terms=10, body_size=400, pages=5).write(str(path))
+	return path
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_item_budget(tmp_path):
+	path = make_export(tmp_path)
+	sink = Msg_Sink()
+	preview = wpx.preview_xml_file(str(path), max_items=5, sample=2, msg_writer=sink)
+	assert preview.match_cnt == 5
+	assert preview.seen_cnt < 45
+	assert preview.stop_reason == '5 item budget'
+	assert len(preview.sample_list) == 2
+	assert preview.first_key and preview.first_key <= preview.last_key
+	assert any('5 item budget' in s for s in sink.msg_list)
+	assert any('About ' in s for s in sink.msg_list)
+	# nothing but the export itself is written
+	assert os.listdir(tmp_path) == ['site.xml']
+
+def test_byte_budget(tmp_path):
+	path = make_export(tmp_path)
+	_size = os.path.getsize(path)
+	preview = wpx.preview_xml_file(str(path), max_bytes=_size // 3, msg_writer=Msg_Sink())
+	assert _size // 3 <= preview.byte_cnt < _size
+	assert 0 < preview.seen_cnt < 45
+	assert preview.stop_reason == f'{_size // 3} byte budget'
+	assert os.listdir(tmp_path) == ['site.xml']
+
+def test_time_budget(tmp_path):
+	path = make_export(tmp_path)
+	preview = wpx.preview_xml_file(str(path), max_seconds=0, msg_writer=Msg_Sink())
+	assert preview.seen_cnt == 1
+	assert preview.stop_reason == '0 s time budget'
+
+def test_no_budget_reads_all(tmp_path):
+	path = make_export(tmp_path)
+	preview = wpx.preview_xml_file(str(path), msg_writer=Msg_Sink())
+	assert preview.seen_cnt == 45 and preview.match_cnt == 40
+	assert preview.type_cnt == {'post': 30, 'attachment': 10, 'page': 5}
+	assert preview.stop_reason == 'end of export'
+	assert preview.byte_cnt < os.path.getsize(path)
+	assert os.listdir(tmp_path) == ['site.xml']
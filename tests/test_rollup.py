@@ -0,0 +1,65 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import json
+
+import pytest
+
+from wp_rollup import WP_Rollup
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def make_site(path, tags, sort_keys=('20240101090000', '20240301090000')):
+	return WP_Rollup.for_export(path, 10,\
+		{('post', 'publish'): 4, ('page', 'publish'): 3, ('attachment', 'inherit'): 3},\
+		sort_keys, 3, 1, {'news': 2}, tags)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_published_counts_posts_only():
+	rollup = make_site('a.xml', {})
+	assert rollup.published_cnt() == 4
+	assert rollup.sites[0][2] == 4
+	assert ' 4 published posts,' in rollup.site_msg()
+
+def test_terms_kept_whole_through_merge():
+	# every site's tail tag is past its own top terms, but tops the merge.
+	_tags = {f'tag{i}': 10 for i in range(WP_Rollup.top_terms + 20)}
+	_sites = []
+	for i in range(3):
+		_sites.append(make_site(f's{i}.xml', dict(_tags, tail=9)))
+	total = WP_Rollup.merged(_sites)
+	assert total.tag_cnt['tail'] == 27 and total.tag_site_cnt['tail'] == 3
+	_terms = dict(total.sheet_list())['terms']
+	assert len(_terms) == 1 + 1 + WP_Rollup.top_terms
+
+def test_merge_to_dict_round_trip():
+	a = make_site('a.xml', {'x': 3, 'y': 1})
+	a.set_seconds(1.25)
+	b = make_site('b.xml', {'y': 5}, ('20230601000000', ''))
+	b.set_seconds(0.5)
+	total = WP_Rollup.merged([a, b])
+
+	again = WP_Rollup.from_dict(json.loads(json.dumps(total.to_dict())))
+	assert again.to_dict() == total.to_dict()
+	assert again.item_cnt == 20 and again.published_cnt() == 8
+	assert (again.first, again.last) == ('20230601000000', '20240301090000')
+	assert again.tag_cnt == {'x': 3, 'y': 6} and again.tag_site_cnt == {'x': 1, 'y': 2}
+	assert again.cat_site_cnt['news'] == 2
+	assert again.seconds == 1.75 and len(again) == 2
+	assert again.report_msgs() == total.report_msgs()
+
+	# merging saved halves gives the same as merging the sites
+	_split = WP_Rollup.merged([WP_Rollup.from_dict(a.to_dict()), WP_Rollup.from_dict(b.to_dict())])
+	assert _split.to_dict() == total.to_dict()
+
+def test_old_version_rejected():
+	d = make_site('a.xml', {}).to_dict()
+	d['version'] = 1
+	with pytest.raises(ValueError):
+		WP_Rollup.from_dict(d)
@@ -0,0 +1,61 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import threading
+from array import array
+
+from wp_serve import WP_Export_Index, WP_Query_Service
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+ROWS = [(20240101090000, 'post', 'publish'), (20240105090000, 'attachment', 'inherit'),\
+	(20240110090000, 'post', 'draft'), (20240115090000, 'page', 'publish'),\
+	(20240120090000, 'post', 'publish'), (20240125090000, 'post', 'publish')]
+
+def make_service(rows=ROWS):
+	ix = WP_Export_Index('site.xml')
+	for pos, (_key, _type, _status) in enumerate(rows):
+		ix.records.append({'post_id': pos + 1, 'post_type': _type, 'status': _status})
+		ix.keys.append(_key)
+		ix.by_postid[pos + 1] = pos
+		ix.by_type_status.setdefault((_type, _status), array('I')).append(pos)
+	service = WP_Query_Service('.')
+	service.index_dict[ix.xml_path] = ix
+	return service
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_posts_total_from_counts():
+	service = make_service()
+	res = service.posts(post_type='post', status='publish', limit=1)
+	assert res['total'] == 3
+	assert [r['post_id'] for r in res['posts']] == [6]
+	assert service.posts(limit=2, offset=1)['total'] == 6
+	assert service.posts(post_type='post', limit=0)['total'] == 4
+	assert service.posts(status='publish', since='2024-01-12', until='2024-01-20')['total'] == 2
+	assert service.posts(post_type='missing')['total'] == 0
+
+def test_posts_page_newest_first():
+	service = make_service()
+	res = service.posts(post_type='post', limit=2, offset=1)
+	assert [r['post_id'] for r in res['posts']] == [5, 3]
+	assert res['count'] == 2 and res['total'] == 4
+
+def test_request_count_across_threads():
+	service = make_service()
+
+	def _work():
+		for _ in range(200):
+			service.respond('/stats')
+
+	_threads = [threading.Thread(target=_work) for _ in range(8)]
+	for t in _threads:
+		t.start()
+	for t in _threads:
+		t.join()
+	assert service.request_cnt == 1600
@@ -0,0 +1,86 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import threading
+
+from wp_xml_export_extract import WP_Export_Session
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def write_export(path, prefix:str, n:int):
+	"""
+	write [n] posts whose terms are [prefix]-named plus one
+	'shared' category, first seen at a different point per prefix.
+	"""
+	_items = []
+	for i in range(1, n + 1):
+		_cats = [f'{prefix}{i % 3}', 'shared'] if prefix == 'a' else ['shared', f'{prefix}{i % 4}']
+		_terms = ''.join(f'<category domain="category" nicename="{c}"><![CDATA[{c}]]></category>' for c in _cats)
+		_terms += f'<category domain="post_tag" nicename="{prefix}-tag{i % 5}"><![CDATA[t]]></category>'
+		_items.append(f'<item><title>{prefix} {i}</title><wp:post_id>{i}</wp:post_id>' + \
+			f'<wp:post_date>2024-01-{1 + i % 28:02d} 10:00:00</wp:post_date>' + \
+			'<wp:post_type>post</wp:post_type><wp:status>publish</wp:status>' + \
+			f'{_terms}<content:encoded><![CDATA[{prefix} body {i}]]></content:encoded></item>')
+	path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" ' + \
+		'xmlns:wp="http://wordpress.org/export/1.2/" xmlns:content="http://purl.org/rss/1.0/modules/content/">' + \
+		'<channel><title>t</title>' + ''.join(_items) + '</channel></rss>\n', encoding='utf-8')
+
+def session_state(session) -> tuple:
+	return ([p.post_id for p in session.node_list], list(session.term_dict.id_to_slug),\
+		[(list(p.category_ids), list(p.tag_ids)) for p in session.node_list],\
+		[(p.categories, p.tags) for p in session.node_list], session.item_cnt)
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_parallel_sessions_are_independent(tmp_path):
+	_paths = [tmp_path / 'a.xml', tmp_path / 'b.xml']
+	write_export(_paths[0], 'a', 1500)
+	write_export(_paths[1], 'b', 1200)
+
+	_serial = []
+	for path in _paths:
+		session = WP_Export_Session(str(path))
+		session.load()
+		_serial.append(session_state(session))
+
+	_sessions = [WP_Export_Session(str(path)) for path in _paths]
+	_barrier = threading.Barrier(len(_sessions))
+	_errors = []
+
+	def _run(session):
+		try:
+			_barrier.wait()
+			session.load()
+			session.report_and_xlsx()
+		except Exception as ex:
+			_errors.append(ex)
+
+	_threads = [threading.Thread(target=_run, args=(s,)) for s in _sessions]
+	for t in _threads:
+		t.start()
+	for t in _threads:
+		t.join()
+	assert not _errors
+
+	a, b = _sessions
+	assert [session_state(s) for s in _sessions] == _serial
+	assert a.term_dict is not b.term_dict
+	assert a.term_dict.slug_to_id['shared'] == 1 and b.term_dict.slug_to_id['shared'] == 0
+	assert not any(_slug.startswith('b') for _slug in a.term_dict.id_to_slug)
+	assert not any(_slug.startswith('a') for _slug in b.term_dict.id_to_slug)
+	assert all(p.term_dict is a.term_dict for p in a.node_list)
+	assert all(p.term_dict is b.term_dict for p in b.node_list)
+	assert a.get_post_by_postid(1300).title == 'a 1300'
+	assert b.get_post_by_postid(1300) is None
+
+	# each report lists only its own export's terms
+	_a_report = ''.join(a.msg_list)
+	_b_report = ''.join(b.msg_list)
+	assert 'a-tag1' in _a_report and 'b-tag1' not in _a_report
+	assert 'b-tag1' in _b_report and 'a-tag1' not in _b_report
+	assert a.rollup.item_cnt == 1500 and b.rollup.item_cnt == 1200
@@ -0,0 +1,92 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import gzip
+import os
+import zipfile
+
+from sparkwarden_file_lib import build_stream_file_list
+from sparkwarden_file_lib import open_stream
+from sparkwarden_file_lib import split_zip_path
+from sparkwarden_file_lib import zip_member_list
+from wp_xml_export_extract import export_output_path
+from wp_xml_export_extract import parse_xml_items
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+XML = ('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" ' + \
+	'xmlns:wp="http://wordpress.org/export/1.2/"><channel><title>t</title>' + \
+	''.join(f'<item><title>p{i}</title><wp:post_id>{i}</wp:post_id></item>' for i in range(1, 4)) + \
+	'</channel></rss>\n').encode('utf-8')
+
+def post_ids(path) -> list:
+	_ids = []
+	parse_xml_items(str(path), lambda n, item: _ids.append(item['wp:post_id']))
+	return _ids
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_gzip_and_zip_member_streams(tmp_path):
+	_gz = tmp_path / 'site.xml.gz'
+	with gzip.open(_gz, 'wb') as fd:
+		fd.write(XML)
+	_zip = tmp_path / 'archive.zip'
+	with zipfile.ZipFile(_zip, 'w') as zf:
+		zf.writestr('sub/a.xml', XML)
+		zf.writestr('sub/b.xml.gz', gzip.compress(XML))
+
+	with open_stream(str(_gz)) as fd:
+		assert fd.read() == XML
+	with open_stream(f'{_zip}/sub/a.xml') as fd:
+		assert fd.read() == XML
+	assert post_ids(_gz) == ['1', '2', '3']
+	assert post_ids(f'{_zip}/sub/b.xml.gz') == ['1', '2', '3']
+
+def test_split_zip_path_needs_a_zip_file(tmp_path):
+	_dir = tmp_path / 'x.zip'
+	(_dir / 'sub').mkdir(parents=True)
+	(_dir / 'sub' / 'a.xml').write_bytes(XML)
+	_path = str(_dir / 'sub' / 'a.xml')
+	assert split_zip_path(_path) == (_path, None)
+	with open_stream(_path) as fd:
+		assert fd.read() == XML
+
+	_zip = tmp_path / 'x.zip' / 'real.zip'
+	with zipfile.ZipFile(_zip, 'w') as zf:
+		zf.writestr('a.xml', XML)
+	assert split_zip_path(f'{_zip}/a.xml') == (str(_zip), 'a.xml')
+
+def test_stream_file_list(tmp_path):
+	(tmp_path / 'a.xml').write_bytes(XML)
+	(tmp_path / 'b.xml.bz2').write_bytes(b'')
+	(tmp_path / 'c.txt').write_bytes(b'')
+	with zipfile.ZipFile(tmp_path / 'd.zip', 'w') as zf:
+		zf.writestr('e.xml', XML)
+		zf.writestr('notes.txt', '')
+		zf.writestr('dir/', '')
+	(tmp_path / 'broken.zip').write_bytes(b'not a zip')
+
+	assert zip_member_list(str(tmp_path / 'broken.zip'), '*.xml') == []
+	_names = sorted(os.path.relpath(p, tmp_path) for p in build_stream_file_list(str(tmp_path), '*.xml'))
+	assert _names == ['a.xml', 'b.xml.bz2', os.path.join('d.zip', 'e.xml')]
+
+def test_output_paths_do_not_collide(tmp_path):
+	with zipfile.ZipFile(tmp_path / 'archive.zip', 'w') as zf:
+		zf.writestr('sub/a.xml', XML)
+		zf.writestr('a.xml', XML)
+	with zipfile.ZipFile(tmp_path / 'other.zip', 'w') as zf:
+		zf.writestr('sub/a.xml', XML)
+
+	_d = str(tmp_path)
+	_paths = [f'{_d}/site.xml', f'{_d}/site.xml.gz', f'{_d}/site.xml.bz2', f'{_d}/a.xml',\
+		f'{_d}/archive.zip/sub/a.xml', f'{_d}/archive.zip/a.xml', f'{_d}/other.zip/sub/a.xml']
+	_out = [export_output_path(p, '.xlsx') for p in _paths]
+	assert len(set(_out)) == len(_out)
+	assert _out[1] == os.path.join(_d, 'site_gz.xlsx')
+	assert _out[4] == os.path.join(_d, 'archive_sub_a.xlsx')
+	assert all(os.path.dirname(p) == _d for p in _out)
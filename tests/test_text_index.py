@@ -0,0 +1,69 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import os
+
+from wp_text_index import WP_Text_Index
+from wp_text_index import index_exports
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def write_export(path, bodies:list):
+	_items = []
+	for i, body in enumerate(bodies, 1):
+		_items.append(f'<item><title>post {i}</title><link>https://ex.com/p{i}</link>' + \
+			f'<wp:post_id>{i}</wp:post_id><wp:post_type>post</wp:post_type>' + \
+			f'<wp:status>publish</wp:status><content:encoded><![CDATA[<p>{body}</p>]]></content:encoded></item>')
+	_items.append('<item><title>a page about apples</title><wp:post_id>99</wp:post_id>' + \
+		'<wp:post_type>page</wp:post_type><wp:status>publish</wp:status></item>')
+	path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0" ' + \
+		'xmlns:wp="http://wordpress.org/export/1.2/" xmlns:content="http://purl.org/rss/1.0/modules/content/">' + \
+		'<channel><title>t</title>' + ''.join(_items) + '</channel></rss>\n', encoding='utf-8')
+
+def hit_ids(text_index, text, limit=None) -> list:
+	return [(post_id, os.path.basename(path)) for post_id, _, _, path in text_index.query(text, limit)]
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_index_reindex_and_query(tmp_path):
+	a = tmp_path / 'a.xml'
+	b = tmp_path / 'b.xml'
+	write_export(a, ['red apples and pears', 'green apples', 'red cherries'])
+	write_export(b, ['Apples, RED ones'])
+	text_index = WP_Text_Index(str(tmp_path / 'posts.idx'))
+
+	assert index_exports(text_index, [str(a), str(b)]) == [(str(a), 3), (str(b), 1)]
+	assert hit_ids(text_index, 'apples') == [(1, 'a.xml'), (2, 'a.xml'), (1, 'b.xml')]
+	# every term must match; stop words are ignored
+	assert hit_ids(text_index, 'red and apples') == [(1, 'a.xml'), (1, 'b.xml')]
+	assert hit_ids(text_index, 'red plums') == []
+	assert hit_ids(text_index, 'the') == []
+	assert hit_ids(text_index, 'apples', limit=2) == [(1, 'a.xml'), (2, 'a.xml')]
+
+	# unchanged exports are skipped
+	assert index_exports(text_index, [str(a), str(b)]) == [(str(a), None), (str(b), None)]
+
+	write_export(a, ['plums only', 'red plums'])
+	_stat = os.stat(a)
+	os.utime(a, ns=(_stat.st_atime_ns, _stat.st_mtime_ns + 10 ** 9))
+	assert index_exports(text_index, [str(a), str(b)]) == [(str(a), 2), (str(b), None)]
+	assert hit_ids(text_index, 'apples') == [(1, 'b.xml')]
+	assert hit_ids(text_index, 'red plums') == [(2, 'a.xml')]
+	assert [(p, n) for p, n, _ in text_index.export_list()] == [(str(a), 2), (str(b), 1)]
+	text_index.close()
+
+def test_hits_fetched_in_chunks(tmp_path, monkeypatch):
+	a = tmp_path / 'a.xml'
+	write_export(a, [f'common word {i}' for i in range(7)])
+	text_index = WP_Text_Index(str(tmp_path / 'posts.idx'))
+	index_exports(text_index, [str(a)])
+
+	monkeypatch.setattr(WP_Text_Index, 'fetch_chunk', 3)
+	assert [post_id for post_id, _, _, _ in text_index.query('common word')] == list(range(1, 8))
+	assert text_index.query('common', limit=4)[-1][:3] == (4, 'https://ex.com/p4', 'post 4')
+	text_index.close()
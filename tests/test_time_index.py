@@ -0,0 +1,64 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import datetime
+import heapq
+import types
+
+from wp_xml_export_extract import WP_Time_Index
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def make_index(keys):
+	node_list = [types.SimpleNamespace(sort_key=k, name=k or 'undated') for k in keys]
+	node_list.sort(key=lambda nd: nd.sort_key, reverse=True)
+	return WP_Time_Index(node_list)
+
+KEYS = ['20240101090000', '20240115120000', '20240131235959', '20240201000000', '']
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_date_key_forms():
+	assert WP_Time_Index.date_key(None) is None
+	assert WP_Time_Index.date_key('2024-01-15') == 20240115000000
+	assert WP_Time_Index.date_key('2024-01-15', end=True) == 20240115235959
+	assert WP_Time_Index.date_key('2024-01-15 12:30') == 20240115123000
+	assert WP_Time_Index.date_key('2024-01-15T12:30:45') == 20240115123045
+	assert WP_Time_Index.date_key(datetime.date(2024, 1, 15), end=True) == 20240115235959
+
+def test_range_inclusive_newest_first():
+	index = make_index(KEYS)
+	_names = [nd.sort_key for nd in index.range('2024-01-15', '2024-01-31')]
+	assert _names == ['20240131235959', '20240115120000']
+
+def test_range_open_ends():
+	index = make_index(KEYS)
+	assert [nd.sort_key for nd in index.range(since='2024-02-01')] == ['20240201000000']
+	# undated records have key 0, so only an open start includes them.
+	assert index.range(until='2023-12-31')[0].sort_key == ''
+	assert len(index.range()) == len(KEYS)
+
+def test_latest():
+	index = make_index(KEYS)
+	assert [nd.sort_key for nd in index.latest(2)] == ['20240201000000', '20240131235959']
+	assert index.latest(0) == []
+	_subset = index.range('2024-01-01', '2024-01-20')
+	assert [nd.sort_key for nd in index.latest(1, _subset)] == ['20240115120000']
+
+def test_latest_newest_first_slices(monkeypatch):
+	index = make_index(KEYS)
+	_window = index.range(since='2024-01-10')
+	_heap = index.latest(2, list(reversed(_window)))
+
+	def _no_heap(*args, **kwargs):
+		raise AssertionError('heap used on a newest-first list')
+
+	monkeypatch.setattr(heapq, 'nlargest', _no_heap)
+	_sliced = index.latest(2, _window, newest_first=True)
+	assert _sliced == _heap
+	assert [nd.sort_key for nd in _sliced] == ['20240201000000', '20240131235959']
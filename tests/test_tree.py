@@ -0,0 +1,55 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+from wp_tree import WP_Post_Tree
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def make_tree(rows):
+	tree = WP_Post_Tree()
+	for post_id, post_parent in rows:
+		tree.add(post_id, post_parent, 'page', 'publish', f'p{post_id}')
+	return tree.build()
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_missing_parent_is_root():
+	tree = make_tree([(1, 0), (2, 99), (3, 2)])
+	assert tree.orphan_cnt == 1 and tree.cycle_cnt == 0
+	assert list(tree.parent_pos) == [-1, -1, 1]
+	assert tree.xlsx_cols(2) == [99, 0, 2, 'p2']
+	assert tree.xlsx_cols(3) == [2, 1, 1, 'p2 > p3']
+	assert tree.in_hierarchy(1) and not tree.in_hierarchy(0)
+
+def test_cycle_cut_at_first_item():
+	# 1 -> 2 -> 3 -> 1, with 4 hanging off 3 and 5 an unrelated root
+	tree = make_tree([(1, 3), (2, 1), (3, 2), (4, 3), (5, 0)])
+	assert tree.cycle_cnt == 1 and tree.orphan_cnt == 0
+	assert tree.parent_pos[0] == -1
+	assert list(tree.depth) == [0, 1, 2, 3, 0]
+	assert tree.size[0] == 4
+	assert tree.breadcrumb(3) == 'p1 > p2 > p3 > p4'
+	assert sorted(tree.order) == [0, 1, 2, 3, 4]
+
+def test_two_cycles_and_self_parent():
+	tree = make_tree([(1, 2), (2, 1), (3, 4), (4, 3), (5, 5)])
+	assert tree.cycle_cnt == 2
+	assert [tree.size[i] for i in (0, 2, 4)] == [2, 2, 1]
+	# a self parent is not a cycle, but still puts the item in the hierarchy
+	assert tree.parent_pos[4] == -1 and tree.in_hierarchy(4)
+	# true roots come first in preorder, then each cut cycle
+	_rows = tree.xlsx_rows()
+	assert [r[0] for r in _rows[1:]] == [5, 1, 2, 3, 4]
+
+def test_deep_breadcrumb_elided():
+	_rows = [(1, 0)] + [(i, i - 1) for i in range(2, 16)]
+	tree = make_tree(_rows)
+	assert tree.depth[14] == 14
+	_crumb = tree.breadcrumb(14)
+	assert _crumb.startswith('p1 > p2 > p3 > ... 6 ... > p10')
+	assert _crumb.endswith('p15')
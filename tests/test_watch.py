@@ -0,0 +1,44 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import datetime
+import os
+
+import wp_watch
+import wp_xml_export_extract as wpx
+from wp_rollup import WP_Rollup
+from wp_watch import WP_Export_Watcher
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_scan_matches_export_suffixes(tmp_path):
+	(tmp_path / 'sub' / 'deep').mkdir(parents=True)
+	for name in ('a.xml', 'sub/b.xml.gz', 'sub/deep/c.zip', 'sub/d.xml.bz2', 'e.xlsx', 'f.txt', 'g.xml.tmp'):
+		(tmp_path / name).write_bytes(b'x' * len(name))
+	sig_dict = WP_Export_Watcher(tmp_path).scan()
+	_rel = sorted(os.path.relpath(p, tmp_path).replace(os.sep, '/') for p in sig_dict)
+	assert _rel == ['a.xml', 'sub/b.xml.gz', 'sub/d.xml.bz2', 'sub/deep/c.zip']
+	assert sig_dict[str(tmp_path / 'a.xml')][0] == 5
+
+def test_last_days_recomputed_per_file(tmp_path, monkeypatch):
+	seen = []
+
+	class _Session:
+		item_cnt = 0
+		rollup = WP_Rollup()
+		def close(self):
+			pass
+
+	def _process(xml_path, stats, msg_writer=None, **options):
+		seen.append(options)
+		return _Session()
+
+	monkeypatch.setattr(wpx, 'process_xml_file', _process)
+	options = {'since': datetime.date(2000, 1, 1), 'last_days': 7, 'until': None}
+	wp_watch.process_watched_file(str(tmp_path / 'a.xml'), options)
+	assert seen[0]['since'] == datetime.date.today() - datetime.timedelta(days=7)
+	assert 'last_days' not in seen[0]
+	assert options['last_days'] == 7
@@ -0,0 +1,93 @@
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+import datetime
+
+import pytest
+
+from sparkwarden_file_lib import list_to_xlsx
+from sparkwarden_file_lib import sheets_to_xlsx
+from sparkwarden_file_lib import xlsx_iter_rows
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+@pytest.fixture
+def xlsx_path(tmp_path):
+	_path = str(tmp_path / 'rows.xlsx')
+	list_to_xlsx([['id','title','date','score'],\
+		[1, 'first', datetime.datetime(2024, 1, 2, 3, 4, 5), 1.5],\
+		[None, None, None, None],\
+		[2, 'second', None, 7],\
+		[3, 'third', None, None]], _path)
+	return _path
+
+#-------------------------------------------------------------
+#
+#-------------------------------------------------------------
+
+def test_typed_values_and_header(xlsx_path):
+	rows = list(xlsx_iter_rows(xlsx_path))
+	assert rows[0] == ('id','title','date','score')
+	assert rows[1] == (1, 'first', datetime.datetime(2024, 1, 2, 3, 4, 5), 1.5)
+	assert rows[2] == (2, 'second', None, 7)
+	assert len(rows) == 4			# empty row skipped
+
+def test_keep_empty_rows(xlsx_path):
+	rows = list(xlsx_iter_rows(xlsx_path, header=False, skip_empty=False))
+	assert len(rows) == 4
+	assert all(v is None for v in rows[1])
+
+def test_column_projection_and_max_rows(xlsx_path):
+	rows = list(xlsx_iter_rows(xlsx_path, columns=['score','id'], max_rows=2))
+	assert rows == [('score','id'), (1.5, 1), (7, 2)]
+
+def test_unknown_column(xlsx_path):
+	with pytest.raises(KeyError):
+		list(xlsx_iter_rows(xlsx_path, columns=['nope']))
+
+def test_named_sheet(tmp_path):
+	_path = str(tmp_path / 'sheets.xlsx')
+	sheets_to_xlsx([(None, [['a'], [1]]), ('other', [['b'], [2], [3]])], _path)
+	assert list(xlsx_iter_rows(_path, xls_sheet='other', header=False)) == [(2,), (3,)]
+
+@pytest.fixture
+def closed_list(monkeypatch):
+	"""
+	record each workbook xlsx_iter_rows opens as [wb, closed].
+	"""
+	import openpyxl
+	_load_workbook = openpyxl.load_workbook
+	_closed_list = []
+
+	def _load(*args, **kwargs):
+		wb = _load_workbook(*args, **kwargs)
+		_entry = [wb, False]
+		_close = wb.close
+
+		def _flag_close():
+			_entry[1] = True
+			_close()
+
+		wb.close = _flag_close
+		_closed_list.append(_entry)
+		return wb
+
+	monkeypatch.setattr(openpyxl, 'load_workbook', _load)
+	return _closed_list
+
+def test_early_stop_closes(xlsx_path, closed_list):
+	it = xlsx_iter_rows(xlsx_path)
+	next(it)
+	assert closed_list[0][1] is False
+	it.close()
+	assert closed_list[0][1] is True
+
+	assert list(xlsx_iter_rows(xlsx_path, max_rows=0)) == [('id','title','date','score')]
+	assert closed_list[1][1] is True
+
+	rows = xlsx_iter_rows(xlsx_path, max_rows=1)
+	assert len(list(rows)) == 2
+	assert [c for _, c in closed_list] == [True, True, True]